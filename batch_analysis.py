@@ -0,0 +1,224 @@
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from itertools import islice
+from typing import Deque, Iterable, Iterator, List, Optional, TextIO, Tuple
+from game_state.game_state import GameState
+from parsing.fen_parser import FenParser
+from engine.engine import generate_moves, is_in_check
+from engine.search import search
+from engine.transposition_table import TranspositionTable
+from process_context import get_process_context
+import notation
+
+DEFAULT_CHUNK_SIZE = 64
+# chunks queued or running per worker; bounds memory however long the input
+CHUNKS_IN_FLIGHT_PER_WORKER = 4
+DEFAULT_TRANSPOSITION_TABLE_MEGABYTES = 16
+
+
+class PositionStatus(Enum):
+    ONGOING = "ongoing"
+    CHECK = "check"
+    CHECKMATE = "checkmate"
+    STALEMATE = "stalemate"
+
+
+@dataclass
+class SearchOptions:
+    depth: Optional[int] = None
+    time_limit: Optional[float] = None
+    transposition_table_megabytes: float = DEFAULT_TRANSPOSITION_TABLE_MEGABYTES
+
+
+@dataclass
+class PositionAnalysis:
+    line_number: int
+    fen: str
+    legal_move_count: Optional[int] = None
+    status: Optional[PositionStatus] = None
+    best_move: Optional[str] = None
+    score: Optional[int] = None
+    depth: Optional[int] = None
+    nodes: Optional[int] = None
+    # set instead of the fields above when the line is not a valid position
+    error: Optional[str] = None
+
+    def to_json(self) -> str:
+        result = {"line": self.line_number, "fen": self.fen}
+
+        if self.error is not None:
+            result["error"] = self.error
+        else:
+            result["legal_moves"] = self.legal_move_count
+            result["status"] = self.status.value
+
+        if self.depth is not None:
+            result["best_move"] = self.best_move
+            result["score"] = self.score
+            result["depth"] = self.depth
+            result["nodes"] = self.nodes
+
+        return json.dumps(result)
+
+
+# one table per process, reused from position to position
+_transposition_table: Optional[TranspositionTable] = None
+
+
+def _get_transposition_table(megabytes: float) -> TranspositionTable:
+    global _transposition_table
+
+    if _transposition_table is None or _transposition_table.megabytes != megabytes:
+        _transposition_table = TranspositionTable(megabytes)
+
+    return _transposition_table
+
+
+def analyze_position(line_number: int, fen: str, search_options: Optional[SearchOptions] = None) -> PositionAnalysis:
+    try:
+        game_state = FenParser().parse(fen)
+    except (ValueError, IndexError) as error:
+        return PositionAnalysis(line_number, fen, error=f"invalid fen: {error}")
+
+    # a parsed position can still be unplayable, one without a king say;
+    # that fails this record rather than the whole run
+    try:
+        return _analyze_game_state(line_number, fen, game_state, search_options)
+    except (ValueError, IndexError) as error:
+        return PositionAnalysis(line_number, fen, error=f"invalid position: {error}")
+
+
+def _analyze_game_state(line_number: int, fen: str, game_state: GameState, search_options: Optional[SearchOptions]) -> PositionAnalysis:
+    result = PositionAnalysis(line_number, fen)
+    in_check = is_in_check(game_state, game_state.color_to_move)
+    result.legal_move_count = len(generate_moves(game_state))
+
+    if result.legal_move_count == 0:
+        result.status = PositionStatus.CHECKMATE if in_check else PositionStatus.STALEMATE
+    else:
+        result.status = PositionStatus.CHECK if in_check else PositionStatus.ONGOING
+
+    if search_options is not None:
+        transposition_table = _get_transposition_table(search_options.transposition_table_megabytes)
+        search_result = search(game_state, search_options.time_limit, search_options.depth, transposition_table=transposition_table)
+
+        result.best_move = None if search_result.best_move is None else notation.move_to_uci(search_result.best_move)
+        result.score = search_result.score
+        result.depth = search_result.depth
+        result.nodes = search_result.nodes
+
+    return result
+
+
+def _analyze_chunk(chunk: List[Tuple[int, str]], search_options: Optional[SearchOptions]) -> List[PositionAnalysis]:
+    return [analyze_position(line_number, fen, search_options) for line_number, fen in chunk]
+
+
+# numbered FEN strings, one per line, skipping blank lines and lines starting
+# with #
+def iter_fen_lines(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    for line_number, line in enumerate(lines, start=1):
+        fen = line.strip()
+
+        if fen and not fen.startswith("#"):
+            yield line_number, fen
+
+
+def _iter_chunks(fen_lines: Iterable[Tuple[int, str]], chunk_size: int) -> Iterator[List[Tuple[int, str]]]:
+    iterator = iter(fen_lines)
+
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+
+        if not chunk:
+            return
+
+        yield chunk
+
+
+# analyses in input order; chunks go to the worker processes with only a few
+# per worker read ahead, so input of any length streams through
+def analyze_positions(
+    fen_lines: Iterable[Tuple[int, str]],
+    search_options: Optional[SearchOptions] = None,
+    processes: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[PositionAnalysis]:
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+
+    chunks = _iter_chunks(fen_lines, chunk_size)
+
+    if processes == 1:
+        for chunk in chunks:
+            yield from _analyze_chunk(chunk, search_options)
+
+        return
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    max_in_flight = processes * CHUNKS_IN_FLIGHT_PER_WORKER
+
+    with ProcessPoolExecutor(processes, mp_context=get_process_context()) as executor:
+        in_flight: Deque[Future] = deque()
+
+        for chunk in chunks:
+            in_flight.append(executor.submit(_analyze_chunk, chunk, search_options))
+
+            if len(in_flight) >= max_in_flight:
+                yield from in_flight.popleft().result()
+
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def write_json_lines(analyses: Iterable[PositionAnalysis], output: TextIO) -> int:
+    count = 0
+
+    for analysis in analyses:
+        output.write(analysis.to_json())
+        output.write("\n")
+        count += 1
+
+    return count
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Analyse a file of FEN positions, one per line, into JSON lines")
+    argument_parser.add_argument("input", help="file of FEN positions, - for standard input")
+    argument_parser.add_argument("-o", "--output", help="file to write JSON lines to, standard output by default")
+    argument_parser.add_argument("-j", "--processes", type=int, help="worker processes, all cores by default")
+    argument_parser.add_argument("--depth", type=int, help="also search every position to this depth")
+    argument_parser.add_argument("--time", type=float, help="also search every position for this many seconds")
+    argument_parser.add_argument("--hash", type=float, default=DEFAULT_TRANSPOSITION_TABLE_MEGABYTES, help="transposition table megabytes per process")
+    argument_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    arguments = argument_parser.parse_args()
+
+    search_options = None
+
+    if arguments.depth is not None or arguments.time is not None:
+        search_options = SearchOptions(arguments.depth, arguments.time, arguments.hash)
+
+    input_file = sys.stdin if arguments.input == "-" else open(arguments.input, "r")
+    output_file = sys.stdout if arguments.output is None else open(arguments.output, "w")
+
+    try:
+        analyses = analyze_positions(iter_fen_lines(input_file), search_options, arguments.processes, arguments.chunk_size)
+        write_json_lines(analyses, output_file)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+
+        if output_file is not sys.stdout:
+            output_file.close()
+
+
+if __name__ == "__main__":
+    main()
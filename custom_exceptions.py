@@ -18,3 +18,11 @@ class InvalidHalfmoveString(InvalidFenString):
 
 class InvalidFullmoveString(InvalidFenString):
     pass
+
+
+class InvalidPgnString(ValueError):
+    pass
+
+
+class ConnectionClosed(ConnectionError):
+    pass
@@ -0,0 +1,83 @@
+from typing import Dict, List, Tuple
+from color import Color
+from coordinate import Coordinate
+from game_state.bitboard import SQUARE_COORDINATES
+
+# every table is indexed by square index (a1 = 0, h8 = 63) and computed
+# once at import time
+
+KNIGHT_OFFSETS = [
+    ( 2,  1),
+    ( 2, -1),
+    (-2,  1),
+    (-2, -1),
+    ( 1,  2),
+    ( 1, -2),
+    (-1,  2),
+    (-1, -2),
+]
+
+KING_OFFSETS = [
+    (-1, -1),
+    ( 0, -1),
+    ( 1, -1),
+    (-1,  0),
+    ( 1,  0),
+    (-1,  1),
+    ( 0,  1),
+    ( 1,  1),
+]
+
+PAWN_CAPTURE_OFFSETS = {
+    Color.WHITE: [(-1,  1), (1,  1)],
+    Color.BLACK: [(-1, -1), (1, -1)],
+}
+
+
+def _get_target_indices(square_index: int, offsets: List[Tuple[int, int]]) -> List[int]:
+    file = square_index % 8
+    rank = square_index // 8
+    result = []
+
+    for file_offset, rank_offset in offsets:
+        target_file = file + file_offset
+        target_rank = rank + rank_offset
+
+        if 0 <= target_file <= 7 and 0 <= target_rank <= 7:
+            result.append(target_rank * 8 + target_file)
+
+    return result
+
+
+def _build_target_table(offsets: List[Tuple[int, int]]) -> List[Tuple[Coordinate, ...]]:
+    return [
+        tuple(SQUARE_COORDINATES[target] for target in _get_target_indices(square_index, offsets))
+        for square_index in range(64)
+    ]
+
+
+def _build_attack_table(offsets: List[Tuple[int, int]]) -> List[int]:
+    result = []
+
+    for square_index in range(64):
+        bitboard = 0
+
+        for target in _get_target_indices(square_index, offsets):
+            bitboard |= 1 << target
+
+        result.append(bitboard)
+
+    return result
+
+
+KNIGHT_TARGETS = _build_target_table(KNIGHT_OFFSETS)
+KING_TARGETS = _build_target_table(KING_OFFSETS)
+PAWN_CAPTURE_TARGETS: Dict[Color, List[Tuple[Coordinate, ...]]] = {
+    color: _build_target_table(offsets) for color, offsets in PAWN_CAPTURE_OFFSETS.items()
+}
+
+KNIGHT_ATTACKS = _build_attack_table(KNIGHT_OFFSETS)
+KING_ATTACKS = _build_attack_table(KING_OFFSETS)
+PAWN_ATTACKS: Dict[Color, List[int]] = {
+    color: _build_attack_table(offsets) for color, offsets in PAWN_CAPTURE_OFFSETS.items()
+}
@@ -0,0 +1,158 @@
+from typing import List, Optional, Tuple
+from color import Color
+from piece import Piece, PieceType
+from game_state.bitboard import BitBoard, PIECE_INDICES, get_lowest_square_index, get_highest_square_index
+from engine.attack_tables import KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS
+
+# directions along which square indices grow; the first blocker on these
+# rays is the lowest set bit, on the opposite rays it is the highest one
+POSITIVE_ROOK_DIRECTIONS = [(1, 0), (0, 1)]
+NEGATIVE_ROOK_DIRECTIONS = [(-1, 0), (0, -1)]
+POSITIVE_BISHOP_DIRECTIONS = [(1, 1), (-1, 1)]
+NEGATIVE_BISHOP_DIRECTIONS = [(1, -1), (-1, -1)]
+
+
+def _build_ray_table(direction: Tuple[int, int]) -> List[int]:
+    file_offset, rank_offset = direction
+    result = []
+
+    for square_index in range(64):
+        file = square_index % 8 + file_offset
+        rank = square_index // 8 + rank_offset
+        bitboard = 0
+
+        while 0 <= file <= 7 and 0 <= rank <= 7:
+            bitboard |= 1 << (rank * 8 + file)
+            file += file_offset
+            rank += rank_offset
+
+        result.append(bitboard)
+
+    return result
+
+
+# per attacking color: piece indices of king, queen, knight, bishop, rook
+# and pawn, then the pawn table that looks back from the attacked square
+_ATTACKER_LOOKUPS = {
+    color: tuple(
+        PIECE_INDICES[Piece(color, piece_type)]
+        for piece_type in [PieceType.KING, PieceType.QUEEN, PieceType.KNIGHT, PieceType.BISHOP, PieceType.ROOK, PieceType.PAWN]
+    ) + (PAWN_ATTACKS[color.opposite()],)
+    for color in Color
+}
+
+POSITIVE_ROOK_RAYS = [_build_ray_table(direction) for direction in POSITIVE_ROOK_DIRECTIONS]
+NEGATIVE_ROOK_RAYS = [_build_ray_table(direction) for direction in NEGATIVE_ROOK_DIRECTIONS]
+POSITIVE_BISHOP_RAYS = [_build_ray_table(direction) for direction in POSITIVE_BISHOP_DIRECTIONS]
+NEGATIVE_BISHOP_RAYS = [_build_ray_table(direction) for direction in NEGATIVE_BISHOP_DIRECTIONS]
+
+
+def _build_between_table() -> List[List[int]]:
+    result = [[0] * 64 for _ in range(64)]
+
+    for ray_tables in [POSITIVE_ROOK_RAYS, NEGATIVE_ROOK_RAYS, POSITIVE_BISHOP_RAYS, NEGATIVE_BISHOP_RAYS]:
+        for ray_table in ray_tables:
+            for square_index in range(64):
+                ray = ray_table[square_index]
+
+                for target_index in range(64):
+                    if ray >> target_index & 1:
+                        result[square_index][target_index] = ray & ~ray_table[target_index] & ~(1 << target_index)
+
+    return result
+
+
+# squares strictly between two squares sharing a line, empty otherwise
+BETWEEN = _build_between_table()
+
+
+def _get_sliding_attacks(square_index: int, occupancy: int, positive_rays: List[List[int]], negative_rays: List[List[int]]) -> int:
+    result = 0
+
+    for ray_table in positive_rays:
+        ray = ray_table[square_index]
+        blockers = ray & occupancy
+
+        if blockers:
+            ray ^= ray_table[get_lowest_square_index(blockers)]
+
+        result |= ray
+
+    for ray_table in negative_rays:
+        ray = ray_table[square_index]
+        blockers = ray & occupancy
+
+        if blockers:
+            ray ^= ray_table[get_highest_square_index(blockers)]
+
+        result |= ray
+
+    return result
+
+
+def get_rook_attacks(square_index: int, occupancy: int) -> int:
+    return _get_sliding_attacks(square_index, occupancy, POSITIVE_ROOK_RAYS, NEGATIVE_ROOK_RAYS)
+
+
+def get_bishop_attacks(square_index: int, occupancy: int) -> int:
+    return _get_sliding_attacks(square_index, occupancy, POSITIVE_BISHOP_RAYS, NEGATIVE_BISHOP_RAYS)
+
+
+def get_queen_attacks(square_index: int, occupancy: int) -> int:
+    return get_rook_attacks(square_index, occupancy) | get_bishop_attacks(square_index, occupancy)
+
+
+# pieces of color attacking square_index, found looking outward from it;
+# occupancy overrides the blockers seen by sliding pieces
+def get_attackers(board: BitBoard, square_index: int, color: Color, occupancy: Optional[int] = None) -> int:
+    if occupancy is None:
+        occupancy = board.occupancy
+
+    king_index, queen_index, knight_index, bishop_index, rook_index, pawn_index, pawn_attack_table = _ATTACKER_LOOKUPS[color]
+
+    piece_bitboards = board.piece_bitboards
+    queens = piece_bitboards[queen_index]
+    rooks_and_queens = piece_bitboards[rook_index] | queens
+    bishops_and_queens = piece_bitboards[bishop_index] | queens
+
+    result = (
+        KNIGHT_ATTACKS[square_index] & piece_bitboards[knight_index]
+        | KING_ATTACKS[square_index] & piece_bitboards[king_index]
+        | pawn_attack_table[square_index] & piece_bitboards[pawn_index]
+    )
+
+    if rooks_and_queens:
+        result |= get_rook_attacks(square_index, occupancy) & rooks_and_queens
+
+    if bishops_and_queens:
+        result |= get_bishop_attacks(square_index, occupancy) & bishops_and_queens
+
+    return result & occupancy
+
+
+def square_is_attacked(board: BitBoard, square_index: int, color: Color) -> bool:
+    king_index, queen_index, knight_index, bishop_index, rook_index, pawn_index, pawn_attack_table = _ATTACKER_LOOKUPS[color]
+
+    piece_bitboards = board.piece_bitboards
+
+    if KNIGHT_ATTACKS[square_index] & piece_bitboards[knight_index]:
+        return True
+
+    if pawn_attack_table[square_index] & piece_bitboards[pawn_index]:
+        return True
+
+    if KING_ATTACKS[square_index] & piece_bitboards[king_index]:
+        return True
+
+    queens = piece_bitboards[queen_index]
+    rooks_and_queens = piece_bitboards[rook_index] | queens
+
+    if rooks_and_queens and get_rook_attacks(square_index, board.occupancy) & rooks_and_queens:
+        return True
+
+    bishops_and_queens = piece_bitboards[bishop_index] | queens
+
+    if bishops_and_queens and get_bishop_attacks(square_index, board.occupancy) & bishops_and_queens:
+        return True
+
+    return False
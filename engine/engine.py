@@ -1,6 +1,6 @@
-from typing import Set, Optional
+from typing import FrozenSet, Set, Optional, Union
+from enum import Enum, auto
 from game_state.game_state import GameState
-from game_state.board import Board
 from move import (
     Move,
     BasicMove,
@@ -10,7 +10,6 @@ from move import (
     PromotionMove
 )
 from coordinate import Coordinate
-from copy import deepcopy
 from color import Color
 from piece import Piece, PieceType
 from engine.castling_squares import (
@@ -22,29 +21,88 @@ from engine.castling_squares import (
     get_castling_rook_square
 )
 from castling_side import CastlingSide
+from engine.undo_info import UndoInfo
+from engine.attack_tables import (
+    KNIGHT_TARGETS,
+    KING_TARGETS,
+    KING_ATTACKS,
+    PAWN_CAPTURE_TARGETS
+)
+from engine.attacks import square_is_attacked
+from engine.legal_moves import generate_legal_moves
+from engine.move_cache import MoveCache
+from game_state.zobrist import (
+    PIECE_SQUARE_KEYS,
+    BLACK_TO_MOVE_KEY,
+    CASTLING_KEYS,
+    compute_zobrist_key,
+    get_en_passant_key
+)
+from game_state.piece_square_tables import (
+    MIDDLEGAME_PIECE_SQUARE_SCORES,
+    ENDGAME_PIECE_SQUARE_SCORES,
+    PIECE_PHASE_WEIGHTS,
+    compute_evaluation_terms
+)
+from game_state.bitboard import (
+    PIECE_INDICES,
+    SQUARE_COORDINATES,
+    get_square_index,
+    get_lowest_square_index,
+    iter_square_indices
+)
 
 
 def verify_move(game_state: GameState, move: Move) -> bool:
-    return move in generate_moves(game_state)
+    return move in get_cached_moves(game_state)
 
 
 def is_in_checkmate(game_state: GameState) -> bool:
-    return generate_moves(game_state) == set()
+    return len(get_cached_moves(game_state)) == 0
 
 
-def generate_moves(game_state: GameState) -> Set[Move]:
-    result = set()
+# recompute the zobrist key after every do_move and compare it with the
+# incremental one; slow, meant for tests and debugging
+VERIFY_ZOBRIST_KEYS = False
+# the same for the running evaluation terms
+VERIFY_EVALUATION_TERMS = False
+
+
+class MoveGenerator(Enum):
+    # pseudo-legal moves, each made and unmade to see if it leaves the king in check
+    CHECK_FILTERING = auto()
+    # legal moves straight from the checkers and pins of the position
+    LEGAL = auto()
+
+
+DEFAULT_MOVE_GENERATOR = MoveGenerator.LEGAL
+
+
+def generate_moves(game_state: GameState, move_generator: Optional[MoveGenerator] = None) -> Set[Move]:
+    if move_generator is None:
+        move_generator = DEFAULT_MOVE_GENERATOR
+
+    if move_generator is MoveGenerator.LEGAL:
+        return generate_legal_moves(game_state)
+    else:
+        return generate_check_filtered_moves(game_state)
+
+
+# shared by move validation, checkmate detection and the renderer, which
+# otherwise regenerate the same position's moves several times a turn
+legal_move_cache = MoveCache(generate_moves)
+
 
-    for rank, piece_row in enumerate(game_state.board.matrix):
-        for file, piece in enumerate(piece_row):
-            if piece is None:
-                continue
+def get_cached_moves(game_state: GameState) -> FrozenSet[Move]:
+    return legal_move_cache.get_moves(game_state)
 
-            if piece.color is not game_state.color_to_move:
-                continue
 
-            piece_square = Coordinate(file, rank)
-            result.update(generate_moves_for_piece(game_state, piece_square))
+def generate_check_filtered_moves(game_state: GameState) -> Set[Move]:
+    result = set()
+
+    for piece_square, _ in game_state.board.iter_pieces_of_color(game_state.color_to_move):
+        pseudo_legal_moves = generate_moves_for_piece(game_state, piece_square, must_evade_check=False)
+        result.update(filter_moves_evading_check(game_state, pseudo_legal_moves))
 
     return result
 
@@ -55,6 +113,10 @@ def generate_moves_for_piece(game_state: GameState, piece_square: Coordinate, mu
     if piece_at_square is None:
         raise ValueError("no piece at square")
 
+    # the cached moves are only those of the side to move
+    if must_evade_check and DEFAULT_MOVE_GENERATOR is MoveGenerator.LEGAL and piece_at_square.color is game_state.color_to_move:
+        return set(move for move in get_cached_moves(game_state) if get_move_source_square(move) == piece_square)
+
     if piece_at_square.piece_type is PieceType.QUEEN:
         result = generate_moves_for_queen(game_state, piece_square)
     elif piece_at_square.piece_type is PieceType.BISHOP:
@@ -114,24 +176,13 @@ def generate_moves_for_bishop(game_state: GameState, piece_square: Coordinate) -
 
 
 def generate_moves_for_knight(game_state: GameState, piece_square: Coordinate) -> Set[Move]:
-    knight_move_offsets = set([
-        Coordinate( 2,  1),
-        Coordinate( 2, -1),
-        Coordinate(-2,  1),
-        Coordinate(-2, -1),
-        Coordinate( 1,  2),
-        Coordinate( 1, -2),
-        Coordinate(-1,  2),
-        Coordinate(-1, -2),
-    ])
-
     moving_knight = game_state.board.at(piece_square)
 
     if moving_knight is None:
         raise ValueError("piece_square is empty")
 
     result = set()
-    target_squares = apply_offsets_to_square(game_state, piece_square, knight_move_offsets)
+    target_squares = KNIGHT_TARGETS[get_square_index(piece_square)]
 
     for target_square in target_squares:
         piece_at_pos = game_state.board.at(target_square)
@@ -192,17 +243,18 @@ def generate_basic_moves_for_king(game_state: GameState, piece_square: Coordinat
     if piece_at_square is None:
         raise ValueError("piece_square is empty")
 
+    board = game_state.board
     enemy_king_color = piece_at_square.color.opposite()
     enemy_king_square = get_king_square(game_state, enemy_king_color)
-    squares_surrounding_enemy_king = get_surrounding_squares(game_state, enemy_king_square)
-
-    squares_surrounding_king = get_surrounding_squares(game_state, piece_square)
 
-    unblocked_squares_surrounding_king = squares_surrounding_king - squares_surrounding_enemy_king
+    unblocked_squares_surrounding_king = (
+        KING_ATTACKS[get_square_index(piece_square)]
+        & ~KING_ATTACKS[get_square_index(enemy_king_square)]
+        & ~board.get_color_occupancy(piece_at_square.color)
+    )
 
-    for unblocked_square in unblocked_squares_surrounding_king:
-        if game_state.board.square_is_empty(unblocked_square) or square_contains_color(game_state, unblocked_square, enemy_king_color):
-            result.add(BasicMove(piece_square, unblocked_square))
+    for unblocked_square_index in iter_square_indices(unblocked_squares_surrounding_king):
+        result.add(BasicMove(piece_square, SQUARE_COORDINATES[unblocked_square_index]))
 
     return result
 
@@ -231,15 +283,11 @@ def generate_castling_moves_for_king(game_state: GameState, piece_square: Coordi
         if not squares_are_empty(game_state, intermediary_squares):
             continue
 
-        passthrough_squares = get_castling_passthrough_squares(move)
-
-        for passthrough_square in passthrough_squares:
-            if square_is_threatened(game_state, passthrough_square, piece_color.opposite()):
-                continue
-
-        target_square = get_castling_king_target_square(move)
+        king_path = get_castling_passthrough_squares(move)
+        king_path.add(piece_square)
+        king_path.add(get_castling_king_target_square(move))
 
-        if square_is_threatened(game_state, target_square, piece_color.opposite()):
+        if any(square_is_threatened(game_state, square, piece_color.opposite()) for square in king_path):
             continue
 
         result.add(move)
@@ -274,8 +322,6 @@ def generate_moves_for_pawn(game_state: GameState, piece_square: Coordinate) ->
 
     forward_square = Coordinate(piece_square.file, piece_square.rank + forward)
     double_forward_square = Coordinate(piece_square.file, piece_square.rank + forward * 2)
-    right_diagonal_square = Coordinate(piece_square.file + 1, piece_square.rank + forward)
-    left_diagonal_square = Coordinate(piece_square.file - 1, piece_square.rank + forward)
 
     if game_state.board.square_is_empty(forward_square):
         result_without_promotion_moves.add(BasicMove(piece_square, forward_square))
@@ -283,16 +329,11 @@ def generate_moves_for_pawn(game_state: GameState, piece_square: Coordinate) ->
         if piece_square.rank == second_rank and game_state.board.square_is_empty(double_forward_square):
             result_without_promotion_moves.add(PawnDoubleMove(piece_square, double_forward_square))
 
-    if square_contains_color(game_state, right_diagonal_square, piece_color.opposite()):
-        result_without_promotion_moves.add(BasicMove(piece_square, right_diagonal_square))
-
-    if square_contains_color(game_state, left_diagonal_square, piece_color.opposite()):
-        result_without_promotion_moves.add(BasicMove(piece_square, left_diagonal_square))
-
-    if right_diagonal_square == game_state.en_passant_target_square:
-        result_without_promotion_moves.add(EnPassantMove(piece_square, right_diagonal_square))
-    elif left_diagonal_square == game_state.en_passant_target_square:
-        result_without_promotion_moves.add(EnPassantMove(piece_square, left_diagonal_square))
+    for diagonal_square in PAWN_CAPTURE_TARGETS[piece_color][get_square_index(piece_square)]:
+        if square_contains_color(game_state, diagonal_square, piece_color.opposite()):
+            result_without_promotion_moves.add(BasicMove(piece_square, diagonal_square))
+        elif diagonal_square == game_state.en_passant_target_square:
+            result_without_promotion_moves.add(EnPassantMove(piece_square, diagonal_square))
 
     result_with_promotion_moves = set()
 
@@ -350,10 +391,30 @@ def filter_moves_evading_check(game_state: GameState, unfiltered_moves: Set[Move
     
 def move_evades_check(game_state: GameState, move: Move) -> bool:
     move_doer = get_move_doer(game_state, move)
-    game_state_copy = deepcopy(game_state)
-    do_move(game_state_copy, move)
+    undo_info = do_move(game_state, move)
+
+    try:
+        return not is_in_check(game_state, move_doer)
+    finally:
+        undo_move(game_state, move, undo_info)
+
 
-    return not is_in_check(game_state_copy, move_doer)
+def get_move_source_square(move: Move) -> Coordinate:
+    if isinstance(move, CastlingMove):
+        return get_castling_king_square(move)
+    elif isinstance(move, BasicMove) or isinstance(move, EnPassantMove) or isinstance(move, PawnDoubleMove) or isinstance(move, PromotionMove):
+        return move.source_square
+    else:
+        raise ValueError("invalid move type")
+
+
+def get_move_target_square(move: Move) -> Coordinate:
+    if isinstance(move, CastlingMove):
+        return get_castling_king_target_square(move)
+    elif isinstance(move, BasicMove) or isinstance(move, EnPassantMove) or isinstance(move, PawnDoubleMove) or isinstance(move, PromotionMove):
+        return move.target_square
+    else:
+        raise ValueError("invalid move type")
 
 
 def get_move_doer(game_state: GameState, move: Move) -> Color:
@@ -371,9 +432,13 @@ def get_move_doer(game_state: GameState, move: Move) -> Color:
 
 
 def is_in_check(game_state: GameState, color: Color):
-    king_square = get_king_square(game_state, color)
+    board = game_state.board
+    king_bitboard = board.get_piece_bitboard(Piece(color, PieceType.KING))
+
+    if king_bitboard == 0:
+        raise ValueError("king not found")
 
-    return square_is_threatened(game_state, king_square, color.opposite())
+    return square_is_attacked(board, get_lowest_square_index(king_bitboard), color.opposite())
 
 
 def get_king_square(game_state: GameState, color: Color):
@@ -386,111 +451,117 @@ def get_king_square(game_state: GameState, color: Color):
 
 
 def get_piece_square(game_state: GameState, target_piece: Piece) -> Optional[Coordinate]:
-    for rank, piece_row in enumerate(game_state.board.matrix):
-        for file, piece in enumerate(piece_row):
-            if piece == target_piece:
-                return Coordinate(file, rank)
+    piece_squares = game_state.board.get_piece_squares(target_piece)
 
-    return None
+    if len(piece_squares) == 0:
+        return None
+
+    return piece_squares[0]
 
 
 def square_is_threatened(game_state: GameState, square: Coordinate, threatening_color: Color):
-    if square_next_to_king_of_color(game_state, square, threatening_color):
-        return True
+    return square_is_attacked(game_state.board, get_square_index(square), threatening_color)
 
-    for rank, piece_row in enumerate(game_state.board.matrix):
-        for file, piece in enumerate(piece_row):
-            if piece is None or piece.color is threatening_color.opposite() or piece.piece_type is PieceType.KING:
-                continue
 
-            piece_square = Coordinate(file, rank)
-            if piece_threatens_square(game_state, piece_square, square):
-                return True
+def get_surrounding_squares(game_state: GameState, square: Coordinate) -> Set[Coordinate]:
+    return set(KING_TARGETS[get_square_index(square)])
 
-    return False
 
+def do_move(game_state: GameState, move: Move) -> UndoInfo:
+    castling_flags = game_state.castling_permissions.get_flags()
 
-def square_next_to_king_of_color(game_state: GameState, square: Coordinate, king_color: Color):
-    king_square = get_king_square(game_state, king_color)
-    squares_surrounding_king = get_surrounding_squares(game_state, king_square)
+    undo_info = UndoInfo(
+        captured_piece=get_captured_piece(game_state, move),
+        castling_flags=castling_flags,
+        en_passant_target_square=game_state.en_passant_target_square,
+        halfmove_clock=game_state.halfmove_clock,
+        zobrist_key=game_state.zobrist_key,
+        middlegame_score=game_state.middlegame_score,
+        endgame_score=game_state.endgame_score,
+        phase=game_state.phase,
+    )
 
-    return square in squares_surrounding_king
+    game_state.zobrist_key ^= CASTLING_KEYS[castling_flags] ^ get_en_passant_key(game_state.en_passant_target_square)
+    game_state.en_passant_target_square = None
 
+    if isinstance(move, BasicMove):
+        do_basic_move(game_state, move)
+    elif isinstance(move, CastlingMove):
+        do_castling_move(game_state, move)
+    elif isinstance(move, EnPassantMove):
+        do_en_passant_move(game_state, move)
+    elif isinstance(move, PawnDoubleMove):
+        do_pawn_double_move(game_state, move)
+    elif isinstance(move, PromotionMove):
+        do_promotion_move(game_state, move)
+    else:
+        raise ValueError("invalid move type")
 
-def get_surrounding_squares(game_state: GameState, square: Coordinate) -> Set[Coordinate]:
-    offsets = set([
-        Coordinate(-1, -1),
-        Coordinate( 0, -1),
-        Coordinate( 1, -1),
-        Coordinate(-1,  0),
-        Coordinate( 1,  0),
-        Coordinate(-1,  1),
-        Coordinate( 0,  1),
-        Coordinate( 1,  1),
-    ])
-    
-    offsetted_squares = apply_offsets_to_square(game_state, square, offsets)
+    if game_state.color_to_move is Color.BLACK:
+        game_state.fullmove_count += 1
 
-    offsetted_squares_contained_by_board = filter_squares_contained_by_board(game_state.board, offsetted_squares)
+    game_state.color_to_move = game_state.color_to_move.opposite()
 
-    return offsetted_squares_contained_by_board
+    game_state.zobrist_key ^= (
+        BLACK_TO_MOVE_KEY
+        ^ CASTLING_KEYS[game_state.castling_permissions.get_flags()]
+        ^ get_en_passant_key(game_state.en_passant_target_square)
+    )
 
+    if VERIFY_ZOBRIST_KEYS:
+        verify_zobrist_key(game_state)
 
-def apply_offsets_to_square(game_state: GameState, square: Coordinate, offsets: Set[Coordinate]) -> Set[Coordinate]:
-    result = set()
+    if VERIFY_EVALUATION_TERMS:
+        verify_evaluation_terms(game_state)
 
-    for offset in offsets:
-        offsetted_square = square + offset
+    return undo_info
 
-        if game_state.board.contains_square(offsetted_square):
-            result.add(offsetted_square)
 
-    return result
+def verify_zobrist_key(game_state: GameState) -> None:
+    if game_state.zobrist_key != compute_zobrist_key(game_state):
+        raise ValueError("incrementally updated zobrist key does not match the position")
 
 
-def filter_squares_contained_by_board(board: Board, unfiltered_squares: Set[Coordinate]) -> Set[Coordinate]:
-    result = set()
+def verify_evaluation_terms(game_state: GameState) -> None:
+    evaluation_terms = (game_state.middlegame_score, game_state.endgame_score, game_state.phase)
 
-    for square in unfiltered_squares:
-        if board.contains_square(square):
-            result.add(square)
+    if evaluation_terms != compute_evaluation_terms(game_state.board):
+        raise ValueError("incrementally updated evaluation terms do not match the position")
 
-    return result
-    
 
-def piece_threatens_square(game_state: GameState, piece_square: Coordinate, target_square: Coordinate) -> bool:
-    for move in generate_moves_for_piece(game_state, piece_square, must_evade_check=False):
-        if move_threatens_square(move, target_square):
-            return True
+def set_piece_at(game_state: GameState, square: Coordinate, piece: Optional[Piece]) -> None:
+    board = game_state.board
+    square_index = get_square_index(square)
+    previous_piece = board.at_index(square_index)
 
-    return False
+    if previous_piece is not None:
+        piece_index = PIECE_INDICES[previous_piece]
+        game_state.zobrist_key ^= PIECE_SQUARE_KEYS[piece_index][square_index]
+        game_state.middlegame_score -= MIDDLEGAME_PIECE_SQUARE_SCORES[piece_index][square_index]
+        game_state.endgame_score -= ENDGAME_PIECE_SQUARE_SCORES[piece_index][square_index]
+        game_state.phase -= PIECE_PHASE_WEIGHTS[piece_index]
 
+    if piece is not None:
+        piece_index = PIECE_INDICES[piece]
+        game_state.zobrist_key ^= PIECE_SQUARE_KEYS[piece_index][square_index]
+        game_state.middlegame_score += MIDDLEGAME_PIECE_SQUARE_SCORES[piece_index][square_index]
+        game_state.endgame_score += ENDGAME_PIECE_SQUARE_SCORES[piece_index][square_index]
+        game_state.phase += PIECE_PHASE_WEIGHTS[piece_index]
 
-def move_threatens_square(move: Move, square: Coordinate) -> bool:
-    if isinstance(move, BasicMove) or isinstance(move, PromotionMove) or isinstance(move, EnPassantMove):
-        return move.target_square == square
-    else:
-        return False
+    board.set_at_index(square_index, piece)
 
 
-def do_move(game_state: GameState, move: Move) -> None:
-    if isinstance(move, BasicMove):
-        do_basic_move(game_state, move)
-    elif isinstance(move, CastlingMove):
-        do_castling_move(game_state, move)
+def get_captured_piece(game_state: GameState, move: Move) -> Optional[Piece]:
+    if isinstance(move, BasicMove) or isinstance(move, PromotionMove):
+        return game_state.board.at(move.target_square)
     elif isinstance(move, EnPassantMove):
-        do_en_passant_move(game_state, move)
-    elif isinstance(move, PawnDoubleMove):
-        do_pawn_double_move(game_state, move)
-    elif isinstance(move, PromotionMove):
-        do_promotion_move(game_state, move)
+        return game_state.board.at(get_en_passant_captured_square(move))
     else:
-        raise ValueError("invalid move type")
+        return None
 
-    if game_state.color_to_move is Color.BLACK:
-        game_state.fullmove_count += 1
 
-    game_state.color_to_move = game_state.color_to_move.opposite()
+def get_en_passant_captured_square(move: EnPassantMove) -> Coordinate:
+    return Coordinate(move.target_square.file, move.source_square.rank)
 
 
 def do_castling_move(game_state: GameState, move: CastlingMove) -> None:
@@ -502,13 +573,28 @@ def do_castling_move(game_state: GameState, move: CastlingMove) -> None:
     rook_source_square = get_castling_rook_square(move)
     king_source_square = get_castling_king_square(move)
 
-    game_state.board.set_at(rook_source_square, None)
-    game_state.board.set_at(king_source_square, None)
+    set_piece_at(game_state, rook_source_square, None)
+    set_piece_at(game_state, king_source_square, None)
+
+    set_piece_at(game_state, king_target_square, Piece(move.color, PieceType.KING))
+    set_piece_at(game_state, rook_target_square, Piece(move.color, PieceType.ROOK))
+
+    game_state.castling_permissions.disable_all_castling_for_color(move.color)
+
 
-    game_state.board.set_at(king_target_square, Piece(move.color, PieceType.KING))
-    game_state.board.set_at(rook_target_square, Piece(move.color, PieceType.ROOK))
+CASTLING_ROOK_SQUARES = {
+    get_castling_rook_square(CastlingMove(side, color)): CastlingMove(side, color)
+    for color in Color
+    for side in CastlingSide
+}
 
-    game_state.castling_permissions.set_can_castle_on_side(move.color, move.side, False)
+
+def disable_castling_with_rook_on_square(game_state: GameState, square: Coordinate) -> None:
+    # a rook leaving or being captured on its starting square ends castling on that side
+    castling_move = CASTLING_ROOK_SQUARES.get(square)
+
+    if castling_move is not None:
+        game_state.castling_permissions.set_can_castle_on_side(castling_move.color, castling_move.side, False)
 
 
 def do_pawn_double_move(game_state: GameState, move: PawnDoubleMove) -> None:
@@ -517,8 +603,11 @@ def do_pawn_double_move(game_state: GameState, move: PawnDoubleMove) -> None:
     if source_piece is None:
         raise ValueError("move.source_square is empty")
 
-    game_state.board.set_at(move.source_square, None)
-    game_state.board.set_at(move.target_square, source_piece)
+    set_piece_at(game_state, move.source_square, None)
+    set_piece_at(game_state, move.target_square, source_piece)
+
+    forward = get_forward_direction_for_color(source_piece.color)
+    game_state.en_passant_target_square = Coordinate(move.source_square.file, move.source_square.rank + forward)
 
     game_state.halfmove_clock = 0
     
@@ -529,8 +618,10 @@ def do_promotion_move(game_state: GameState, move: PromotionMove):
     if source_piece is None:
         raise ValueError("move.source_square is empty")
 
-    game_state.board.set_at(move.source_square, None)
-    game_state.board.set_at(move.target_square, Piece(source_piece.color, move.promote_to))
+    set_piece_at(game_state, move.source_square, None)
+    set_piece_at(game_state, move.target_square, Piece(source_piece.color, move.promote_to))
+
+    disable_castling_with_rook_on_square(game_state, move.target_square)
     
     game_state.halfmove_clock = 0
 
@@ -541,12 +632,9 @@ def do_en_passant_move(game_state: GameState, move: EnPassantMove):
     if source_piece is None:
         raise ValueError("move.source_square is empty")
 
-    forward = get_forward_direction_for_color(source_piece.color)
-    attacking_square = Coordinate(move.target_square.file, move.target_square.rank - forward)
-
-    game_state.board.set_at(move.source_square, None)
-    game_state.board.set_at(attacking_square, None)
-    game_state.board.set_at(move.target_square, source_piece)
+    set_piece_at(game_state, move.source_square, None)
+    set_piece_at(game_state, get_en_passant_captured_square(move), None)
+    set_piece_at(game_state, move.target_square, source_piece)
 
     game_state.halfmove_clock = 0
 
@@ -566,31 +654,78 @@ def do_basic_move(game_state: GameState, move: BasicMove):
     if target_piece is not None and target_piece.piece_type == PieceType.KING:
         game_state.castling_permissions.disable_all_castling_for_color(target_piece.color)
 
-    kingside_castling_move = CastlingMove(CastlingSide.KINGSIDE, piece_color)
-    queenside_castling_move = CastlingMove(CastlingSide.QUEENSIDE, piece_color)
-    kingside_rook_square = get_castling_rook_square(kingside_castling_move)
-    queenside_rook_square = get_castling_rook_square(queenside_castling_move)
-
-    if move.source_square == kingside_rook_square:
-        game_state.castling_permissions.set_can_castle_on_side(piece_color, CastlingSide.KINGSIDE, False)
-    elif move.source_square == queenside_rook_square:
-        game_state.castling_permissions.set_can_castle_on_side(piece_color, CastlingSide.QUEENSIDE, False)
-
-    if move.target_square == kingside_rook_square:
-        game_state.castling_permissions.set_can_castle_on_side(piece_color.opposite(), CastlingSide.KINGSIDE, False)
-    elif move.target_square == queenside_rook_square:
-        game_state.castling_permissions.set_can_castle_on_side(piece_color.opposite(), CastlingSide.QUEENSIDE, False)
+    disable_castling_with_rook_on_square(game_state, move.source_square)
+    disable_castling_with_rook_on_square(game_state, move.target_square)
 
     if target_piece is not None or source_piece.piece_type == PieceType.PAWN:
         game_state.halfmove_clock = 0
     else:
         game_state.halfmove_clock += 1
 
-    game_state.board.set_at(move.source_square, None)
-    game_state.board.set_at(move.target_square, source_piece)
+    set_piece_at(game_state, move.source_square, None)
+    set_piece_at(game_state, move.target_square, source_piece)
+
+
+def undo_move(game_state: GameState, move: Move, undo_info: UndoInfo) -> None:
+    game_state.color_to_move = game_state.color_to_move.opposite()
+
+    if game_state.color_to_move is Color.BLACK:
+        game_state.fullmove_count -= 1
+
+    if isinstance(move, BasicMove) or isinstance(move, PawnDoubleMove):
+        undo_basic_move(game_state, move, undo_info)
+    elif isinstance(move, CastlingMove):
+        undo_castling_move(game_state, move)
+    elif isinstance(move, EnPassantMove):
+        undo_en_passant_move(game_state, move, undo_info)
+    elif isinstance(move, PromotionMove):
+        undo_promotion_move(game_state, move, undo_info)
+    else:
+        raise ValueError("invalid move type")
+
+    game_state.castling_permissions.set_flags(undo_info.castling_flags)
+    game_state.en_passant_target_square = undo_info.en_passant_target_square
+    game_state.halfmove_clock = undo_info.halfmove_clock
+    game_state.zobrist_key = undo_info.zobrist_key
+    game_state.middlegame_score = undo_info.middlegame_score
+    game_state.endgame_score = undo_info.endgame_score
+    game_state.phase = undo_info.phase
+
+
+def undo_basic_move(game_state: GameState, move: Union[BasicMove, PawnDoubleMove], undo_info: UndoInfo) -> None:
+    moved_piece = game_state.board.at(move.target_square)
+
+    game_state.board.set_at(move.source_square, moved_piece)
+    game_state.board.set_at(move.target_square, undo_info.captured_piece)
+
+
+def undo_castling_move(game_state: GameState, move: CastlingMove) -> None:
+    game_state.board.set_at(get_castling_king_target_square(move), None)
+    game_state.board.set_at(get_castling_rook_target_square(move), None)
+
+    game_state.board.set_at(get_castling_king_square(move), Piece(move.color, PieceType.KING))
+    game_state.board.set_at(get_castling_rook_square(move), Piece(move.color, PieceType.ROOK))
+
+
+def undo_en_passant_move(game_state: GameState, move: EnPassantMove, undo_info: UndoInfo) -> None:
+    moved_piece = game_state.board.at(move.target_square)
+
+    game_state.board.set_at(move.target_square, None)
+    game_state.board.set_at(move.source_square, moved_piece)
+    game_state.board.set_at(get_en_passant_captured_square(move), undo_info.captured_piece)
+
+
+def undo_promotion_move(game_state: GameState, move: PromotionMove, undo_info: UndoInfo) -> None:
+    promoted_piece = game_state.board.at(move.target_square)
+
+    if promoted_piece is None:
+        raise ValueError("move.target_square is empty")
+
+    game_state.board.set_at(move.source_square, Piece(promoted_piece.color, PieceType.PAWN))
+    game_state.board.set_at(move.target_square, undo_info.captured_piece)
 
 
 def is_legal_move(game_state: GameState, move: Move):
-    possible_moves = generate_moves(game_state)
+    possible_moves = get_cached_moves(game_state)
 
     return move in possible_moves
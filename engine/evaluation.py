@@ -0,0 +1,30 @@
+from typing import Dict
+from color import Color
+from piece import PieceType
+from game_state.game_state import GameState
+from game_state.piece_square_tables import MAX_PHASE
+
+# nominal values for move ordering and exchanges; the evaluation itself uses
+# the phase dependent values of game_state.piece_square_tables
+PIECE_VALUES: Dict[PieceType, int] = {
+    PieceType.PAWN: 100,
+    PieceType.KNIGHT: 320,
+    PieceType.BISHOP: 330,
+    PieceType.ROOK: 500,
+    PieceType.QUEEN: 900,
+    PieceType.KING: 0,
+}
+
+
+# centipawns for the side to move, tapered between the middlegame and endgame
+# tables; reads the terms do_move keeps, so it costs the same in any position
+def evaluate(game_state: GameState) -> int:
+    # promotions can push the phase past its starting value
+    phase = min(game_state.phase, MAX_PHASE)
+    # truncated rather than floored, so mirrored positions score the same
+    score = int((game_state.middlegame_score * phase + game_state.endgame_score * (MAX_PHASE - phase)) / MAX_PHASE)
+
+    if game_state.color_to_move is Color.WHITE:
+        return score
+    else:
+        return -score
@@ -0,0 +1,257 @@
+from typing import Dict, Set
+from game_state.game_state import GameState
+from move import (
+    Move,
+    BasicMove,
+    EnPassantMove,
+    PawnDoubleMove,
+    CastlingMove,
+    PromotionMove
+)
+from color import Color
+from coordinate import Coordinate
+from piece import Piece, PieceType
+from castling_side import CastlingSide
+from engine.castling_squares import (
+    get_castling_intermediary_squares,
+    get_castling_passthrough_squares,
+    get_castling_king_target_square
+)
+from engine.attack_tables import KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS
+from engine.attacks import (
+    BETWEEN,
+    POSITIVE_ROOK_RAYS,
+    NEGATIVE_ROOK_RAYS,
+    POSITIVE_BISHOP_RAYS,
+    NEGATIVE_BISHOP_RAYS,
+    get_attackers,
+    get_rook_attacks,
+    get_bishop_attacks,
+    square_is_attacked
+)
+from game_state.bitboard import (
+    FULL_BITBOARD,
+    PIECE_INDICES,
+    SQUARE_COORDINATES,
+    get_square_index,
+    get_lowest_square_index,
+    get_highest_square_index,
+    iter_square_indices
+)
+
+PROMOTION_PIECE_TYPES = [PieceType.QUEEN, PieceType.ROOK, PieceType.BISHOP, PieceType.KNIGHT]
+
+PAWN_FORWARD_OFFSETS = {Color.WHITE: 8, Color.BLACK: -8}
+PAWN_START_RANKS = {Color.WHITE: 1, Color.BLACK: 6}
+PAWN_PROMOTION_RANKS = {Color.WHITE: 7, Color.BLACK: 0}
+
+_PIECE_TYPE_INDICES = {
+    color: {piece_type: PIECE_INDICES[Piece(color, piece_type)] for piece_type in PieceType}
+    for color in Color
+}
+
+
+# checkers and pins are found once from the king; in check, non-king moves
+# must land on the checker or between it and the king, and a pinned piece
+# may only move along its pin ray
+def generate_legal_moves(game_state: GameState) -> Set[Move]:
+    board = game_state.board
+    color = game_state.color_to_move
+    enemy_color = color.opposite()
+    piece_indices = _PIECE_TYPE_INDICES[color]
+
+    own_occupancy = board.get_color_occupancy(color)
+    king_bitboard = board.piece_bitboards[piece_indices[PieceType.KING]]
+
+    if king_bitboard == 0:
+        raise ValueError("king not found")
+
+    king_index = get_lowest_square_index(king_bitboard)
+    checkers = get_attackers(board, king_index, enemy_color)
+
+    result: Set[Move] = set()
+    _add_king_moves(game_state, result, king_index, color)
+
+    if checkers & (checkers - 1):
+        # double check, only the king can move
+        return result
+
+    if checkers:
+        checker_index = get_lowest_square_index(checkers)
+        target_mask = checkers | BETWEEN[king_index][checker_index]
+    else:
+        target_mask = FULL_BITBOARD
+        _add_castling_moves(game_state, result, color)
+
+    pin_masks = get_pin_masks(game_state, king_index, color)
+    allowed_targets = ~own_occupancy & target_mask
+
+    for piece_type in [PieceType.KNIGHT, PieceType.BISHOP, PieceType.ROOK, PieceType.QUEEN]:
+        for source_index in iter_square_indices(board.piece_bitboards[piece_indices[piece_type]]):
+            targets = _get_piece_attacks(piece_type, source_index, board.occupancy) & allowed_targets
+            targets &= pin_masks.get(source_index, FULL_BITBOARD)
+
+            source_square = SQUARE_COORDINATES[source_index]
+
+            for target_index in iter_square_indices(targets):
+                result.add(BasicMove(source_square, SQUARE_COORDINATES[target_index]))
+
+    _add_pawn_moves(game_state, result, target_mask, pin_masks, king_index, color)
+
+    return result
+
+
+# square of each piece of color pinned to its king to the squares it may
+# still move to, the ray up to and including the pinner
+def get_pin_masks(game_state: GameState, king_index: int, color: Color) -> Dict[int, int]:
+    board = game_state.board
+    enemy_indices = _PIECE_TYPE_INDICES[color.opposite()]
+    enemy_queens = board.piece_bitboards[enemy_indices[PieceType.QUEEN]]
+    enemy_rooks = board.piece_bitboards[enemy_indices[PieceType.ROOK]] | enemy_queens
+    enemy_bishops = board.piece_bitboards[enemy_indices[PieceType.BISHOP]] | enemy_queens
+
+    own_occupancy = board.get_color_occupancy(color)
+    occupancy = board.occupancy
+    result = {}
+
+    for ray_tables, sliders, get_nearest_index in [
+        (POSITIVE_ROOK_RAYS, enemy_rooks, get_lowest_square_index),
+        (NEGATIVE_ROOK_RAYS, enemy_rooks, get_highest_square_index),
+        (POSITIVE_BISHOP_RAYS, enemy_bishops, get_lowest_square_index),
+        (NEGATIVE_BISHOP_RAYS, enemy_bishops, get_highest_square_index),
+    ]:
+        if not sliders:
+            continue
+
+        for ray_table in ray_tables:
+            blockers = ray_table[king_index] & occupancy
+
+            if not blockers:
+                continue
+
+            pinned_index = get_nearest_index(blockers)
+
+            if not own_occupancy >> pinned_index & 1:
+                continue
+
+            blockers ^= 1 << pinned_index
+
+            if not blockers:
+                continue
+
+            pinner_index = get_nearest_index(blockers)
+
+            if sliders >> pinner_index & 1:
+                result[pinned_index] = BETWEEN[king_index][pinner_index] | 1 << pinner_index
+
+    return result
+
+
+def _get_piece_attacks(piece_type: PieceType, square_index: int, occupancy: int) -> int:
+    if piece_type is PieceType.KNIGHT:
+        return KNIGHT_ATTACKS[square_index]
+    elif piece_type is PieceType.BISHOP:
+        return get_bishop_attacks(square_index, occupancy)
+    elif piece_type is PieceType.ROOK:
+        return get_rook_attacks(square_index, occupancy)
+    else:
+        return get_rook_attacks(square_index, occupancy) | get_bishop_attacks(square_index, occupancy)
+
+
+def _add_king_moves(game_state: GameState, result: Set[Move], king_index: int, color: Color) -> None:
+    board = game_state.board
+    enemy_color = color.opposite()
+    occupancy_without_king = board.occupancy ^ 1 << king_index
+    king_square = SQUARE_COORDINATES[king_index]
+
+    for target_index in iter_square_indices(KING_ATTACKS[king_index] & ~board.get_color_occupancy(color)):
+        # the king is lifted off the board so it cannot hide behind itself
+        # from a slider checking along the line it moves on
+        if not get_attackers(board, target_index, enemy_color, occupancy_without_king):
+            result.add(BasicMove(king_square, SQUARE_COORDINATES[target_index]))
+
+
+def _add_castling_moves(game_state: GameState, result: Set[Move], color: Color) -> None:
+    board = game_state.board
+    enemy_color = color.opposite()
+
+    for side in [CastlingSide.KINGSIDE, CastlingSide.QUEENSIDE]:
+        if not game_state.castling_permissions.can_castle_on_side(color, side):
+            continue
+
+        move = CastlingMove(side, color)
+
+        if any(not board.square_is_empty(square) for square in get_castling_intermediary_squares(move)):
+            continue
+
+        king_path = get_castling_passthrough_squares(move)
+        king_path.add(get_castling_king_target_square(move))
+
+        if any(square_is_attacked(board, get_square_index(square), enemy_color) for square in king_path):
+            continue
+
+        result.add(move)
+
+
+def _add_pawn_moves(game_state: GameState, result: Set[Move], target_mask: int, pin_masks: Dict[int, int], king_index: int, color: Color) -> None:
+    board = game_state.board
+    pawn_bitboard = board.piece_bitboards[_PIECE_TYPE_INDICES[color][PieceType.PAWN]]
+    enemy_occupancy = board.get_color_occupancy(color.opposite())
+    forward_offset = PAWN_FORWARD_OFFSETS[color]
+    start_rank = PAWN_START_RANKS[color]
+    promotion_rank = PAWN_PROMOTION_RANKS[color]
+    pawn_attacks = PAWN_ATTACKS[color]
+
+    for source_index in iter_square_indices(pawn_bitboard):
+        allowed_targets = target_mask & pin_masks.get(source_index, FULL_BITBOARD)
+        source_square = SQUARE_COORDINATES[source_index]
+        forward_index = source_index + forward_offset
+
+        if not 0 <= forward_index <= 63:
+            continue
+
+        if not board.occupancy >> forward_index & 1:
+            if allowed_targets >> forward_index & 1:
+                _add_pawn_move(result, source_square, forward_index, promotion_rank)
+
+            double_forward_index = forward_index + forward_offset
+
+            if source_index // 8 == start_rank and not board.occupancy >> double_forward_index & 1 and allowed_targets >> double_forward_index & 1:
+                result.add(PawnDoubleMove(source_square, SQUARE_COORDINATES[double_forward_index]))
+
+        for target_index in iter_square_indices(pawn_attacks[source_index] & enemy_occupancy & allowed_targets):
+            _add_pawn_move(result, source_square, target_index, promotion_rank)
+
+    en_passant_target = game_state.en_passant_target_square
+
+    if en_passant_target is not None:
+        _add_en_passant_moves(game_state, result, get_square_index(en_passant_target), king_index, color)
+
+
+def _add_pawn_move(result: Set[Move], source_square: Coordinate, target_index: int, promotion_rank: int) -> None:
+    target_square = SQUARE_COORDINATES[target_index]
+
+    if target_index // 8 == promotion_rank:
+        for piece_type in PROMOTION_PIECE_TYPES:
+            result.add(PromotionMove(source_square, target_square, piece_type))
+    else:
+        result.add(BasicMove(source_square, target_square))
+
+
+def _add_en_passant_moves(game_state: GameState, result: Set[Move], target_index: int, king_index: int, color: Color) -> None:
+    board = game_state.board
+    pawn_bitboard = board.piece_bitboards[_PIECE_TYPE_INDICES[color][PieceType.PAWN]]
+    captured_index = target_index - PAWN_FORWARD_OFFSETS[color]
+
+    # pawns of our color that could capture onto the target are the ones an
+    # enemy pawn standing on the target would attack
+    capturing_pawns = PAWN_ATTACKS[color.opposite()][target_index] & pawn_bitboard
+
+    for source_index in iter_square_indices(capturing_pawns):
+        # both pawns leave their squares at once, which pin masks cannot
+        # describe, so the resulting occupancy is checked directly
+        occupancy = (board.occupancy ^ 1 << source_index ^ 1 << captured_index) | 1 << target_index
+        attackers = get_attackers(board, king_index, color.opposite(), occupancy)
+
+        if not attackers:
+            result.add(EnPassantMove(SQUARE_COORDINATES[source_index], SQUARE_COORDINATES[target_index]))
@@ -0,0 +1,90 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, FrozenSet, Set
+from game_state.game_state import GameState
+from move import Move
+
+DEFAULT_MOVE_CACHE_SIZE = 256
+
+
+@dataclass
+class MoveCacheStatistics:
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+
+        if lookups == 0:
+            return 0.0
+
+        return self.hits / lookups
+
+
+# legal move sets by zobrist key, least recently used evicted first; shared
+# by the rendering and business logic threads
+class MoveCache:
+    def __init__(self, generate: Callable[[GameState], Set[Move]], max_size: int = DEFAULT_MOVE_CACHE_SIZE):
+        if max_size < 1:
+            raise ValueError("max_size must be positive")
+
+        self._generate = generate
+        self._entries: "OrderedDict[int, FrozenSet[Move]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def get_moves(self, game_state: GameState) -> FrozenSet[Move]:
+        key = game_state.zobrist_key
+
+        with self._lock:
+            moves = self._entries.get(key)
+
+            if moves is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+                return moves
+
+            self.misses += 1
+
+        # generated outside the lock so that a slow generation does not
+        # stall a thread that only needs a cached position
+        moves = frozenset(self._generate(game_state))
+
+        with self._lock:
+            self._entries[key] = moves
+            self._entries.move_to_end(key)
+            self._evict_to_size()
+
+        return moves
+
+    def resize(self, max_size: int) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be positive")
+
+        with self._lock:
+            self.max_size = max_size
+            self._evict_to_size()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_statistics(self) -> MoveCacheStatistics:
+        with self._lock:
+            return MoveCacheStatistics(self.hits, self.misses, len(self._entries), self.max_size)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict_to_size(self) -> None:
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
@@ -0,0 +1,88 @@
+from typing import Dict, List
+from move import (
+    Move,
+    BasicMove,
+    CastlingMove,
+    EnPassantMove,
+    PawnDoubleMove,
+    PromotionMove
+)
+from color import Color
+from castling_side import CastlingSide
+from piece import PieceType
+from game_state.bitboard import SQUARE_COORDINATES, get_square_index
+from engine.castling_squares import get_castling_king_square, get_castling_king_target_square
+
+# a packed move is 16 bits: source square, target square and a 4 bit kind.
+# castling is stored as the king's move. 0 (a1 to a1) is never a real move
+NO_MOVE = 0
+
+BASIC_MOVE_FLAG = 0
+PAWN_DOUBLE_MOVE_FLAG = 1
+EN_PASSANT_MOVE_FLAG = 2
+CASTLING_MOVE_FLAG = 3
+_PROMOTION_FLAGS: Dict[PieceType, int] = {
+    PieceType.KNIGHT: 4,
+    PieceType.BISHOP: 5,
+    PieceType.ROOK: 6,
+    PieceType.QUEEN: 7,
+}
+_PROMOTION_PIECE_TYPES: Dict[int, PieceType] = {flag: piece_type for piece_type, flag in _PROMOTION_FLAGS.items()}
+
+_FLAGS = {
+    BasicMove: BASIC_MOVE_FLAG,
+    PawnDoubleMove: PAWN_DOUBLE_MOVE_FLAG,
+    EnPassantMove: EN_PASSANT_MOVE_FLAG,
+}
+_MOVE_CLASSES = {flag: move_class for move_class, flag in _FLAGS.items()}
+
+
+def _pack(source_index: int, target_index: int, flag: int) -> int:
+    return source_index | target_index << 6 | flag << 12
+
+
+def pack_move(move: Move) -> int:
+    if isinstance(move, CastlingMove):
+        source_index = get_square_index(get_castling_king_square(move))
+        target_index = get_square_index(get_castling_king_target_square(move))
+
+        return _pack(source_index, target_index, CASTLING_MOVE_FLAG)
+
+    source_index = get_square_index(move.source_square)
+    target_index = get_square_index(move.target_square)
+
+    if isinstance(move, PromotionMove):
+        return _pack(source_index, target_index, _PROMOTION_FLAGS[move.promote_to])
+
+    return _pack(source_index, target_index, _FLAGS[type(move)])
+
+
+def unpack_move(packed_move: int) -> Move:
+    if not 0 < packed_move < 1 << 16:
+        raise ValueError(f"cannot unpack move: {packed_move} is not a packed move")
+
+    source_square = SQUARE_COORDINATES[packed_move & 63]
+    target_square = SQUARE_COORDINATES[packed_move >> 6 & 63]
+    flag = packed_move >> 12
+
+    if flag == CASTLING_MOVE_FLAG:
+        color = Color.WHITE if source_square.rank == 0 else Color.BLACK
+        side = CastlingSide.KINGSIDE if target_square.file > source_square.file else CastlingSide.QUEENSIDE
+
+        return CastlingMove(side, color)
+
+    if flag in _PROMOTION_PIECE_TYPES:
+        return PromotionMove(source_square, target_square, _PROMOTION_PIECE_TYPES[flag])
+
+    if flag not in _MOVE_CLASSES:
+        raise ValueError(f"cannot unpack move: unknown move flag {flag}")
+
+    return _MOVE_CLASSES[flag](source_square, target_square)
+
+
+def pack_moves(moves: List[Move]) -> List[int]:
+    return [pack_move(move) for move in moves]
+
+
+def unpack_moves(packed_moves: List[int]) -> List[Move]:
+    return [unpack_move(packed_move) for packed_move in packed_moves]
@@ -0,0 +1,170 @@
+import time
+from typing import List, Optional, Tuple
+from game_state.game_state import GameState
+from parsing.fen_parser import FenParser
+from engine.engine import generate_moves, do_move, is_in_check
+from engine.move_packing import pack_moves, unpack_move, unpack_moves
+from engine.search import (
+    Searcher,
+    SearchResult,
+    SearchTimeout,
+    MATE_SCORE,
+    INFINITE_SCORE,
+    DEFAULT_SEARCH_DEPTH,
+    MAX_SEARCH_DEPTH,
+    is_mate_score,
+    order_root_moves
+)
+from engine.transposition_table import TranspositionTable
+from process_context import get_process_context
+
+# every worker allocates its own table of this size, so the total is this
+# times the number of processes
+DEFAULT_WORKER_TRANSPOSITION_TABLE_MEGABYTES = 16
+
+# root moves scoring this far below the previous iteration's best are only
+# proven worse, not scored exactly, which saves searching them in full
+ASPIRATION_WINDOW = 50
+
+# fen, packed root move, depth, alpha, deadline as time.time() or None
+_RootMoveTask = Tuple[str, int, int, int, Optional[float]]
+# packed root move, score or None if out of time, packed principal
+# variation and nodes searched
+_RootMoveResult = Tuple[int, Optional[int], List[int], int]
+
+_worker_transposition_table: Optional[TranspositionTable] = None
+
+
+def _initialize_worker(transposition_table_megabytes: float) -> None:
+    global _worker_transposition_table
+
+    _worker_transposition_table = TranspositionTable(transposition_table_megabytes)
+
+
+def _search_root_move(task: _RootMoveTask) -> _RootMoveResult:
+    fen, packed_move, depth, alpha, deadline = task
+    game_state = FenParser().parse(fen)
+    move = unpack_move(packed_move)
+
+    # the deadline is wall clock time, as tasks may wait in the queue and
+    # monotonic clocks are not guaranteed to agree between processes
+    time_limit = None if deadline is None else deadline - time.time()
+
+    _worker_transposition_table.new_search()
+    searcher = Searcher(game_state, _worker_transposition_table, time_limit)
+
+    do_move(game_state, move)
+    searcher.position_keys.append(game_state.zobrist_key)
+
+    try:
+        score = -searcher.negamax(depth - 1, 1, -INFINITE_SCORE, -alpha)
+    except SearchTimeout:
+        return packed_move, None, [], searcher.nodes
+
+    principal_variation = [move] + searcher.principal_variations[1]
+
+    return packed_move, score, pack_moves(principal_variation), searcher.nodes
+
+
+def _count_nodes(root_move_results: List[_RootMoveResult]) -> int:
+    return sum(nodes for _, _, _, nodes in root_move_results)
+
+
+# splits the root moves of each iteration between worker processes and
+# merges their scores; positions go to the workers as FEN, so repetitions
+# through the game history are not seen
+class ParallelSearcher:
+    def __init__(self, processes: Optional[int] = None, transposition_table_megabytes: float = DEFAULT_WORKER_TRANSPOSITION_TABLE_MEGABYTES):
+        context = get_process_context()
+
+        self._pool = context.Pool(processes, initializer=_initialize_worker, initargs=(transposition_table_megabytes,))
+        self._fen_parser = FenParser()
+
+    def search(self, game_state: GameState, time_limit: Optional[float] = None, depth: Optional[int] = None) -> SearchResult:
+        if time_limit is None and depth is None:
+            depth = DEFAULT_SEARCH_DEPTH
+
+        start_time = time.time()
+        deadline = None if time_limit is None else start_time + time_limit
+        max_depth = depth if depth is not None else MAX_SEARCH_DEPTH
+
+        # ordered as the serial search orders them, so that both fall back to
+        # the same move and the likeliest best moves are handed out first
+        root_moves = order_root_moves(game_state, generate_moves(game_state))
+
+        if len(root_moves) == 0:
+            score = -MATE_SCORE if is_in_check(game_state, game_state.color_to_move) else 0
+
+            return SearchResult(None, score)
+
+        fen = self._fen_parser.serialize(game_state)
+        packed_root_moves = pack_moves(root_moves)
+        result = SearchResult(root_moves[0], 0)
+        nodes = 0
+
+        for current_depth in range(1, max_depth + 1):
+            if deadline is not None and time.time() >= deadline:
+                break
+
+            if current_depth == 1 or is_mate_score(result.score):
+                alpha = -INFINITE_SCORE
+            else:
+                alpha = result.score - ASPIRATION_WINDOW
+
+            try:
+                root_move_results = self._search_root_moves(fen, packed_root_moves, current_depth, alpha, deadline)
+                nodes += _count_nodes(root_move_results)
+
+                # every move failed low, so none has an exact score to compare
+                if max(score for _, score, _, _ in root_move_results) <= alpha:
+                    root_move_results = self._search_root_moves(fen, packed_root_moves, current_depth, -INFINITE_SCORE, deadline)
+                    nodes += _count_nodes(root_move_results)
+            except SearchTimeout as timeout:
+                nodes += timeout.args[0]
+                break
+
+            # the best move of this iteration is handed out first next time
+            root_move_results.sort(key=lambda root_move_result: root_move_result[1], reverse=True)
+            packed_root_moves = [root_move_result[0] for root_move_result in root_move_results]
+
+            _, score, packed_principal_variation, _ = root_move_results[0]
+            principal_variation = unpack_moves(packed_principal_variation)
+            result = SearchResult(principal_variation[0], score, principal_variation, nodes, current_depth)
+
+            if is_mate_score(score):
+                break
+
+            # as in Searcher, the next iteration would rarely finish in time
+            if deadline is not None and time.time() - start_time >= time_limit / 2:
+                break
+
+        result.nodes = nodes
+
+        return result
+
+    def _search_root_moves(self, fen: str, packed_root_moves: List[int], depth: int, alpha: int, deadline: Optional[float]) -> List[_RootMoveResult]:
+        tasks = [(fen, packed_move, depth, alpha, deadline) for packed_move in packed_root_moves]
+        root_move_results = self._pool.map(_search_root_move, tasks, chunksize=1)
+
+        # carries the nodes searched before running out of time
+        if any(score is None for _, score, _, _ in root_move_results):
+            raise SearchTimeout(_count_nodes(root_move_results))
+
+        return root_move_results
+
+    def close(self) -> None:
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self) -> "ParallelSearcher":
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        self.close()
+
+
+# starting the pool takes a while, so keep a ParallelSearcher to search more
+# than once
+def parallel_search(game_state: GameState, time_limit: Optional[float] = None, depth: Optional[int] = None, processes: Optional[int] = None) -> SearchResult:
+    with ParallelSearcher(processes) as searcher:
+        return searcher.search(game_state, time_limit, depth)
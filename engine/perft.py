@@ -0,0 +1,163 @@
+import argparse
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from game_state.game_state import GameState
+from parsing.fen_parser import FenParser
+from move import Move
+from engine.engine import generate_moves, do_move, undo_move
+import notation
+
+
+@dataclass
+class PerftPosition:
+    name: str
+    fen: str
+    # node counts for depth 1, 2, 3, ...
+    node_counts: List[int]
+
+
+# reference counts from https://www.chessprogramming.org/Perft_Results
+PERFT_SUITE = [
+    PerftPosition(
+        "initial position",
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        [20, 400, 8902, 197281, 4865609],
+    ),
+    PerftPosition(
+        "kiwipete",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        [48, 2039, 97862, 4085603],
+    ),
+    PerftPosition(
+        "position 3",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        [14, 191, 2812, 43238, 674624],
+    ),
+    PerftPosition(
+        "position 4",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        [6, 264, 9467, 422333],
+    ),
+    PerftPosition(
+        "position 4 mirrored",
+        "r2q1rk1/pP1p2pp/Q4n2/bbp1p3/Np6/1B3NBn/pPPP1PPP/R3K2R b KQ - 0 1",
+        [6, 264, 9467, 422333],
+    ),
+    PerftPosition(
+        "position 5",
+        "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+        [44, 1486, 62379, 2103487],
+    ),
+    PerftPosition(
+        "position 6",
+        "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+        [46, 2079, 89890, 3894594],
+    ),
+]
+
+
+def perft(game_state: GameState, depth: int) -> int:
+    if depth == 0:
+        return 1
+
+    moves = generate_moves(game_state)
+
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+
+    for move in moves:
+        undo_info = do_move(game_state, move)
+        nodes += perft(game_state, depth - 1)
+        undo_move(game_state, move, undo_info)
+
+    return nodes
+
+
+def divide(game_state: GameState, depth: int) -> Dict[Move, int]:
+    result = {}
+
+    for move in generate_moves(game_state):
+        undo_info = do_move(game_state, move)
+        result[move] = perft(game_state, depth - 1)
+        undo_move(game_state, move, undo_info)
+
+    return result
+
+
+def run_divide(fen: str, depth: int) -> int:
+    game_state = FenParser().parse(fen)
+
+    start_time = time.perf_counter()
+    node_counts = divide(game_state, depth)
+    elapsed_time = time.perf_counter() - start_time
+
+    for formatted_move, node_count in sorted((notation.move_to_uci(move), count) for move, count in node_counts.items()):
+        print(f"{formatted_move}: {node_count}")
+
+    total_nodes = sum(node_counts.values())
+    _print_summary(total_nodes, elapsed_time)
+
+    return total_nodes
+
+
+def run_suite(max_depth: Optional[int] = None) -> bool:
+    fen_parser = FenParser()
+    all_passed = True
+    total_nodes = 0
+    total_time = 0.0
+
+    for position in PERFT_SUITE:
+        for depth, expected_nodes in enumerate(position.node_counts, start=1):
+            if max_depth is not None and depth > max_depth:
+                break
+
+            game_state = fen_parser.parse(position.fen)
+
+            start_time = time.perf_counter()
+            nodes = perft(game_state, depth)
+            elapsed_time = time.perf_counter() - start_time
+
+            total_nodes += nodes
+            total_time += elapsed_time
+
+            status = "ok" if nodes == expected_nodes else f"FAILED (expected {expected_nodes})"
+            all_passed = all_passed and nodes == expected_nodes
+
+            print(f"{position.name} depth {depth}: {nodes} {status} [{_format_nodes_per_second(nodes, elapsed_time)}]")
+
+    _print_summary(total_nodes, total_time)
+
+    return all_passed
+
+
+def _format_nodes_per_second(nodes: int, elapsed_time: float) -> str:
+    if elapsed_time == 0:
+        return "- nps"
+
+    return f"{nodes / elapsed_time:.0f} nps"
+
+
+def _print_summary(nodes: int, elapsed_time: float) -> None:
+    print()
+    print(f"Nodes searched: {nodes}")
+    print(f"Time: {elapsed_time:.3f}s")
+    print(f"Nodes per second: {_format_nodes_per_second(nodes, elapsed_time)}")
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Count move generation leaf nodes")
+    argument_parser.add_argument("depth", type=int, nargs="?", default=3)
+    argument_parser.add_argument("--fen", help="divide this position instead of running the suite")
+    arguments = argument_parser.parse_args()
+
+    if arguments.fen is not None:
+        run_divide(arguments.fen, arguments.depth)
+    elif not run_suite(arguments.depth):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,449 @@
+import threading
+import time
+from copy import deepcopy
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+from game_state.game_state import GameState
+from game_state.bitboard import PIECE_INDICES, get_square_index
+from move import (
+    Move,
+    CastlingMove,
+    EnPassantMove,
+    PromotionMove
+)
+from piece import PieceType
+from engine.engine import (
+    generate_moves,
+    do_move,
+    undo_move,
+    is_in_check,
+    get_move_source_square,
+    get_move_target_square,
+    get_captured_piece
+)
+from engine.evaluation import evaluate, PIECE_VALUES
+from engine.see import static_exchange_evaluation
+from engine.transposition_table import TranspositionTable, Bound
+from engine.move_packing import pack_move
+
+MATE_SCORE = 100000
+# scores beyond this are mates, counted in plies from the root
+MATE_THRESHOLD = MATE_SCORE - 1000
+INFINITE_SCORE = MATE_SCORE + 1
+
+DEFAULT_SEARCH_DEPTH = 4
+MAX_SEARCH_DEPTH = 64
+
+# how many nodes pass between clock checks
+TIME_CHECK_INTERVAL = 64
+
+MAX_KILLER_MOVES = 2
+
+CAPTURE_ORDER_OFFSET = 1_000_000
+KILLER_ORDER_OFFSET = 500_000
+
+# a capture that cannot lift the static score this close to alpha is skipped
+# by the quiescence search
+DELTA_MARGIN = 200
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+@dataclass
+class SearchResult:
+    best_move: Optional[Move]
+    score: int
+    principal_variation: List[Move] = field(default_factory=list)
+    nodes: int = 0
+    depth: int = 0
+
+
+# allocating a table takes longer than a short search, so each thread
+# makes one and reuses it; sharing one between threads would let a search
+# overwrite the entries of another still running
+_default_transposition_tables = threading.local()
+
+
+def _get_default_transposition_table() -> TranspositionTable:
+    transposition_table = getattr(_default_transposition_tables, "transposition_table", None)
+
+    if transposition_table is None:
+        transposition_table = TranspositionTable()
+        _default_transposition_tables.transposition_table = transposition_table
+
+    return transposition_table
+
+
+# returns the deepest iteration finished within depth plies and time_limit
+# seconds; works on a copy, so the given state is never modified
+def search(
+    game_state: GameState,
+    time_limit: Optional[float] = None,
+    depth: Optional[int] = None,
+    stop_event: Optional[threading.Event] = None,
+    transposition_table: Optional[TranspositionTable] = None
+) -> SearchResult:
+    # copying the state counts against the time limit too
+    start_time = time.monotonic()
+
+    if time_limit is None and depth is None:
+        depth = DEFAULT_SEARCH_DEPTH
+
+    if transposition_table is None:
+        transposition_table = _get_default_transposition_table()
+
+    transposition_table.new_search()
+    searcher = Searcher(deepcopy(game_state), transposition_table, time_limit, stop_event, start_time)
+
+    return searcher.iterative_deepening(depth if depth is not None else MAX_SEARCH_DEPTH)
+
+
+def order_root_moves(game_state: GameState, root_moves: Iterable[Move]) -> List[Move]:
+    return Searcher(game_state, _get_default_transposition_table()).order_root_moves(root_moves)
+
+
+def is_mate_score(score: int) -> bool:
+    return abs(score) >= MATE_THRESHOLD
+
+
+# mate scores count plies from the root, but a stored position can be
+# reached at a different ply, so the table keeps them relative to the node
+def score_to_transposition_table(score: int, ply: int) -> int:
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    elif score <= -MATE_THRESHOLD:
+        return score - ply
+
+    return score
+
+
+def score_from_transposition_table(score: int, ply: int) -> int:
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    elif score <= -MATE_THRESHOLD:
+        return score + ply
+
+    return score
+
+
+class Searcher:
+    def __init__(
+        self,
+        game_state: GameState,
+        transposition_table: TranspositionTable,
+        time_limit: Optional[float] = None,
+        stop_event: Optional[threading.Event] = None,
+        start_time: Optional[float] = None
+    ):
+        self.game_state = game_state
+        self.transposition_table = transposition_table
+        self.stop_event = stop_event
+        self.start_time = time.monotonic() if start_time is None else start_time
+        self.deadline = None if time_limit is None else self.start_time + time_limit
+        self.nodes = 0
+
+        self.killer_moves: List[List[Move]] = [[] for _ in range(MAX_SEARCH_DEPTH + 1)]
+        # indexed by moving piece and target square
+        self.history_scores = [[0] * 64 for _ in PIECE_INDICES]
+        self.principal_variations: List[List[Move]] = [[] for _ in range(MAX_SEARCH_DEPTH + 2)]
+        # zobrist keys of the positions on the current path, for repetitions
+        self.position_keys: List[int] = [game_state.zobrist_key]
+
+    def iterative_deepening(self, max_depth: int) -> SearchResult:
+        root_moves = list(generate_moves(self.game_state))
+
+        if len(root_moves) == 0:
+            score = -MATE_SCORE if is_in_check(self.game_state, self.game_state.color_to_move) else 0
+
+            return SearchResult(None, score)
+
+        # in case not even the first iteration finishes
+        result = SearchResult(self.order_root_moves(root_moves)[0], 0)
+
+        for current_depth in range(1, max_depth + 1):
+            try:
+                score = self.search_root(current_depth)
+            except SearchTimeout:
+                break
+
+            principal_variation = list(self.principal_variations[0])
+            result = SearchResult(principal_variation[0], score, principal_variation, self.nodes, current_depth)
+
+            if is_mate_score(score) or self._should_not_start_iteration():
+                break
+
+        result.nodes = self.nodes
+
+        return result
+
+    def search_root(self, depth: int) -> int:
+        previous_principal_variation = self.principal_variations[0]
+        principal_move = previous_principal_variation[0] if previous_principal_variation else None
+
+        return self.negamax(depth, 0, -INFINITE_SCORE, INFINITE_SCORE, principal_move)
+
+    def negamax(self, depth: int, ply: int, alpha: int, beta: int, principal_move: Optional[Move] = None) -> int:
+        self.nodes += 1
+        self.principal_variations[ply] = []
+
+        if self.nodes % TIME_CHECK_INTERVAL == 0:
+            self._check_time()
+
+        game_state = self.game_state
+
+        if ply > 0 and self._is_draw():
+            return 0
+
+        if depth <= 0 or ply >= MAX_SEARCH_DEPTH:
+            return self.quiescence(ply, alpha, beta)
+
+        original_alpha = alpha
+        entry = self.transposition_table.probe(game_state.zobrist_key)
+
+        if entry is not None:
+            if principal_move is None:
+                principal_move = entry.best_move
+
+            # the root always searches, so that it has a move to report
+            if ply > 0 and entry.depth >= depth:
+                score = score_from_transposition_table(entry.score, ply)
+
+                if (
+                    entry.bound is Bound.EXACT
+                    or entry.bound is Bound.LOWER and score >= beta
+                    or entry.bound is Bound.UPPER and score <= alpha
+                ):
+                    return score
+
+        moves = generate_moves(game_state)
+
+        if len(moves) == 0:
+            if is_in_check(game_state, game_state.color_to_move):
+                return -MATE_SCORE + ply
+
+            return 0
+
+        best_score = -INFINITE_SCORE
+        best_move = None
+
+        for move in self.order_moves(moves, ply, principal_move):
+            is_quiet = not self._is_capture(move)
+            moving_piece = game_state.board.at(get_move_source_square(move))
+
+            undo_info = do_move(game_state, move)
+            self.position_keys.append(game_state.zobrist_key)
+
+            try:
+                score = -self.negamax(depth - 1, ply + 1, -beta, -alpha)
+            finally:
+                self.position_keys.pop()
+                undo_move(game_state, move, undo_info)
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+
+            if score > alpha:
+                alpha = score
+                self.principal_variations[ply] = [move] + self.principal_variations[ply + 1]
+
+            if alpha >= beta:
+                if is_quiet:
+                    self._store_killer_move(move, ply)
+                    self._add_history_score(moving_piece, move, depth)
+
+                break
+
+        if best_score <= original_alpha:
+            bound = Bound.UPPER
+            # every move failed low, none of them is known to be best
+            best_move = None
+        elif best_score >= beta:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+
+        self.transposition_table.store(
+            game_state.zobrist_key, depth, score_to_transposition_table(best_score, ply), bound, best_move
+        )
+
+        return best_score
+
+    # resolves captures until the position is quiet, so that leaves are not
+    # scored mid-exchange; the side to move may stand pat unless in check
+    def quiescence(self, ply: int, alpha: int, beta: int) -> int:
+        self.nodes += 1
+        self.principal_variations[ply] = []
+
+        if self.nodes % TIME_CHECK_INTERVAL == 0:
+            self._check_time()
+
+        game_state = self.game_state
+
+        if ply >= MAX_SEARCH_DEPTH:
+            return evaluate(game_state)
+
+        moves = generate_moves(game_state)
+        in_check = is_in_check(game_state, game_state.color_to_move)
+
+        if in_check:
+            if len(moves) == 0:
+                return -MATE_SCORE + ply
+
+            # every evasion is searched, there is no standing pat in check
+            stand_pat = best_score = -INFINITE_SCORE
+        else:
+            stand_pat = best_score = evaluate(game_state)
+
+            if stand_pat >= beta:
+                return stand_pat
+
+            # not even winning a queen would get back to alpha
+            if stand_pat + PIECE_VALUES[PieceType.QUEEN] + DELTA_MARGIN < alpha:
+                return stand_pat
+
+            alpha = max(alpha, stand_pat)
+            moves = [move for move in moves if self._is_capture(move)]
+
+        for move in self.order_moves(moves, ply):
+            if not in_check:
+                captured_piece = get_captured_piece(game_state, move)
+                captured_value = 0 if captured_piece is None else PIECE_VALUES[captured_piece.piece_type]
+
+                if not isinstance(move, PromotionMove) and stand_pat + captured_value + DELTA_MARGIN <= alpha:
+                    continue
+
+                if static_exchange_evaluation(game_state.board, move) < 0:
+                    continue
+
+            undo_info = do_move(game_state, move)
+
+            try:
+                score = -self.quiescence(ply + 1, -beta, -alpha)
+            finally:
+                undo_move(game_state, move, undo_info)
+
+            if score > best_score:
+                best_score = score
+
+            if score > alpha:
+                alpha = score
+                self.principal_variations[ply] = [move] + self.principal_variations[ply + 1]
+
+            if alpha >= beta:
+                break
+
+        return best_score
+
+    def order_root_moves(self, root_moves: Iterable[Move]) -> List[Move]:
+        # sorted first so that the order among equally ordered moves does not
+        # depend on set order
+        return self.order_moves(sorted(root_moves, key=pack_move), 0)
+
+    def order_moves(self, moves: Iterable[Move], ply: int, principal_move: Optional[Move] = None) -> List[Move]:
+        killer_moves = self.killer_moves[ply]
+        board = self.game_state.board
+
+        def get_order_score(move: Move) -> int:
+            if move == principal_move:
+                return CAPTURE_ORDER_OFFSET * 2
+
+            source_index = get_square_index(get_move_source_square(move))
+            target_index = get_square_index(get_move_target_square(move))
+            moving_piece = board.at_index(source_index)
+            captured_piece = board.at_index(target_index)
+
+            score = 0
+
+            if isinstance(move, PromotionMove):
+                score += CAPTURE_ORDER_OFFSET + PIECE_VALUES[move.promote_to]
+
+            if captured_piece is not None and not isinstance(move, CastlingMove):
+                captured_value = PIECE_VALUES[captured_piece.piece_type]
+
+                # a capture of a cheaper piece that loses the exchange goes
+                # after the quiet moves
+                if captured_value < PIECE_VALUES[moving_piece.piece_type]:
+                    exchange_value = static_exchange_evaluation(board, move)
+
+                    if exchange_value < 0:
+                        return exchange_value
+
+                # most valuable victim first, least valuable attacker breaking ties
+                return score + CAPTURE_ORDER_OFFSET + captured_value * 10 - PIECE_VALUES[moving_piece.piece_type] // 10
+
+            if isinstance(move, EnPassantMove):
+                return CAPTURE_ORDER_OFFSET + PIECE_VALUES[PieceType.PAWN] * 10
+
+            if score:
+                return score
+
+            if move in killer_moves:
+                return KILLER_ORDER_OFFSET
+
+            return self.history_scores[PIECE_INDICES[moving_piece]][target_index]
+
+        return sorted(moves, key=get_order_score, reverse=True)
+
+    def _is_capture(self, move: Move) -> bool:
+        if isinstance(move, EnPassantMove):
+            return True
+
+        if isinstance(move, CastlingMove):
+            return False
+
+        return self.game_state.board.at(move.target_square) is not None or isinstance(move, PromotionMove)
+
+    def _store_killer_move(self, move: Move, ply: int) -> None:
+        killer_moves = self.killer_moves[ply]
+
+        if move in killer_moves:
+            return
+
+        killer_moves.insert(0, move)
+        del killer_moves[MAX_KILLER_MOVES:]
+
+    def _add_history_score(self, moving_piece, move: Move, depth: int) -> None:
+        target_index = get_square_index(get_move_target_square(move))
+
+        self.history_scores[PIECE_INDICES[moving_piece]][target_index] += depth * depth
+
+    def _is_draw(self) -> bool:
+        game_state = self.game_state
+
+        if game_state.halfmove_clock >= 100:
+            return True
+
+        # only positions since the last capture or pawn move can repeat,
+        # and only those with the same side to move
+        key = game_state.zobrist_key
+        earliest_index = max(0, len(self.position_keys) - 1 - game_state.halfmove_clock)
+
+        for index in range(len(self.position_keys) - 3, earliest_index - 1, -2):
+            if self.position_keys[index] == key:
+                return True
+
+        return False
+
+    def _check_time(self) -> None:
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchTimeout
+
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise SearchTimeout
+
+    def _should_not_start_iteration(self) -> bool:
+        # the next iteration usually takes several times longer than the
+        # last one, so starting it past half the budget rarely completes
+        if self.stop_event is not None and self.stop_event.is_set():
+            return True
+
+        if self.deadline is None:
+            return False
+
+        elapsed_time = time.monotonic() - self.start_time
+        time_limit = self.deadline - self.start_time
+
+        return elapsed_time >= time_limit / 2
@@ -0,0 +1,89 @@
+from typing import List, Tuple
+from color import Color
+from piece import Piece, PieceType
+from move import Move, CastlingMove, EnPassantMove, PromotionMove
+from game_state.bitboard import BitBoard, PIECE_INDICES, get_square_index, get_lowest_square_index
+from engine.attacks import get_attackers
+from engine.evaluation import PIECE_VALUES
+
+# cheapest first, the order in which either side joins an exchange
+_EXCHANGE_ORDER = [PieceType.PAWN, PieceType.KNIGHT, PieceType.BISHOP, PieceType.ROOK, PieceType.QUEEN, PieceType.KING]
+
+_EXCHANGE_PIECES = {
+    color: [(PIECE_INDICES[Piece(color, piece_type)], piece_type) for piece_type in _EXCHANGE_ORDER]
+    for color in Color
+}
+
+
+# material won by making move once both sides have recaptured on its target
+# for as long as it pays, cheapest piece first; x-rays join in as lines open,
+# pins are not considered
+def static_exchange_evaluation(board: BitBoard, move: Move) -> int:
+    if isinstance(move, CastlingMove):
+        return 0
+
+    source_index = get_square_index(move.source_square)
+    target_index = get_square_index(move.target_square)
+    moving_piece = board.at_index(source_index)
+    occupancy = board.occupancy ^ (1 << source_index)
+
+    if isinstance(move, EnPassantMove):
+        captured_value = PIECE_VALUES[PieceType.PAWN]
+        occupancy ^= 1 << (source_index // 8 * 8 + target_index % 8)
+    else:
+        captured_piece = board.at_index(target_index)
+        captured_value = 0 if captured_piece is None else PIECE_VALUES[captured_piece.piece_type]
+
+    piece_on_target_value = _get_exchange_value(moving_piece.piece_type)
+
+    if isinstance(move, PromotionMove):
+        promotion_gain = PIECE_VALUES[move.promote_to] - PIECE_VALUES[PieceType.PAWN]
+        captured_value += promotion_gain
+        piece_on_target_value += promotion_gain
+
+    # gains[n] is what the side making the nth capture ends up with if the
+    # exchange stops right after it
+    gains: List[int] = [captured_value]
+    color = moving_piece.color.opposite()
+
+    while True:
+        attackers = get_attackers(board, target_index, color, occupancy)
+
+        if not attackers:
+            break
+
+        attacker_index, attacker_type = _get_least_valuable_attacker(board, attackers, color)
+
+        # the king may only take last
+        if attacker_type is PieceType.KING and get_attackers(board, target_index, color.opposite(), occupancy ^ (1 << attacker_index)):
+            break
+
+        gains.append(piece_on_target_value - gains[-1])
+
+        occupancy ^= 1 << attacker_index
+        piece_on_target_value = _get_exchange_value(attacker_type)
+        color = color.opposite()
+
+    # each side stops capturing when carrying on would lose material
+    for index in range(len(gains) - 1, 0, -1):
+        gains[index - 1] = -max(-gains[index - 1], gains[index])
+
+    return gains[0]
+
+
+def _get_least_valuable_attacker(board: BitBoard, attackers: int, color: Color) -> Tuple[int, PieceType]:
+    for piece_index, piece_type in _EXCHANGE_PIECES[color]:
+        piece_attackers = attackers & board.piece_bitboards[piece_index]
+
+        if piece_attackers:
+            return get_lowest_square_index(piece_attackers), piece_type
+
+    raise ValueError("cannot find least valuable attacker: no attackers given")
+
+
+def _get_exchange_value(piece_type: PieceType) -> int:
+    # a captured king ends the exchange, so any large value works here
+    if piece_type is PieceType.KING:
+        return PIECE_VALUES[PieceType.QUEEN] * 10
+
+    return PIECE_VALUES[piece_type]
@@ -0,0 +1,192 @@
+from array import array
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Optional
+from move import Move
+from engine.move_packing import NO_MOVE, pack_move, unpack_move
+
+DEFAULT_TRANSPOSITION_TABLE_MEGABYTES = 16
+
+# each bucket holds a depth-preferred entry followed by an always-replace
+# entry, and each entry is two 64 bit words: the full zobrist key and the
+# packed data below
+_WORDS_PER_ENTRY = 2
+_ENTRIES_PER_BUCKET = 2
+_WORDS_PER_BUCKET = _WORDS_PER_ENTRY * _ENTRIES_PER_BUCKET
+_BYTES_PER_BUCKET = _WORDS_PER_BUCKET * 8
+
+# data word layout: move (16 bits), depth (8), bound (2), generation (6),
+# score offset to be unsigned (32)
+_DEPTH_SHIFT = 16
+_BOUND_SHIFT = 24
+_GENERATION_SHIFT = 26
+_SCORE_SHIFT = 32
+_SCORE_OFFSET = 1 << 31
+_MAX_DEPTH = (1 << 8) - 1
+_GENERATION_MASK = (1 << 6) - 1
+
+# how many buckets get_statistics samples to estimate how full the table is
+_USAGE_SAMPLE_BUCKETS = 1000
+
+
+class Bound(IntEnum):
+    # 0 marks an empty entry
+    EXACT = 1
+    # the score is at least this, the search failed high
+    LOWER = 2
+    # the score is at most this, the search failed low
+    UPPER = 3
+
+
+@dataclass
+class TranspositionTableEntry:
+    depth: int
+    score: int
+    bound: Bound
+    best_move: Optional[Move]
+
+
+@dataclass
+class TranspositionTableStatistics:
+    probes: int
+    hits: int
+    stores: int
+    entries: int
+    # estimated fraction of entries written during the current search
+    usage: float
+
+    @property
+    def hit_rate(self) -> float:
+        if self.probes == 0:
+            return 0.0
+
+        return self.hits / self.probes
+
+
+def _get_bucket_count(megabytes: float) -> int:
+    if megabytes <= 0:
+        raise ValueError("megabytes must be positive")
+
+    bucket_count = int(megabytes * 1024 * 1024) // _BYTES_PER_BUCKET
+
+    if bucket_count < 1:
+        raise ValueError(f"cannot fit a transposition table bucket in {megabytes} megabytes")
+
+    # round down to a power of two so that the index is a mask of the key
+    return 1 << (bucket_count.bit_length() - 1)
+
+
+# search results by zobrist key in one preallocated array, so memory use is
+# fixed up front
+class TranspositionTable:
+    def __init__(self, megabytes: float = DEFAULT_TRANSPOSITION_TABLE_MEGABYTES):
+        self._allocate(megabytes)
+
+    def _allocate(self, megabytes: float) -> None:
+        bucket_count = _get_bucket_count(megabytes)
+
+        self._words = array("Q", bytes(bucket_count * _BYTES_PER_BUCKET))
+        self._bucket_mask = bucket_count - 1
+        self.megabytes = megabytes
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def resize(self, megabytes: float) -> None:
+        self._allocate(megabytes)
+
+    def clear(self) -> None:
+        self._allocate(self.megabytes)
+
+    def new_search(self) -> None:
+        # entries from earlier searches stay usable but lose their claim
+        # on the depth-preferred slots
+        self.generation = (self.generation + 1) & _GENERATION_MASK
+
+    def probe(self, key: int) -> Optional[TranspositionTableEntry]:
+        words = self._words
+        bucket_index = (key & self._bucket_mask) * _WORDS_PER_BUCKET
+        self.probes += 1
+
+        for word_index in range(bucket_index, bucket_index + _WORDS_PER_BUCKET, _WORDS_PER_ENTRY):
+            data = words[word_index + 1]
+
+            if words[word_index] == key and data >> _BOUND_SHIFT & 3:
+                self.hits += 1
+
+                return _unpack_entry(data)
+
+        return None
+
+    def store(self, key: int, depth: int, score: int, bound: Bound, best_move: Optional[Move] = None) -> None:
+        words = self._words
+        bucket_index = (key & self._bucket_mask) * _WORDS_PER_BUCKET
+        depth = min(max(depth, 0), _MAX_DEPTH)
+        packed_move = NO_MOVE if best_move is None else pack_move(best_move)
+        self.stores += 1
+
+        depth_preferred_data = words[bucket_index + 1]
+        depth_preferred_is_same_position = words[bucket_index] == key
+
+        # keep the best move of an earlier search of this position when
+        # the new one failed low without finding one
+        if packed_move == NO_MOVE and depth_preferred_is_same_position:
+            packed_move = depth_preferred_data & 0xFFFF
+
+        data = (
+            packed_move
+            | depth << _DEPTH_SHIFT
+            | int(bound) << _BOUND_SHIFT
+            | self.generation << _GENERATION_SHIFT
+            | (score + _SCORE_OFFSET) << _SCORE_SHIFT
+        )
+
+        stored_depth = depth_preferred_data >> _DEPTH_SHIFT & 0xFF
+        stored_generation = depth_preferred_data >> _GENERATION_SHIFT & _GENERATION_MASK
+
+        if (
+            depth_preferred_is_same_position
+            or depth >= stored_depth
+            or stored_generation != self.generation
+            or not depth_preferred_data >> _BOUND_SHIFT & 3
+        ):
+            # a deep entry of another position is demoted rather than lost
+            if not depth_preferred_is_same_position and depth_preferred_data >> _BOUND_SHIFT & 3:
+                words[bucket_index + 2] = words[bucket_index]
+                words[bucket_index + 3] = depth_preferred_data
+
+            words[bucket_index] = key
+            words[bucket_index + 1] = data
+        else:
+            words[bucket_index + 2] = key
+            words[bucket_index + 3] = data
+
+    def get_statistics(self) -> TranspositionTableStatistics:
+        entry_count = len(self._words) // _WORDS_PER_ENTRY
+        sample_bucket_count = min(_USAGE_SAMPLE_BUCKETS, self._bucket_mask + 1)
+        sample_words = self._words[:sample_bucket_count * _WORDS_PER_BUCKET]
+        used_entries = 0
+
+        for data in sample_words[1::_WORDS_PER_ENTRY]:
+            if data >> _BOUND_SHIFT & 3 and data >> _GENERATION_SHIFT & _GENERATION_MASK == self.generation:
+                used_entries += 1
+
+        usage = used_entries / (sample_bucket_count * _ENTRIES_PER_BUCKET)
+
+        return TranspositionTableStatistics(self.probes, self.hits, self.stores, entry_count, usage)
+
+    def __len__(self) -> int:
+        return len(self._words) // _WORDS_PER_ENTRY
+
+
+def _unpack_entry(data: int) -> TranspositionTableEntry:
+    packed_move = data & 0xFFFF
+    best_move = None if packed_move == NO_MOVE else unpack_move(packed_move)
+
+    return TranspositionTableEntry(
+        data >> _DEPTH_SHIFT & 0xFF,
+        (data >> _SCORE_SHIFT) - _SCORE_OFFSET,
+        Bound(data >> _BOUND_SHIFT & 3),
+        best_move,
+    )
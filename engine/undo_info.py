@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+from typing import Optional
+from piece import Piece
+from coordinate import Coordinate
+
+
+# what do_move destroys and undo_move needs back; castling rights as the
+# flags of CastlingPermissions.get_flags
+@dataclass
+class UndoInfo:
+    captured_piece: Optional[Piece]
+    castling_flags: int
+    en_passant_target_square: Optional[Coordinate]
+    halfmove_clock: int
+    zobrist_key: int
+    middlegame_score: int
+    endgame_score: int
+    phase: int
@@ -1,4 +1,5 @@
 from parsing.fen_parser import FenParser
+from parsing.pgn import PgnParser
 import pathlib
 from game_state.game_state import GameState
 
@@ -13,7 +14,7 @@ def write_to_file(filepath: str, string: str):
         f.write(string)
 
 
-_parser_mapping = {".fen": FenParser()}
+_parser_mapping = {".fen": FenParser(), ".pgn": PgnParser()}
 
 
 def _get_file_extension(filepath):
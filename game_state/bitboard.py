@@ -0,0 +1,141 @@
+from piece import Piece, PieceType
+from color import Color
+from typing import Dict, Iterator, List, Optional, Tuple
+from coordinate import Coordinate
+from game_state.board import Board, BoardMatrix, create_matrix
+
+# squares are indexed rank-major: a1 = 0, b1 = 1, ..., h8 = 63
+
+PIECES: List[Piece] = [Piece(color, piece_type) for color in Color for piece_type in PieceType]
+PIECE_INDICES: Dict[Piece, int] = {piece: index for index, piece in enumerate(PIECES)}
+
+SQUARE_COORDINATES: List[Coordinate] = [Coordinate(index % 8, index // 8) for index in range(64)]
+
+FULL_BITBOARD = (1 << 64) - 1
+
+
+def get_square_index(coordinate: Coordinate) -> int:
+    return coordinate.rank * 8 + coordinate.file
+
+
+def get_piece_index(piece: Piece) -> int:
+    return PIECE_INDICES[piece]
+
+
+def iter_square_indices(bitboard: int) -> Iterator[int]:
+    while bitboard:
+        least_significant_bit = bitboard & -bitboard
+        yield least_significant_bit.bit_length() - 1
+        bitboard ^= least_significant_bit
+
+
+def get_lowest_square_index(bitboard: int) -> int:
+    return (bitboard & -bitboard).bit_length() - 1
+
+
+def get_highest_square_index(bitboard: int) -> int:
+    return bitboard.bit_length() - 1
+
+
+def popcount(bitboard: int) -> int:
+    return bin(bitboard).count("1")
+
+
+# one 64-bit integer per piece type and color plus occupancy masks; a flat
+# list of pieces mirrors them so that `at` stays a single lookup
+class BitBoard(Board):
+    def __init__(self, matrix: Optional[BoardMatrix] = None):
+        self.piece_bitboards = [0] * len(PIECES)
+        self.white_occupancy = 0
+        self.black_occupancy = 0
+        self.occupancy = 0
+        self.squares: List[Optional[Piece]] = [None] * 64
+
+        if matrix is not None:
+            self.matrix = matrix
+
+    @property
+    def matrix(self) -> BoardMatrix:
+        # a fresh copy; mutating it does not affect the board
+        result = create_matrix(8, 8)
+
+        for index, piece in enumerate(self.squares):
+            result[index // 8][index % 8] = piece
+
+        return result
+
+    @matrix.setter
+    def matrix(self, matrix: BoardMatrix) -> None:
+        self.clear()
+
+        for rank, piece_row in enumerate(matrix):
+            for file, piece in enumerate(piece_row):
+                if piece is not None:
+                    self.set_at_index(rank * 8 + file, piece)
+
+    def clear(self) -> None:
+        self.piece_bitboards = [0] * len(PIECES)
+        self.white_occupancy = 0
+        self.black_occupancy = 0
+        self.occupancy = 0
+        self.squares = [None] * 64
+
+    def at(self, coordinate: Coordinate) -> Optional[Piece]:
+        return self.squares[coordinate.rank * 8 + coordinate.file]
+
+    def at_index(self, square_index: int) -> Optional[Piece]:
+        return self.squares[square_index]
+
+    def set_at(self, coordinate: Coordinate, value: Optional[Piece]) -> None:
+        self.set_at_index(coordinate.rank * 8 + coordinate.file, value)
+
+    def set_at_index(self, square_index: int, value: Optional[Piece]) -> None:
+        square_bit = 1 << square_index
+        previous_piece = self.squares[square_index]
+
+        if previous_piece is not None:
+            self.piece_bitboards[PIECE_INDICES[previous_piece]] ^= square_bit
+
+            if previous_piece.color is Color.WHITE:
+                self.white_occupancy ^= square_bit
+            else:
+                self.black_occupancy ^= square_bit
+
+        if value is not None:
+            self.piece_bitboards[PIECE_INDICES[value]] |= square_bit
+
+            if value.color is Color.WHITE:
+                self.white_occupancy |= square_bit
+            else:
+                self.black_occupancy |= square_bit
+
+        self.squares[square_index] = value
+        self.occupancy = self.white_occupancy | self.black_occupancy
+
+    def square_is_empty(self, coordinate: Coordinate) -> bool:
+        return self.squares[coordinate.rank * 8 + coordinate.file] is None
+
+    def get_piece_bitboard(self, piece: Piece) -> int:
+        return self.piece_bitboards[PIECE_INDICES[piece]]
+
+    def get_color_occupancy(self, color: Color) -> int:
+        if color is Color.WHITE:
+            return self.white_occupancy
+        else:
+            return self.black_occupancy
+
+    def get_empty_squares(self) -> int:
+        return ~self.occupancy & FULL_BITBOARD
+
+    def iter_pieces(self) -> Iterator[Tuple[Coordinate, Piece]]:
+        for square_index in iter_square_indices(self.occupancy):
+            yield SQUARE_COORDINATES[square_index], self.squares[square_index]
+
+    def iter_pieces_of_color(self, color: Color) -> Iterator[Tuple[Coordinate, Piece]]:
+        for square_index in iter_square_indices(self.get_color_occupancy(color)):
+            yield SQUARE_COORDINATES[square_index], self.squares[square_index]
+
+    def get_piece_squares(self, target_piece: Piece) -> List[Coordinate]:
+        bitboard = self.piece_bitboards[PIECE_INDICES[target_piece]]
+
+        return [SQUARE_COORDINATES[square_index] for square_index in iter_square_indices(bitboard)]
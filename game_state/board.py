@@ -1,6 +1,6 @@
 from piece import Piece, PieceType
 from color import Color
-from typing import List, Optional, Set
+from typing import Iterator, List, Optional, Set, Tuple
 from coordinate import Coordinate
 
 _emoji_mapping = {
@@ -62,6 +62,20 @@ class Board:
     def square_is_empty(self, coordinate: Coordinate) -> bool:
         return self.at(coordinate) is None
 
+    def iter_pieces(self) -> Iterator[Tuple[Coordinate, Piece]]:
+        for rank, piece_row in enumerate(self.matrix):
+            for file, piece in enumerate(piece_row):
+                if piece is not None:
+                    yield Coordinate(file, rank), piece
+
+    def iter_pieces_of_color(self, color: Color) -> Iterator[Tuple[Coordinate, Piece]]:
+        for square, piece in self.iter_pieces():
+            if piece.color is color:
+                yield square, piece
+
+    def get_piece_squares(self, target_piece: Piece) -> List[Coordinate]:
+        return [square for square, piece in self.iter_pieces() if piece == target_piece]
+
     def get_nth_rank_for_color(self, n: int, color: Color) -> int:
         if color is Color.WHITE:
             return -1 + n
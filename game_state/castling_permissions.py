@@ -55,6 +55,20 @@ class CastlingPermissions:
             elif side is CastlingSide.QUEENSIDE:
                 self.black_queenside = can_castle
 
+    def get_flags(self) -> int:
+        return (
+            self.white_kingside
+            | self.white_queenside << 1
+            | self.black_kingside << 2
+            | self.black_queenside << 3
+        )
+
+    def set_flags(self, flags: int):
+        self.white_kingside = bool(flags & 1)
+        self.white_queenside = bool(flags & 2)
+        self.black_kingside = bool(flags & 4)
+        self.black_queenside = bool(flags & 8)
+
     def disable_all_castling_for_color(self, color: Color):
         self.set_can_castle_on_side(color, CastlingSide.KINGSIDE, False)
         self.set_can_castle_on_side(color, CastlingSide.QUEENSIDE, False)
@@ -66,6 +80,7 @@ class CastlingPermissions:
     @staticmethod
     def from_string(string: str):
         result = CastlingPermissions()
+        result.disable_all_castling()
 
         if string == "-":
             return result
@@ -1,14 +1,21 @@
 from color import Color
-from game_state.board import Board
+from game_state.bitboard import BitBoard
 from game_state.castling_permissions import CastlingPermissions
+from game_state.zobrist import compute_zobrist_key
+from game_state.piece_square_tables import compute_evaluation_terms
 from typing import Union
 from coordinate import Coordinate
 
 class GameState:
     def __init__(self):
-        self.board = Board()
+        self.board = BitBoard()
         self.color_to_move = Color.WHITE
         self.castling_permissions = CastlingPermissions()
         self.en_passant_target_square: Union[None, Coordinate] = None
         self.halfmove_clock = 0
         self.fullmove_count = 0
+        # kept up to date by do_move; recompute it after editing fields directly
+        self.zobrist_key = compute_zobrist_key(self)
+        # running terms of engine.evaluation.evaluate, from white's point of
+        # view; like the key, recompute them after editing the board directly
+        self.middlegame_score, self.endgame_score, self.phase = compute_evaluation_terms(self.board)
@@ -0,0 +1,56 @@
+import random
+from typing import List, Optional, TYPE_CHECKING
+from color import Color
+from coordinate import Coordinate
+from game_state.bitboard import PIECES
+
+if TYPE_CHECKING:
+    from game_state.game_state import GameState
+
+# a fixed seed keeps keys identical across processes and runs, so hashes
+# can be compared between engine instances
+_random = random.Random(0x5EED)
+
+
+def _get_random_key() -> int:
+    return _random.getrandbits(64)
+
+
+PIECE_SQUARE_KEYS: List[List[int]] = [[_get_random_key() for _ in range(64)] for _ in PIECES]
+BLACK_TO_MOVE_KEY = _get_random_key()
+# indexed by CastlingPermissions.get_flags()
+CASTLING_KEYS: List[int] = [_get_random_key() for _ in range(16)]
+EN_PASSANT_FILE_KEYS: List[int] = [_get_random_key() for _ in range(8)]
+
+
+def get_en_passant_key(en_passant_target_square: Optional[Coordinate]) -> int:
+    if en_passant_target_square is None:
+        return 0
+
+    return EN_PASSANT_FILE_KEYS[en_passant_target_square.file]
+
+
+def get_side_to_move_key(color: Color) -> int:
+    if color is Color.BLACK:
+        return BLACK_TO_MOVE_KEY
+
+    return 0
+
+
+def compute_zobrist_key(game_state: "GameState") -> int:
+    board = game_state.board
+    result = 0
+
+    for piece_index, piece_bitboard in enumerate(board.piece_bitboards):
+        square_keys = PIECE_SQUARE_KEYS[piece_index]
+
+        while piece_bitboard:
+            least_significant_bit = piece_bitboard & -piece_bitboard
+            result ^= square_keys[least_significant_bit.bit_length() - 1]
+            piece_bitboard ^= least_significant_bit
+
+    result ^= get_side_to_move_key(game_state.color_to_move)
+    result ^= CASTLING_KEYS[game_state.castling_permissions.get_flags()]
+    result ^= get_en_passant_key(game_state.en_passant_target_square)
+
+    return result
@@ -0,0 +1,76 @@
+import asyncio
+from typing import Optional
+from move import Move
+from color import Color
+from game_state.game_state import GameState
+from custom_exceptions import ConnectionClosed
+from networking.connection import Address
+from networking.binary_codec import (
+    FRAME_HEADER,
+    FRAME_HEADER_SIZE,
+    frame,
+    encode_move,
+    decode_move,
+    encode_game_state,
+    decode_game_state,
+    encode_color,
+    decode_color
+)
+
+
+# the asyncio counterpart of Connection, speaking the same framed messages
+class AsyncConnection:
+    @staticmethod
+    async def open(host: str, port: int) -> "AsyncConnection":
+        reader, writer = await asyncio.open_connection(host, port)
+
+        return AsyncConnection(reader, writer)
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.partner_address: Optional[Address] = writer.get_extra_info("peername")
+
+    def get_partner_address(self) -> Optional[Address]:
+        return self.partner_address
+
+    def is_closed(self) -> bool:
+        return self.writer.is_closing() or self.reader.at_eof()
+
+    async def receive_move(self) -> Move:
+        return decode_move(await self._receive_bytes())
+
+    async def send_move(self, move: Move) -> None:
+        await self._send_bytes(encode_move(move))
+
+    async def receive_game_state(self) -> GameState:
+        return decode_game_state(await self._receive_bytes())
+
+    async def send_game_state(self, game_state: GameState) -> None:
+        await self._send_bytes(encode_game_state(game_state))
+
+    async def receive_color(self) -> Color:
+        return decode_color(await self._receive_bytes())
+
+    async def send_color(self, color: Color) -> None:
+        await self._send_bytes(encode_color(color))
+
+    async def _send_bytes(self, bytes_to_send: bytes) -> None:
+        self.writer.write(frame(bytes_to_send))
+        await self.writer.drain()
+
+    async def _receive_bytes(self) -> bytes:
+        try:
+            header = await self.reader.readexactly(FRAME_HEADER_SIZE)
+
+            return await self.reader.readexactly(FRAME_HEADER.unpack(header)[0])
+        except asyncio.IncompleteReadError as error:
+            raise ConnectionClosed(f"connection closed by {self.partner_address}") from error
+
+    async def terminate(self) -> None:
+        self.writer.close()
+
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
@@ -0,0 +1,134 @@
+import struct
+from color import Color
+from move import Move
+from game_state.game_state import GameState
+from game_state.bitboard import BitBoard, PIECES, SQUARE_COORDINATES
+from game_state.castling_permissions import CastlingPermissions
+from game_state.zobrist import compute_zobrist_key
+from game_state.piece_square_tables import compute_evaluation_terms
+from engine.move_packing import pack_move, unpack_move
+
+# bumped whenever an encoding below changes, so that peers running
+# different versions fail loudly instead of misreading each other
+PROTOCOL_VERSION = 1
+
+# every message is preceded by its length as a 2 byte big-endian integer
+FRAME_HEADER = struct.Struct(">H")
+FRAME_HEADER_SIZE = FRAME_HEADER.size
+MAX_PAYLOAD_LENGTH = (1 << 16) - 1
+
+# a move is the 16 bit packed move of engine.move_packing
+MOVE = struct.Struct(">H")
+
+# version, 64 squares of 4 bits each (0 for empty, otherwise the index in
+# PIECES plus one), side to move and castling flags, en passant target
+# square index or NO_EN_PASSANT, halfmove clock and fullmove count
+POSITION = struct.Struct(">B32sBBHH")
+NO_EN_PASSANT = 0xFF
+_BLACK_TO_MOVE_FLAG = 1
+_CASTLING_FLAGS_SHIFT = 1
+
+_COLOR_BYTES = {Color.WHITE: b"\x00", Color.BLACK: b"\x01"}
+_COLORS = {color_bytes: color for color, color_bytes in _COLOR_BYTES.items()}
+
+_PIECE_CODES = {piece: index + 1 for index, piece in enumerate(PIECES)}
+
+
+def frame(payload: bytes) -> bytes:
+    if len(payload) > MAX_PAYLOAD_LENGTH:
+        raise ValueError(f"cannot frame payload of {len(payload)} bytes")
+
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def encode_move(move: Move) -> bytes:
+    return MOVE.pack(pack_move(move))
+
+
+def decode_move(move_bytes: bytes) -> Move:
+    if len(move_bytes) != MOVE.size:
+        raise ValueError(f"cannot decode move from {len(move_bytes)} bytes")
+
+    return unpack_move(MOVE.unpack(move_bytes)[0])
+
+
+def encode_color(color: Color) -> bytes:
+    return _COLOR_BYTES[color]
+
+
+def decode_color(color_bytes: bytes) -> Color:
+    if color_bytes not in _COLORS:
+        raise ValueError("cannot decode color")
+
+    return _COLORS[color_bytes]
+
+
+def encode_game_state(game_state: GameState) -> bytes:
+    squares = game_state.board.squares
+    board_bytes = bytearray(32)
+
+    for square_index in range(0, 64, 2):
+        low_piece = squares[square_index]
+        high_piece = squares[square_index + 1]
+        low_code = 0 if low_piece is None else _PIECE_CODES[low_piece]
+        high_code = 0 if high_piece is None else _PIECE_CODES[high_piece]
+
+        board_bytes[square_index // 2] = low_code | high_code << 4
+
+    flags = game_state.castling_permissions.get_flags() << _CASTLING_FLAGS_SHIFT
+
+    if game_state.color_to_move is Color.BLACK:
+        flags |= _BLACK_TO_MOVE_FLAG
+
+    en_passant_target_square = game_state.en_passant_target_square
+
+    if en_passant_target_square is None:
+        en_passant_byte = NO_EN_PASSANT
+    else:
+        en_passant_byte = en_passant_target_square.rank * 8 + en_passant_target_square.file
+
+    return POSITION.pack(
+        PROTOCOL_VERSION,
+        bytes(board_bytes),
+        flags,
+        en_passant_byte,
+        game_state.halfmove_clock,
+        game_state.fullmove_count,
+    )
+
+
+def decode_game_state(game_state_bytes: bytes) -> GameState:
+    if len(game_state_bytes) != POSITION.size:
+        raise ValueError(f"cannot decode position from {len(game_state_bytes)} bytes")
+
+    version, board_bytes, flags, en_passant_byte, halfmove_clock, fullmove_count = POSITION.unpack(game_state_bytes)
+
+    if version != PROTOCOL_VERSION:
+        raise ValueError(f"cannot decode position of protocol version {version}, expected {PROTOCOL_VERSION}")
+
+    board = BitBoard()
+
+    for byte_index, square_codes in enumerate(board_bytes):
+        for square_index, piece_code in [(byte_index * 2, square_codes & 15), (byte_index * 2 + 1, square_codes >> 4)]:
+            if piece_code > len(PIECES):
+                raise ValueError(f"cannot decode position: invalid piece code {piece_code}")
+
+            if piece_code:
+                board.set_at_index(square_index, PIECES[piece_code - 1])
+
+    if en_passant_byte != NO_EN_PASSANT and en_passant_byte >= 64:
+        raise ValueError(f"cannot decode position: invalid en passant square {en_passant_byte}")
+
+    result = GameState()
+    result.board = board
+    result.color_to_move = Color.BLACK if flags & _BLACK_TO_MOVE_FLAG else Color.WHITE
+    result.castling_permissions = CastlingPermissions()
+    result.castling_permissions.set_flags(flags >> _CASTLING_FLAGS_SHIFT & 15)
+    result.en_passant_target_square = None if en_passant_byte == NO_EN_PASSANT else SQUARE_COORDINATES[en_passant_byte]
+    result.halfmove_clock = halfmove_clock
+    result.fullmove_count = fullmove_count
+
+    result.zobrist_key = compute_zobrist_key(result)
+    result.middlegame_score, result.endgame_score, result.phase = compute_evaluation_terms(result.board)
+
+    return result
@@ -1,23 +1,33 @@
 import socket
 from move import Move
-from typing import Tuple
+from typing import Optional, Tuple
+from custom_exceptions import ConnectionClosed
 from game_state.game_state import GameState
 from color import Color
-from networking.serialization import (
-    serialize_move,
-    deserialize_move,
-    serialize_game_state,
-    deserialize_game_state,
-    serialize_color,
-    deserialize_color
+from networking.binary_codec import (
+    FRAME_HEADER,
+    FRAME_HEADER_SIZE,
+    MAX_PAYLOAD_LENGTH,
+    frame,
+    encode_move,
+    decode_move,
+    encode_game_state,
+    decode_game_state,
+    encode_color,
+    decode_color
 )
 
 Address = Tuple[str, int]
-PAYLOAD_SPECIFIER_LENGTH = 32
 
+# big enough for the largest frame, so a whole frame always fits
+RECEIVE_BUFFER_SIZE = FRAME_HEADER_SIZE + MAX_PAYLOAD_LENGTH
+
+
+# reads go through a buffer, so a timed out receive keeps what it read and
+# can be retried; the timeout applies to every send and receive
 class Connection:
     @staticmethod
-    def host_connection_on_port(port: int, debug=False) -> "Connection":
+    def host_connection_on_port(port: int, debug=False, timeout: Optional[float] = None) -> "Connection":
         host_socket = socket.socket()
         ip = "" if debug else socket.gethostname()
 
@@ -25,74 +35,109 @@ class Connection:
         host_socket.listen(1)
 
         partner_socket, partner_address = host_socket.accept()
+        host_socket.close()
 
-        return Connection(partner_socket, partner_address)
+        return Connection(partner_socket, partner_address, timeout)
 
     @staticmethod
-    def join_connection_at_address(addr: Address) -> "Connection":
+    def join_connection_at_address(addr: Address, timeout: Optional[float] = None) -> "Connection":
         client_socket = socket.socket()
+        client_socket.settimeout(timeout)
         client_socket.connect(addr)
 
-        return Connection(client_socket, addr)
+        return Connection(client_socket, addr, timeout)
 
     def get_partner_address(self) -> Address:
         return self.partner_address
 
-    def __init__(self, _socket: socket.socket, partner_address: Address):
+    def __init__(self, _socket: socket.socket, partner_address: Address, timeout: Optional[float] = None):
         self.socket = _socket
         self.partner_address = partner_address
+        self.set_timeout(timeout)
+
+        # bytes received but not yet taken are those from _buffer_start to _buffer_end
+        self._buffer = bytearray(RECEIVE_BUFFER_SIZE)
+        self._buffer_view = memoryview(self._buffer)
+        self._buffer_start = 0
+        self._buffer_end = 0
+
+    def set_timeout(self, timeout: Optional[float]) -> None:
+        self.socket.settimeout(timeout)
+
+    def get_timeout(self) -> Optional[float]:
+        return self.socket.gettimeout()
 
     def receive_move(self) -> Move:
         move_bytes = self._receive_bytes()
-        deserialized_move = deserialize_move(move_bytes)
+        deserialized_move = decode_move(move_bytes)
 
         return deserialized_move
 
     def send_move(self, move: Move) -> None:
-        serialized_move = serialize_move(move)
+        serialized_move = encode_move(move)
 
         self._send_bytes(serialized_move)
 
     def send_game_state(self, game_state: GameState) -> None:
-        serialized_game_state = serialize_game_state(game_state)
+        serialized_game_state = encode_game_state(game_state)
 
         self._send_bytes(serialized_game_state)
 
     def receive_game_state(self) -> GameState:
         game_state_bytes = self._receive_bytes()
-        deserialized_game_state = deserialize_game_state(game_state_bytes)
+        deserialized_game_state = decode_game_state(game_state_bytes)
 
         return deserialized_game_state
     
     def send_color(self, color: Color) -> None:
-        serialized_color = serialize_color(color)
+        serialized_color = encode_color(color)
         
         self._send_bytes(serialized_color)
 
     def receive_color(self) -> Color:
         color_bytes = self._receive_bytes()
-        color = deserialize_color(color_bytes)
+        color = decode_color(color_bytes)
 
         return color
 
     def _send_bytes(self, bytes_to_send: bytes) -> None:
-        payload_length = len(bytes_to_send)
+        self.socket.sendall(frame(bytes_to_send))
+
+    def _receive_bytes(self) -> bytes:
+        self._fill_buffer(FRAME_HEADER_SIZE)
+        payload_length = FRAME_HEADER.unpack_from(self._buffer, self._buffer_start)[0]
 
-        self._send_payload_length(payload_length)
-        self.socket.send(bytes_to_send)
+        self._fill_buffer(FRAME_HEADER_SIZE + payload_length)
+        payload_start = self._buffer_start + FRAME_HEADER_SIZE
+        payload = bytes(self._buffer_view[payload_start:payload_start + payload_length])
 
-    def _send_payload_length(self, payload_length: int) -> None:
-        self.socket.send(payload_length.to_bytes(PAYLOAD_SPECIFIER_LENGTH, "big", signed=False))
+        self._buffer_start = payload_start + payload_length
 
-    def _receive_bytes(self) -> bytes:
-        payload_length = self._receive_payload_length()
+        if self._buffer_start == self._buffer_end:
+            self._buffer_start = self._buffer_end = 0
+
+        return payload
+
+    def _fill_buffer(self, size: int) -> None:
+        # reads whatever the socket has ready, so following frames may
+        # already be buffered
+        while self._buffer_end - self._buffer_start < size:
+            if self._buffer_start + size > RECEIVE_BUFFER_SIZE:
+                self._compact_buffer()
+
+            bytes_received = self.socket.recv_into(self._buffer_view[self._buffer_end:])
+
+            if bytes_received == 0:
+                raise ConnectionClosed(f"connection closed by {self.partner_address}")
 
-        return self.socket.recv(payload_length)
+            self._buffer_end += bytes_received
 
-    def _receive_payload_length(self) -> int:
-        bytes_received = self.socket.recv(PAYLOAD_SPECIFIER_LENGTH)
+    def _compact_buffer(self) -> None:
+        buffered_length = self._buffer_end - self._buffer_start
 
-        return int.from_bytes(bytes_received, "big", signed=False)
+        self._buffer_view[:buffered_length] = self._buffer_view[self._buffer_start:self._buffer_end]
+        self._buffer_start = 0
+        self._buffer_end = buffered_length
 
     def terminate(self):
         self.socket.shutdown(socket.SHUT_RDWR)
@@ -0,0 +1,94 @@
+import math
+from dataclasses import dataclass
+from typing import List
+
+# bucket upper bounds grow geometrically from MIN_LATENCY, so every
+# recorded latency is known to within a fixed ratio whatever its size
+MIN_LATENCY = 1e-6
+BUCKETS_PER_DOUBLING = 4
+BUCKET_COUNT = 30 * BUCKETS_PER_DOUBLING
+
+
+@dataclass
+class LatencyStatistics:
+    count: int
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+
+# latencies in seconds, counted in geometric buckets; a percentile is the
+# upper bound of its bucket, at most 2 ** (1 / BUCKETS_PER_DOUBLING) high
+class LatencyHistogram:
+    def __init__(self):
+        self.counts: List[int] = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, latency: float) -> None:
+        self.counts[_get_bucket_index(latency)] += 1
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def get_percentile(self, percentile: float) -> float:
+        if not 0 <= percentile <= 100:
+            raise ValueError("percentile must be between 0 and 100")
+
+        if self.count == 0:
+            return 0.0
+
+        rank = max(1, math.ceil(self.count * percentile / 100))
+        cumulative_count = 0
+
+        for index, count in enumerate(self.counts):
+            cumulative_count += count
+
+            if cumulative_count >= rank:
+                # the last bucket is open ended
+                if index == BUCKET_COUNT - 1:
+                    return self.max
+
+                return min(_get_bucket_upper_bound(index), self.max)
+
+        return self.max
+
+    def get_statistics(self) -> LatencyStatistics:
+        return LatencyStatistics(
+            self.count,
+            self.total / self.count if self.count else 0.0,
+            self.get_percentile(50),
+            self.get_percentile(90),
+            self.get_percentile(99),
+            self.max,
+        )
+
+    def clear(self) -> None:
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+def _get_bucket_index(latency: float) -> int:
+    if latency <= MIN_LATENCY:
+        return 0
+
+    index = math.ceil(math.log2(latency / MIN_LATENCY) * BUCKETS_PER_DOUBLING)
+
+    return min(index, BUCKET_COUNT - 1)
+
+
+def _get_bucket_upper_bound(index: int) -> float:
+    return MIN_LATENCY * 2 ** (index / BUCKETS_PER_DOUBLING)
@@ -0,0 +1,404 @@
+import argparse
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from multiprocessing.connection import Connection as Pipe
+from multiprocessing.process import BaseProcess
+from multiprocessing.synchronize import Event
+from typing import List, Optional, Set, Tuple
+from color import Color
+from custom_exceptions import ConnectionClosed
+from engine.engine import generate_moves, verify_move, do_move
+from engine.move_packing import pack_move
+from move import Move
+from networking.async_connection import AsyncConnection
+from networking.connection import Connection
+from networking.latency_histogram import LatencyHistogram, LatencyStatistics
+from networking.server import GameServer
+from process_context import get_process_context
+
+LOCALHOST = "127.0.0.1"
+# seconds a started server process is given to stop before it is killed
+SERVER_PROCESS_STOP_TIMEOUT = 10.0
+
+
+class ClientConnectionKind(Enum):
+    # every client on one event loop
+    ASYNC = "async"
+    # the blocking Connection the game client uses, a thread per client
+    BLOCKING = "blocking"
+
+
+@dataclass
+class LoadTestOptions:
+    clients: int = 100
+    games_per_client: int = 1
+    # plies after which both players of a game leave it
+    max_plies: int = 40
+    # seconds a client waits before each of its moves
+    think_time: float = 0.0
+    # seconds to wait for a partner or a move before giving up on a game
+    timeout: float = 30.0
+    seed: int = 0
+    connection_kind: ClientConnectionKind = ClientConnectionKind.ASYNC
+
+
+@dataclass
+class LoadTestReport:
+    clients: int
+    seconds: float
+    games: int = 0
+    moves: int = 0
+    # games given up on: connections refused or closed, timeouts
+    errors: int = 0
+    # moves received that were illegal in the client's own copy of the game
+    desyncs: int = 0
+    # from a player sending a move to its opponent receiving it
+    relay_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def merge(self, other: "LoadTestReport") -> None:
+        self.games += other.games
+        self.moves += other.moves
+        self.errors += other.errors
+        self.desyncs += other.desyncs
+        self.relay_latency.merge(other.relay_latency)
+
+    @property
+    def moves_per_second(self) -> float:
+        return self.moves / self.seconds if self.seconds > 0 else 0.0
+
+    def format(self) -> str:
+        latency: LatencyStatistics = self.relay_latency.get_statistics()
+
+        return "\n".join([
+            f"clients     {self.clients}",
+            f"games       {self.games}",
+            f"moves       {self.moves} in {self.seconds:.2f}s, {self.moves_per_second:.0f}/s",
+            f"relay       p50 {latency.p50 * 1000:.2f}ms  p90 {latency.p90 * 1000:.2f}ms  "
+            f"p99 {latency.p99 * 1000:.2f}ms  max {latency.max * 1000:.2f}ms",
+            f"errors      {self.errors}",
+            f"desyncs     {self.desyncs}",
+        ])
+
+
+@dataclass
+class _SimulatedGame:
+    # when the move in flight was sent; both players run in this process,
+    # so the one receiving it can time the relay on the same clock
+    move_sent_time: float = 0.0
+
+
+def _choose_move(moves: Set[Move], random_generator: random.Random) -> Move:
+    # sorted so that a seed always plays the same games
+    return random_generator.choice(sorted(moves, key=pack_move))
+
+
+def _make_random_generators(index: int, options: LoadTestOptions) -> List[random.Random]:
+    return [random.Random(f"{options.seed}-{index * 2 + side}") for side in range(2)]
+
+
+async def _play_side(connection: AsyncConnection, game: _SimulatedGame, options: LoadTestOptions, random_generator: random.Random, report: LoadTestReport) -> None:
+    try:
+        color = await asyncio.wait_for(connection.receive_color(), options.timeout)
+        game_state = await asyncio.wait_for(connection.receive_game_state(), options.timeout)
+        ply = 0
+
+        while ply < options.max_plies:
+            moves = generate_moves(game_state)
+
+            if not moves:
+                break
+
+            if game_state.color_to_move is color:
+                if options.think_time > 0:
+                    await asyncio.sleep(options.think_time)
+
+                move = _choose_move(moves, random_generator)
+                game.move_sent_time = time.perf_counter()
+
+                await connection.send_move(move)
+                report.moves += 1
+            else:
+                move = await asyncio.wait_for(connection.receive_move(), options.timeout)
+                report.relay_latency.record(time.perf_counter() - game.move_sent_time)
+
+                if not verify_move(game_state, move):
+                    report.desyncs += 1
+
+                    return
+
+            do_move(game_state, move)
+            ply += 1
+
+        # both players get here, so only one of them counts the game
+        if color is Color.WHITE:
+            report.games += 1
+    except ValueError:
+        # a message that could not be decoded
+        report.desyncs += 1
+    except (OSError, ConnectionClosed, asyncio.TimeoutError):
+        report.errors += 1
+    finally:
+        await connection.terminate()
+
+
+async def _join_game(host: str, port: int, options: LoadTestOptions, join_lock: asyncio.Lock) -> Tuple[AsyncConnection, AsyncConnection]:
+    # the server pairs clients in the order it accepts them, so connecting
+    # both players of a game together puts them in the same game
+    async with join_lock:
+        first_connection = await asyncio.wait_for(AsyncConnection.open(host, port), options.timeout)
+
+        try:
+            second_connection = await asyncio.wait_for(AsyncConnection.open(host, port), options.timeout)
+        except BaseException:
+            await first_connection.terminate()
+            raise
+
+    return first_connection, second_connection
+
+
+async def _run_client_pair(index: int, host: str, port: int, options: LoadTestOptions, join_lock: asyncio.Lock, report: LoadTestReport) -> None:
+    random_generators = _make_random_generators(index, options)
+
+    for _ in range(options.games_per_client):
+        try:
+            connections = await _join_game(host, port, options, join_lock)
+        except (OSError, asyncio.TimeoutError):
+            report.errors += 2
+
+            continue
+
+        game = _SimulatedGame()
+
+        await asyncio.gather(*[
+            _play_side(connection, game, options, random_generator, report)
+            for connection, random_generator in zip(connections, random_generators)
+        ])
+
+
+# the blocking counterparts of the above, for ClientConnectionKind.BLOCKING;
+# a timeout is raised as socket.timeout, which is an OSError
+def _play_side_blocking(connection: Connection, game: _SimulatedGame, options: LoadTestOptions, random_generator: random.Random, report: LoadTestReport) -> None:
+    try:
+        color = connection.receive_color()
+        game_state = connection.receive_game_state()
+        ply = 0
+
+        while ply < options.max_plies:
+            moves = generate_moves(game_state)
+
+            if not moves:
+                break
+
+            if game_state.color_to_move is color:
+                if options.think_time > 0:
+                    time.sleep(options.think_time)
+
+                move = _choose_move(moves, random_generator)
+                game.move_sent_time = time.perf_counter()
+
+                connection.send_move(move)
+                report.moves += 1
+            else:
+                move = connection.receive_move()
+                report.relay_latency.record(time.perf_counter() - game.move_sent_time)
+
+                if not verify_move(game_state, move):
+                    report.desyncs += 1
+
+                    return
+
+            do_move(game_state, move)
+            ply += 1
+
+        if color is Color.WHITE:
+            report.games += 1
+    except ValueError:
+        report.desyncs += 1
+    except (OSError, ConnectionClosed):
+        report.errors += 1
+    finally:
+        _terminate_blocking(connection)
+
+
+def _terminate_blocking(connection: Connection) -> None:
+    try:
+        connection.terminate()
+    except OSError:
+        # the server closed it first
+        connection.socket.close()
+
+
+def _join_game_blocking(host: str, port: int, options: LoadTestOptions, join_lock: threading.Lock) -> Tuple[Connection, Connection]:
+    with join_lock:
+        first_connection = Connection.join_connection_at_address((host, port), options.timeout)
+
+        try:
+            second_connection = Connection.join_connection_at_address((host, port), options.timeout)
+        except BaseException:
+            _terminate_blocking(first_connection)
+            raise
+
+    return first_connection, second_connection
+
+
+def _run_client_pair_blocking(index: int, host: str, port: int, options: LoadTestOptions, join_lock: threading.Lock, report: LoadTestReport) -> None:
+    random_generators = _make_random_generators(index, options)
+
+    for _ in range(options.games_per_client):
+        try:
+            first_connection, second_connection = _join_game_blocking(host, port, options, join_lock)
+        except OSError:
+            report.errors += 2
+
+            continue
+
+        game = _SimulatedGame()
+        # the second player gets a thread, and a report merged once it is done
+        second_report = LoadTestReport(report.clients, 0.0)
+        second_thread = threading.Thread(target=_play_side_blocking, args=(second_connection, game, options, random_generators[1], second_report))
+        second_thread.start()
+
+        _play_side_blocking(first_connection, game, options, random_generators[0], report)
+        second_thread.join()
+        report.merge(second_report)
+
+
+def _run_clients_blocking(host: str, port: int, options: LoadTestOptions) -> LoadTestReport:
+    join_lock = threading.Lock()
+    pair_reports = [LoadTestReport(options.clients, 0.0) for _ in range(options.clients // 2)]
+    threads = [
+        threading.Thread(target=_run_client_pair_blocking, args=(index, host, port, options, join_lock, pair_report))
+        for index, pair_report in enumerate(pair_reports)
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    report = LoadTestReport(options.clients, 0.0)
+
+    for pair_report in pair_reports:
+        report.merge(pair_report)
+
+    return report
+
+
+def _serve_in_process(port_sender: Pipe, stop_event: Event) -> None:
+    asyncio.run(_serve_until_stopped(port_sender, stop_event))
+
+
+async def _serve_until_stopped(port_sender: Pipe, stop_event: Event) -> None:
+    server = GameServer()
+    await server.start(LOCALHOST, 0)
+    port_sender.send(server.get_port())
+
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, stop_event.wait)
+    finally:
+        await server.close()
+
+
+def _start_server_process() -> Tuple[BaseProcess, Event, int]:
+    context = get_process_context()
+    port_receiver, port_sender = context.Pipe(duplex=False)
+    stop_event = context.Event()
+    # not a daemon, as the server starts move validation processes of its own
+    server_process = context.Process(target=_serve_in_process, args=(port_sender, stop_event))
+    server_process.start()
+    port_sender.close()
+
+    try:
+        # raises EOFError if the server exits without starting
+        port = port_receiver.recv()
+    except BaseException:
+        _stop_server_process(server_process, stop_event)
+        raise
+    finally:
+        port_receiver.close()
+
+    return server_process, stop_event, port
+
+
+def _stop_server_process(server_process: BaseProcess, stop_event: Event) -> None:
+    stop_event.set()
+    server_process.join(SERVER_PROCESS_STOP_TIMEOUT)
+
+    if server_process.is_alive():
+        server_process.terminate()
+        server_process.join()
+
+
+# plays options.clients simulated clients making random legal moves against
+# the server at host and port, and reports throughput, latency and failures
+async def run_load_test(options: LoadTestOptions, port: Optional[int] = None, host: str = LOCALHOST) -> LoadTestReport:
+    if options.clients < 2 or options.clients % 2 != 0:
+        raise ValueError("clients must be a positive even number")
+
+    loop = asyncio.get_running_loop()
+    server_process = None
+
+    # without a port a server is started in a process of its own, so that
+    # the clients' move generation does not hold up its event loop
+    if port is None:
+        server_process, stop_event, port = await loop.run_in_executor(None, _start_server_process)
+        host = LOCALHOST
+
+    report = LoadTestReport(options.clients, 0.0)
+    start_time = time.perf_counter()
+
+    try:
+        if options.connection_kind is ClientConnectionKind.BLOCKING:
+            report.merge(await loop.run_in_executor(None, _run_clients_blocking, host, port, options))
+        else:
+            join_lock = asyncio.Lock()
+
+            await asyncio.gather(*[_run_client_pair(index, host, port, options, join_lock, report) for index in range(options.clients // 2)])
+    finally:
+        report.seconds = time.perf_counter() - start_time
+
+        if server_process is not None:
+            await loop.run_in_executor(None, _stop_server_process, server_process, stop_event)
+
+    return report
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Play simulated clients against a game server and report how it holds up")
+    argument_parser.add_argument("-n", "--clients", type=int, default=LoadTestOptions.clients)
+    argument_parser.add_argument("--games", type=int, default=LoadTestOptions.games_per_client, help="games each client plays in turn")
+    argument_parser.add_argument("--plies", type=int, default=LoadTestOptions.max_plies, help="plies after which a game is left")
+    argument_parser.add_argument("--think-time", type=float, default=LoadTestOptions.think_time, help="seconds to wait before each move")
+    argument_parser.add_argument("--timeout", type=float, default=LoadTestOptions.timeout)
+    argument_parser.add_argument("--seed", type=int, default=LoadTestOptions.seed)
+    argument_parser.add_argument("--host", default=LOCALHOST)
+    argument_parser.add_argument("--port", type=int, help="port of a running server, one is started in another process by default")
+    argument_parser.add_argument(
+        "--connection",
+        choices=[kind.value for kind in ClientConnectionKind],
+        default=LoadTestOptions.connection_kind.value,
+        help="async clients on one event loop, or the game client's blocking Connection on a thread each"
+    )
+    arguments = argument_parser.parse_args()
+
+    options = LoadTestOptions(
+        arguments.clients,
+        arguments.games,
+        arguments.plies,
+        arguments.think_time,
+        arguments.timeout,
+        arguments.seed,
+        ClientConnectionKind(arguments.connection)
+    )
+    report = asyncio.run(run_load_test(options, arguments.port, arguments.host))
+
+    print(report.format())
+
+
+if __name__ == "__main__":
+    main()
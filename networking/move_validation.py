@@ -0,0 +1,101 @@
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+from move import Move
+from game_state.game_state import GameState
+from engine.engine import verify_move, do_move, is_in_checkmate
+from engine.move_packing import pack_move, unpack_move
+from networking.binary_codec import encode_game_state, decode_game_state
+from networking.latency_histogram import LatencyHistogram
+from process_context import get_process_context
+
+# validations submitted and not yet finished per worker; once reached,
+# callers wait for a free slot instead of queueing without bound
+DEFAULT_PENDING_VALIDATIONS_PER_WORKER = 16
+# validation is pure Python, so threads hold the GIL against the event loop
+# and each other; more than one adds contention, not parallelism
+DEFAULT_THREAD_WORKERS = 1
+
+
+class ValidationPoolKind(Enum):
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+@dataclass
+class MoveValidation:
+    legal: bool
+    # whether the side to move after the move has no legal moves
+    game_over: bool = False
+
+
+def _validate_move(game_state_bytes: bytes, packed_move: int) -> MoveValidation:
+    game_state = decode_game_state(game_state_bytes)
+    move = unpack_move(packed_move)
+
+    if not verify_move(game_state, move):
+        return MoveValidation(False)
+
+    do_move(game_state, move)
+
+    return MoveValidation(True, is_in_checkmate(game_state))
+
+
+def _is_game_over(game_state_bytes: bytes) -> bool:
+    return is_in_checkmate(decode_game_state(game_state_bytes))
+
+
+# checks moves off the event loop, on a process per core by default, as
+# threads hold the GIL against it; at most max_pending wait or run at once
+class MoveValidator:
+    def __init__(self, kind: ValidationPoolKind = ValidationPoolKind.PROCESS, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        if workers is None and kind is ValidationPoolKind.PROCESS:
+            workers = os.cpu_count() or 1
+        elif workers is None:
+            workers = DEFAULT_THREAD_WORKERS
+
+        if max_pending is None:
+            max_pending = workers * DEFAULT_PENDING_VALIDATIONS_PER_WORKER
+
+        if workers < 1 or max_pending < 1:
+            raise ValueError("workers and max_pending must be positive")
+
+        self.kind = kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self.latency_histogram = LatencyHistogram()
+        # made on first use, as before Python 3.10 a semaphore belongs to the
+        # event loop current when it is made, which need not be the running one
+        self._pending_slots: Optional[asyncio.Semaphore] = None
+        self._executor: Executor
+
+        if kind is ValidationPoolKind.PROCESS:
+            self._executor = ProcessPoolExecutor(workers, mp_context=get_process_context())
+        else:
+            self._executor = ThreadPoolExecutor(workers, thread_name_prefix="move-validation")
+
+    async def validate_move(self, game_state: GameState, move: Move) -> MoveValidation:
+        return await self._run(_validate_move, encode_game_state(game_state), pack_move(move))
+
+    async def is_game_over(self, game_state: GameState) -> bool:
+        return await self._run(_is_game_over, encode_game_state(game_state))
+
+    async def _run(self, function, *arguments):
+        start_time = time.perf_counter()
+
+        if self._pending_slots is None:
+            self._pending_slots = asyncio.Semaphore(self.max_pending)
+
+        async with self._pending_slots:
+            result = await asyncio.get_running_loop().run_in_executor(self._executor, function, *arguments)
+
+        self.latency_histogram.record(time.perf_counter() - start_time)
+
+        return result
+
+    def shutdown(self) -> None:
+        self._executor.shutdown()
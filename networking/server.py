@@ -0,0 +1,180 @@
+import argparse
+import asyncio
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Set, Tuple
+from color import Color
+from game_state.game_state import GameState
+from engine.engine import do_move
+from files import load_default_game
+from networking.async_connection import AsyncConnection
+from networking.move_validation import MoveValidator, ValidationPoolKind
+
+DEFAULT_PORT = 5555
+# connections waiting to be accepted; many clients may arrive at once
+LISTEN_BACKLOG = 1024
+
+
+@dataclass(eq=False)
+class ServerGame:
+    game_state: GameState
+    players: Dict[Color, AsyncConnection]
+
+
+# pairs clients into games in the order they connect, the first playing white,
+# checks each move on move_validator and relays it; a game ends on checkmate
+# or stalemate, a disconnect, an illegal move or a move_timeout
+class GameServer:
+    def __init__(
+        self,
+        create_game_state: Callable[[], GameState] = load_default_game,
+        move_timeout: Optional[float] = None,
+        move_validator: Optional[MoveValidator] = None
+    ):
+        self._create_game_state = create_game_state
+        self.move_timeout = move_timeout
+        self._owns_move_validator = move_validator is None
+        self.move_validator = MoveValidator() if move_validator is None else move_validator
+        self.games: Set[ServerGame] = set()
+        self.finished_game_count = 0
+        self._waiting_connection: Optional[AsyncConnection] = None
+        self._game_tasks: Set[asyncio.Task] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: Optional[str] = None, port: int = DEFAULT_PORT) -> None:
+        self._server = await asyncio.start_server(self._handle_client, host, port, backlog=LISTEN_BACKLOG)
+
+    def get_port(self) -> int:
+        if self._server is None:
+            raise ValueError("server not started")
+
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            raise ValueError("server not started")
+
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+
+        if self._waiting_connection is not None:
+            await self._waiting_connection.terminate()
+            self._waiting_connection = None
+
+        # ends the games, whose reads now fail
+        for game in list(self.games):
+            for connection in game.players.values():
+                await connection.terminate()
+
+        await asyncio.gather(*self._game_tasks, return_exceptions=True)
+
+        if self._server is not None:
+            await self._server.wait_closed()
+
+        if self._owns_move_validator:
+            self.move_validator.shutdown()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = AsyncConnection(reader, writer)
+        waiting_connection = self._waiting_connection
+
+        if waiting_connection is None or waiting_connection.is_closed():
+            self._waiting_connection = connection
+
+            return
+
+        self._waiting_connection = None
+        game_task = asyncio.current_task()
+        self._game_tasks.add(game_task)
+
+        try:
+            await self._play_game(ServerGame(
+                self._create_game_state(),
+                {Color.WHITE: waiting_connection, Color.BLACK: connection}
+            ))
+        finally:
+            self._game_tasks.discard(game_task)
+
+    async def _play_game(self, game: ServerGame) -> None:
+        self.games.add(game)
+
+        try:
+            for color, connection in game.players.items():
+                await connection.send_color(color)
+                await connection.send_game_state(game.game_state)
+
+            game_over = await self.move_validator.is_game_over(game.game_state)
+
+            while not game_over:
+                game_over = await self._play_move(game)
+        except (ConnectionError, ValueError, asyncio.TimeoutError):
+            # the game is abandoned; both players are disconnected below
+            pass
+        finally:
+            self.games.discard(game)
+            self.finished_game_count += 1
+
+            for connection in game.players.values():
+                await connection.terminate()
+
+    # returns whether the move ended the game
+    async def _play_move(self, game: ServerGame) -> bool:
+        color_to_move = game.game_state.color_to_move
+        move = await asyncio.wait_for(game.players[color_to_move].receive_move(), self.move_timeout)
+        validation = await self.move_validator.validate_move(game.game_state, move)
+
+        if not validation.legal:
+            raise ValueError("illegal move")
+
+        do_move(game.game_state, move)
+        await game.players[color_to_move.opposite()].send_move(move)
+
+        return validation.game_over
+
+
+async def _serve(host: Optional[str], port: int, move_timeout: Optional[float], move_validator_options: Tuple[ValidationPoolKind, Optional[int], Optional[int]]) -> None:
+    move_validator = MoveValidator(*move_validator_options)
+    server = GameServer(move_timeout=move_timeout, move_validator=move_validator)
+    await server.start(host, port)
+
+    print(f"Listening on port {server.get_port()}")
+
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+        move_validator.shutdown()
+
+        statistics = move_validator.latency_histogram.get_statistics()
+        print(
+            f"Validated {statistics.count} moves, latency p50 {statistics.p50 * 1000:.2f}ms "
+            f"p99 {statistics.p99 * 1000:.2f}ms max {statistics.max * 1000:.2f}ms"
+        )
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Host games between clients that join this server")
+    argument_parser.add_argument("--host", help="address to listen on, all interfaces by default")
+    argument_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    argument_parser.add_argument("--move-timeout", type=float, help="seconds a player may take to move before the game is ended")
+    argument_parser.add_argument("--validation-pool", choices=[kind.value for kind in ValidationPoolKind], default=ValidationPoolKind.PROCESS.value)
+    argument_parser.add_argument("--validation-workers", type=int, help="move validation workers, one process per core or a single thread by default")
+    argument_parser.add_argument("--max-pending-validations", type=int, help="validations queued before clients are made to wait")
+    arguments = argument_parser.parse_args()
+
+    move_validator_options = (
+        ValidationPoolKind(arguments.validation_pool),
+        arguments.validation_workers,
+        arguments.max_pending_validations
+    )
+
+    try:
+        asyncio.run(_serve(arguments.host, arguments.port, arguments.move_timeout, move_validator_options))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,12 @@
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 from piece import Piece, PieceType
 from color import Color
-from move import CastlingMove
+from move import Move, CastlingMove, EnPassantMove, PromotionMove
 from castling_side import CastlingSide
 
+if TYPE_CHECKING:
+    from game_state.game_state import GameState
+
 
 def get_character_by_piece(piece: Piece) -> str:
     result = ""
@@ -112,3 +116,227 @@ def get_castling_move_by_character(char: str):
 
     return CastlingMove(side, color)
 
+
+_SAN_PIECE_LETTERS = {
+    PieceType.KING: "K",
+    PieceType.QUEEN: "Q",
+    PieceType.ROOK: "R",
+    PieceType.BISHOP: "B",
+    PieceType.KNIGHT: "N",
+}
+
+_SAN_PIECE_TYPES = {letter: piece_type for piece_type, letter in _SAN_PIECE_LETTERS.items()}
+
+_CASTLING_SAN = {
+    CastlingSide.KINGSIDE: "O-O",
+    CastlingSide.QUEENSIDE: "O-O-O",
+}
+
+
+# the move functions import the engine when called, as the engine and the
+# game state import this module while loading
+
+_MoveIndex = Dict[Tuple[int, PieceType], List[Move]]
+
+# zobrist key and index of the last position looked up; reading or writing a
+# game asks about the same position several times in a row
+_last_move_index: Tuple[Optional[int], _MoveIndex] = (None, {})
+
+
+def _get_square_index(string: str) -> int:
+    if len(string) != 2:
+        raise ValueError(string)
+
+    return get_rank_by_char(string[1]) * 8 + get_file_by_char(string[0])
+
+
+# legal moves by target square index and moving piece type, so that finding
+# a written move is a lookup; castling is listed as a king move
+def _get_move_index(game_state: "GameState") -> _MoveIndex:
+    global _last_move_index
+
+    key, move_index = _last_move_index
+
+    if key == game_state.zobrist_key:
+        return move_index
+
+    from engine.engine import get_cached_moves, get_move_source_square, get_move_target_square
+
+    board = game_state.board
+    move_index = {}
+
+    for move in get_cached_moves(game_state):
+        source_square = get_move_source_square(move)
+        target_square = get_move_target_square(move)
+        piece_type = board.at(source_square).piece_type
+
+        move_index.setdefault((target_square.rank * 8 + target_square.file, piece_type), []).append(move)
+
+    _last_move_index = (game_state.zobrist_key, move_index)
+
+    return move_index
+
+
+def move_to_uci(move: Move) -> str:
+    from engine.engine import get_move_source_square, get_move_target_square
+
+    result = f"{get_move_source_square(move)}{get_move_target_square(move)}"
+
+    if isinstance(move, PromotionMove):
+        result += _SAN_PIECE_LETTERS[move.promote_to].lower()
+
+    return result
+
+
+# long algebraic notation such as e2e4, e7e8q or e1g1 for castling
+def move_from_uci(game_state: "GameState", uci: str) -> Move:
+    try:
+        source_index = _get_square_index(uci[0:2])
+        target_index = _get_square_index(uci[2:4])
+        promote_to = _SAN_PIECE_TYPES[uci[4].upper()] if len(uci) == 5 else None
+    except (KeyError, ValueError):
+        raise ValueError(f"invalid uci: {uci}")
+
+    if len(uci) not in (4, 5):
+        raise ValueError(f"invalid uci: {uci}")
+
+    from engine.engine import get_move_source_square
+
+    moving_piece = game_state.board.at_index(source_index)
+
+    if moving_piece is not None and moving_piece.color is game_state.color_to_move:
+        for move in _get_move_index(game_state).get((target_index, moving_piece.piece_type), []):
+            source_square = get_move_source_square(move)
+
+            if source_square.rank * 8 + source_square.file == source_index and _get_promotion_piece_type(move) is promote_to:
+                return move
+
+    raise ValueError(f"illegal uci: {uci}")
+
+
+def _get_promotion_piece_type(move: Move) -> Optional[PieceType]:
+    if isinstance(move, PromotionMove):
+        return move.promote_to
+
+    return None
+
+
+def _get_san_check_suffix(game_state: "GameState", move: Move) -> str:
+    from engine.engine import do_move, undo_move, is_in_check, get_cached_moves
+
+    undo_info = do_move(game_state, move)
+
+    try:
+        if not is_in_check(game_state, game_state.color_to_move):
+            return ""
+
+        if len(get_cached_moves(game_state)) == 0:
+            return "#"
+
+        return "+"
+    finally:
+        undo_move(game_state, move, undo_info)
+
+
+def _get_san_disambiguation(game_state: "GameState", move: Move, piece_type: PieceType) -> str:
+    target_index = move.target_square.rank * 8 + move.target_square.file
+    source_square = move.source_square
+
+    # other pieces of the same kind that could also reach the target square
+    rivals = [
+        other_move.source_square
+        for other_move in _get_move_index(game_state).get((target_index, piece_type), [])
+        if not isinstance(other_move, CastlingMove) and other_move.source_square != source_square
+    ]
+
+    if not rivals:
+        return ""
+
+    if all(rival.file != source_square.file for rival in rivals):
+        return str(source_square)[0]
+
+    if all(rival.rank != source_square.rank for rival in rivals):
+        return str(source_square)[1]
+
+    return str(source_square)
+
+
+# written with a check or checkmate suffix
+def move_to_san(game_state: "GameState", move: Move) -> str:
+    if isinstance(move, CastlingMove):
+        return _CASTLING_SAN[move.side] + _get_san_check_suffix(game_state, move)
+
+    moving_piece = game_state.board.at(move.source_square)
+
+    if moving_piece is None:
+        raise ValueError(f"cannot write move in san: no piece on {move.source_square}")
+
+    is_capture = isinstance(move, EnPassantMove) or game_state.board.at(move.target_square) is not None
+
+    if moving_piece.piece_type is PieceType.PAWN:
+        result = str(move.source_square)[0] + "x" if is_capture else ""
+    else:
+        result = _SAN_PIECE_LETTERS[moving_piece.piece_type]
+        result += _get_san_disambiguation(game_state, move, moving_piece.piece_type)
+        result += "x" if is_capture else ""
+
+    result += str(move.target_square)
+
+    if isinstance(move, PromotionMove):
+        result += "=" + _SAN_PIECE_LETTERS[move.promote_to]
+
+    return result + _get_san_check_suffix(game_state, move)
+
+
+# check and annotation suffixes are ignored, and castling may be written
+# with zeros
+def move_from_san(game_state: "GameState", san: str) -> Move:
+    stripped_san = san.rstrip("+#!?").replace("0", "O")
+
+    for side, castling_san in _CASTLING_SAN.items():
+        if stripped_san == castling_san:
+            from engine.engine import get_cached_moves
+
+            move = CastlingMove(side, game_state.color_to_move)
+
+            if move not in get_cached_moves(game_state):
+                raise ValueError(f"illegal san: {san}")
+
+            return move
+
+    try:
+        promote_to = None
+
+        if "=" in stripped_san:
+            stripped_san, promotion_letter = stripped_san.split("=")
+            promote_to = _SAN_PIECE_TYPES[promotion_letter]
+        elif stripped_san[-1] in "QRBN":
+            promote_to = _SAN_PIECE_TYPES[stripped_san[-1]]
+            stripped_san = stripped_san[:-1]
+
+        if stripped_san[0] in _SAN_PIECE_TYPES:
+            piece_type = _SAN_PIECE_TYPES[stripped_san[0]]
+            stripped_san = stripped_san[1:]
+        else:
+            piece_type = PieceType.PAWN
+
+        target_index = _get_square_index(stripped_san[-2:])
+        # a file, a rank or a whole square
+        disambiguation = stripped_san[:-2].replace("x", "")
+    except (KeyError, IndexError, ValueError):
+        raise ValueError(f"invalid san: {san}")
+
+    candidates = [
+        move
+        for move in _get_move_index(game_state).get((target_index, piece_type), [])
+        if not isinstance(move, CastlingMove)
+        and _get_promotion_piece_type(move) is promote_to
+        and (str(move.source_square).startswith(disambiguation) or str(move.source_square).endswith(disambiguation))
+    ]
+
+    if len(candidates) != 1:
+        reason = "illegal" if len(candidates) == 0 else "ambiguous"
+
+        raise ValueError(f"{reason} san: {san}")
+
+    return candidates[0]
@@ -1,6 +1,8 @@
 from game_state.castling_permissions import CastlingPermissions
 from game_state.game_state import GameState
-from game_state.board import Board
+from game_state.bitboard import BitBoard
+from game_state.zobrist import compute_zobrist_key
+from game_state.piece_square_tables import compute_evaluation_terms
 from coordinate import Coordinate
 import notation
 
@@ -20,6 +22,9 @@ class FenParser:
         result.halfmove_clock = int(fields[4])
         result.fullmove_count = int(fields[5])
 
+        result.zobrist_key = compute_zobrist_key(result)
+        result.middlegame_score, result.endgame_score, result.phase = compute_evaluation_terms(result.board)
+
         return result
 
     def _split_into_fields(self, content):
@@ -27,22 +32,20 @@ class FenParser:
 
     def _parse_board(self, board_string):
         rank_strings = self._split_into_ranks(board_string)
-        board = Board()
-
-        for i, rank_string in enumerate(rank_strings):
-            self._populate_board_rank_by_string(board.matrix[i], rank_string)
+        board = BitBoard()
 
-        # we reverse to make the board indexing order consistent
-        # with how coordinates are given in chess
+        # fen lists ranks from the eighth down, so we reverse the index to
+        # make it consistent with how coordinates are given in chess
 
-        board.matrix = board.matrix[::-1]
+        for i, rank_string in enumerate(rank_strings):
+            self._populate_board_rank_by_string(board, 7 - i, rank_string)
 
         return board
 
     def _split_into_ranks(self, board_string):
         return board_string.split("/")
 
-    def _populate_board_rank_by_string(self, rank, string):
+    def _populate_board_rank_by_string(self, board, rank, string):
         file = 0
 
         for character in string:
@@ -52,7 +55,7 @@ class FenParser:
                 continue
 
             piece = notation.get_piece_by_character(character)
-            rank[file] = piece
+            board.set_at(Coordinate(file, rank), piece)
             file += 1
 
 
@@ -82,19 +85,19 @@ class FenParser:
         return formatted_result
 
     def _serialize_board(self, board):
-        matrix = board.matrix[::-1]
-
         encoded_ranks = []
-        for rank in matrix:
-            encoded_ranks.append(self._encode_board_rank(rank))
+        for rank in reversed(range(8)):
+            encoded_ranks.append(self._encode_board_rank(board, rank))
 
         return "/".join(encoded_ranks)
 
-    def _encode_board_rank(self, rank):
+    def _encode_board_rank(self, board, rank):
         result = ""
         skip_tile_count = 0
 
-        for piece in rank:
+        for file in range(8):
+            piece = board.at(Coordinate(file, rank))
+
             if piece is None:
                 skip_tile_count += 1
                 continue
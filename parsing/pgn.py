@@ -0,0 +1,244 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from custom_exceptions import InvalidPgnString
+from game_state.game_state import GameState
+from parsing.fen_parser import FenParser
+from engine.engine import do_move
+from move import Move
+from color import Color
+import notation
+
+STARTING_POSITION_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# the tags every exported game carries, in the order the standard lists them
+SEVEN_TAG_ROSTER = ["Event", "Site", "Date", "Round", "White", "Black", "Result"]
+_UNKNOWN_TAG_VALUES = {"Date": "????.??.??", "Result": "*"}
+
+RESULTS = {"1-0", "0-1", "1/2-1/2", "*"}
+
+MAX_LINE_LENGTH = 80
+
+_TAG_PAIR_PATTERN = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+# comments, variations and numeric annotation glyphs are skipped; variations
+# nest, so parentheses are matched by hand
+_MOVETEXT_TOKEN_PATTERN = re.compile(r"\{[^}]*\}|;[^\n]*|\(|\)|\$\d+|\d+\.+|[^\s{}();]+")
+_MOVE_NUMBER_PATTERN = re.compile(r"\d+\.+")
+
+
+@dataclass
+class PgnGame:
+    tags: Dict[str, str] = field(default_factory=dict)
+    moves: List[Move] = field(default_factory=list)
+    result: str = "*"
+
+    def get_initial_game_state(self) -> GameState:
+        return FenParser().parse(self.tags.get("FEN", STARTING_POSITION_FEN))
+
+    # the same state is updated in place between moves, so copy it to keep it
+    def iter_positions(self) -> Iterator[Tuple[GameState, Move]]:
+        game_state = self.get_initial_game_state()
+
+        for move in self.moves:
+            yield game_state, move
+            do_move(game_state, move)
+
+    def get_final_game_state(self) -> GameState:
+        game_state = self.get_initial_game_state()
+
+        for move in self.moves:
+            do_move(game_state, move)
+
+        return game_state
+
+
+# parsed one game at a time, so files of any size stream through; games that
+# fail to parse raise InvalidPgnString unless skip_invalid_games
+def iter_pgn_games(lines: Iterable[str], skip_invalid_games: bool = False) -> Iterator[PgnGame]:
+    tag_lines: List[str] = []
+    movetext_lines: List[str] = []
+    # braces of comments opened and not yet closed in movetext_lines
+    unclosed_brace_count = 0
+    game_number = 0
+
+    def parse_collected_game() -> Optional[PgnGame]:
+        nonlocal game_number, unclosed_brace_count
+        game_number += 1
+
+        try:
+            return _parse_game(tag_lines, movetext_lines)
+        except InvalidPgnString as error:
+            if skip_invalid_games:
+                return None
+
+            raise InvalidPgnString(f"game {game_number}: {error}") from error
+        finally:
+            tag_lines.clear()
+            movetext_lines.clear()
+            unclosed_brace_count = 0
+
+    for line in lines:
+        stripped_line = line.strip()
+
+        # escaped lines are reserved for other programs
+        if stripped_line.startswith("%"):
+            continue
+
+        if stripped_line.startswith("[") and unclosed_brace_count <= 0:
+            # a tag after movetext starts the next game
+            if movetext_lines:
+                game = parse_collected_game()
+
+                if game is not None:
+                    yield game
+
+            tag_lines.append(stripped_line)
+        elif stripped_line or movetext_lines:
+            movetext_lines.append(stripped_line)
+            unclosed_brace_count += stripped_line.count("{") - stripped_line.count("}")
+
+            if _ends_with_result(stripped_line) and unclosed_brace_count <= 0:
+                game = parse_collected_game()
+
+                if game is not None:
+                    yield game
+
+    if tag_lines or any(movetext_lines):
+        game = parse_collected_game()
+
+        if game is not None:
+            yield game
+
+
+def read_pgn_file(filepath: str, skip_invalid_games: bool = False) -> Iterator[PgnGame]:
+    with open(filepath, "r") as f:
+        yield from iter_pgn_games(f, skip_invalid_games)
+
+
+def _ends_with_result(line: str) -> bool:
+    tokens = line.split()
+
+    return len(tokens) > 0 and tokens[-1] in RESULTS
+
+
+def _parse_game(tag_lines: List[str], movetext_lines: List[str]) -> PgnGame:
+    game = PgnGame()
+
+    for tag_line in tag_lines:
+        match = _TAG_PAIR_PATTERN.fullmatch(tag_line)
+
+        if match is None:
+            raise InvalidPgnString(f"invalid tag pair: {tag_line}")
+
+        game.tags[match.group(1)] = match.group(2).replace('\\"', '"').replace("\\\\", "\\")
+
+    try:
+        game_state = game.get_initial_game_state()
+    except (ValueError, IndexError) as error:
+        raise InvalidPgnString(f"invalid FEN tag: {error}") from error
+
+    variation_depth = 0
+
+    for token in _MOVETEXT_TOKEN_PATTERN.findall("\n".join(movetext_lines)):
+        if token == "(":
+            variation_depth += 1
+        elif token == ")":
+            variation_depth -= 1
+        elif variation_depth > 0 or token[0] in "{;$" or _MOVE_NUMBER_PATTERN.fullmatch(token):
+            continue
+        elif token in RESULTS:
+            game.result = token
+        else:
+            try:
+                move = notation.move_from_san(game_state, token)
+            except ValueError as error:
+                move_number = f"{game_state.fullmove_count}{'.' if game_state.color_to_move is Color.WHITE else '...'}"
+
+                raise InvalidPgnString(f"move {move_number}: {error}") from error
+
+            game.moves.append(move)
+            do_move(game_state, move)
+
+    return game
+
+
+def _escape_tag_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _wrap_tokens(tokens: List[str]) -> List[str]:
+    lines = []
+    line = ""
+
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > MAX_LINE_LENGTH:
+            lines.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+
+    if line:
+        lines.append(line)
+
+    return lines
+
+
+# moves each given with the position they are played in, wrapped to
+# MAX_LINE_LENGTH
+def format_movetext(positions: Iterable[Tuple[GameState, Move]], result: str = "*") -> str:
+    tokens = []
+
+    for index, (game_state, move) in enumerate(positions):
+        if game_state.color_to_move is Color.WHITE:
+            tokens.append(f"{game_state.fullmove_count}.")
+        elif index == 0:
+            tokens.append(f"{game_state.fullmove_count}...")
+
+        tokens.append(notation.move_to_san(game_state, move))
+
+    tokens.append(result)
+
+    return "\n".join(_wrap_tokens(tokens))
+
+
+def serialize_game(game: PgnGame) -> str:
+    tags = {tag: game.tags.get(tag, _UNKNOWN_TAG_VALUES.get(tag, "?")) for tag in SEVEN_TAG_ROSTER}
+    tags["Result"] = game.result
+    tags.update((tag, value) for tag, value in game.tags.items() if tag not in tags)
+
+    tag_section = "\n".join(f'[{tag} "{_escape_tag_value(value)}"]' for tag, value in tags.items())
+
+    return f"{tag_section}\n\n{format_movetext(game.iter_positions(), game.result)}\n"
+
+
+def write_pgn_games(games: Iterable[PgnGame], output: TextIO) -> int:
+    count = 0
+
+    for game in games:
+        if count > 0:
+            output.write("\n")
+
+        output.write(serialize_game(game))
+        count += 1
+
+    return count
+
+
+# reads the position at the end of the first game and writes a position as
+# a game without moves, for files
+class PgnParser:
+    def parse(self, string: str) -> GameState:
+        for game in iter_pgn_games(string.splitlines()):
+            return game.get_final_game_state()
+
+        raise InvalidPgnString("no game found")
+
+    def serialize(self, game_state: GameState) -> str:
+        fen = FenParser().serialize(game_state)
+        game = PgnGame()
+
+        if fen != STARTING_POSITION_FEN:
+            game.tags["SetUp"] = "1"
+            game.tags["FEN"] = fen
+
+        return serialize_game(game)
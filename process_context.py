@@ -0,0 +1,7 @@
+import multiprocessing
+
+
+def get_process_context() -> multiprocessing.context.BaseContext:
+    # spawned rather than forked, as forking a process that runs other
+    # threads can copy locks in a held state
+    return multiprocessing.get_context("spawn")
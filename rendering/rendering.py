@@ -1,6 +1,7 @@
 from engine.engine import (
     square_contains_color,
-    generate_moves_for_piece,
+    get_cached_moves,
+    get_move_source_square,
     get_promotable_piece_types
 )
 
@@ -18,12 +19,12 @@ from move import Move
 import pygame
 from copy import deepcopy
 from piece import Piece, PieceType
-from typing import Set, Optional, Tuple
+from typing import Dict, List, Set, Optional, Tuple
 from math import floor, ceil
 from coordinate import Coordinate
-from rendering.tilemap import get_piece_image
+from rendering.tilemap import get_scaled_piece_image
 from engine.castling_squares import get_castling_king_target_square
-from game_state.game_state import GameState
+from game_state.bitboard import SQUARE_COORDINATES
 from move import (
     Move,
     CastlingMove,
@@ -34,7 +35,14 @@ from move import (
 )
 
 
+# the pieces of every square, copied from the board for drawing
+BoardSnapshot = Tuple[Optional[Piece], ...]
+
 INITIAL_WINDOW_DIMENSIONS = (600, 600)
+FRAME_RATE = 60
+# with nothing happening the loop sleeps until an event arrives, waking
+# this often to notice moves made by the opponent
+IDLE_WAIT_MILLISECONDS = 50
 
 
 def square_is_white(square: Coordinate):
@@ -48,6 +56,9 @@ def get_square_white_or_black_color(square: Coordinate) -> pygame.color.Color:
         return pygame.color.Color(100, 100, 100)
 
 
+POSSIBLE_MOVE_SQUARE_COLOR = pygame.color.Color(14, 204, 65)
+
+
 def get_move_signature_square(move: Move) -> Coordinate:
     if isinstance(move, CastlingMove):
         return get_castling_king_target_square(move)
@@ -57,27 +68,30 @@ def get_move_signature_square(move: Move) -> Coordinate:
         raise ValueError("invalid move type")
 
 
-def possible_moves_for_selected_piece_include_square(selection: Optional[Selection], square: Coordinate) -> bool:
-    if selection is None:
-        return False
-    
-    for move in selection.possible_moves_for_selected_piece:
-        signature_square = get_move_signature_square(move)
+# the board only changes with the window size, so it is drawn once per size
+_board_surfaces: Dict[Tuple[int, bool], pygame.surface.Surface] = {}
+
 
-        if signature_square == square:
-            return True
+def get_board_surface(chessboard_size: int, flip: bool) -> pygame.surface.Surface:
+    board_surface = _board_surfaces.get((chessboard_size, flip))
 
-    return False
+    if board_surface is not None:
+        return board_surface
 
+    board_surface = pygame.surface.Surface((chessboard_size, chessboard_size))
+    board_rect = board_surface.get_rect()
 
-def get_color_for_square(selection: Optional[Selection], square: Coordinate) -> pygame.color.Color:
-    if possible_moves_for_selected_piece_include_square(selection, square):
-        return pygame.color.Color(14, 204, 65)
+    for square in SQUARE_COORDINATES:
+        pygame.draw.rect(board_surface, get_square_white_or_black_color(square), get_square_rect(board_rect, square, flip))
 
-    white_or_black_color = get_square_white_or_black_color(square)
+    if pygame.display.get_surface() is not None:
+        board_surface = board_surface.convert()
 
+    # a resized window never goes back to an earlier size soon enough to keep it
+    _board_surfaces.clear()
+    _board_surfaces[(chessboard_size, flip)] = board_surface
 
-    return white_or_black_color
+    return board_surface
 
 
 def draw_piece_at_square(surface: pygame.surface.Surface, chessboard_rect: pygame.rect.Rect, piece: Piece, square: Coordinate, flip: bool):
@@ -87,64 +101,77 @@ def draw_piece_at_square(surface: pygame.surface.Surface, chessboard_rect: pygam
 
 
 def draw_piece_at_rect(surface: pygame.surface.Surface, piece: Piece, piece_rect: pygame.rect.Rect):
-    piece_image = get_piece_image(piece)
     piece_position_x, piece_position_y, piece_width, piece_height = piece_rect
+    piece_image = get_scaled_piece_image(piece, (piece_width, piece_height))
 
-    surface.blit(pygame.transform.scale(piece_image, (piece_width, piece_height)), (piece_position_x, piece_position_y))
+    surface.blit(piece_image, (piece_position_x, piece_position_y))
 
 
-def draw_chessboard(surface: pygame.surface.Surface, chessboard_rect: pygame.rect.Rect, environment: Environment, selection: Optional[Selection], flip: bool) -> None:
-    with environment.game_state_lock:
-        for rank_index in range(8):
-            for file_index in range(8):
-                square = Coordinate(rank_index, file_index)
-                square_color = get_color_for_square(selection, square)
-                square_rect = get_square_rect(chessboard_rect, square, flip)
-                pygame.draw.rect(surface, square_color, square_rect)
+def draw_possible_move_squares(surface: pygame.surface.Surface, chessboard_rect: pygame.rect.Rect, selection: Selection, flip: bool) -> None:
+    for square in selection.possible_move_squares:
+        pygame.draw.rect(surface, POSSIBLE_MOVE_SQUARE_COLOR, get_square_rect(chessboard_rect, square, flip))
 
-                if selection is not None and square == selection.selected_piece_square:
-                    continue
 
-                piece_at_square = environment.game_state.board.at(square)
+def draw_chessboard(surface: pygame.surface.Surface, chessboard_rect: pygame.rect.Rect, board_snapshot: BoardSnapshot, selection: Optional[Selection], flip: bool) -> None:
+    # the board, then the squares the selected piece can move to, then the pieces
+    surface.blit(get_board_surface(chessboard_rect.width, flip), chessboard_rect.topleft)
 
-                if piece_at_square is None:
-                    continue
+    if selection is not None:
+        draw_possible_move_squares(surface, chessboard_rect, selection, flip)
 
-                draw_piece_at_square(surface, chessboard_rect, piece_at_square, square, flip)
+    for square, piece_at_square in zip(SQUARE_COORDINATES, board_snapshot):
+        if piece_at_square is None:
+            continue
 
-        if selection is not None:
-            draw_selected_piece(surface, environment.game_state, chessboard_rect, selection)
+        if selection is not None and square == selection.selected_piece_square:
+            continue
+
+        draw_piece_at_square(surface, chessboard_rect, piece_at_square, square, flip)
+
+    if selection is not None:
+        draw_selected_piece(surface, board_snapshot, chessboard_rect, selection)
 
 
-def draw_selected_piece(surface: pygame.surface.Surface, game_state: GameState, chessboard_rect: pygame.rect.Rect, selection: Selection):
+def get_selected_piece_rect(chessboard_rect: pygame.rect.Rect, selection: Selection) -> pygame.rect.Rect:
     _, _, chessboard_size, _ = chessboard_rect
     square_size = ceil(get_square_size(chessboard_size))
-    piece = game_state.board.at(selection.selected_piece_square)
-
-    if piece is None:
-        raise ValueError("empty square")
 
     mouse_x, mouse_y = pygame.mouse.get_pos()
     mouse_offset_x, mouse_offset_y = selection.mouse_offset
-    piece_rect = pygame.rect.Rect(mouse_x - mouse_offset_x, mouse_y - mouse_offset_y, square_size, square_size)
 
-    draw_piece_at_rect(surface, piece, piece_rect)
+    return pygame.rect.Rect(mouse_x - mouse_offset_x, mouse_y - mouse_offset_y, square_size, square_size)
+
+
+def draw_selected_piece(surface: pygame.surface.Surface, board_snapshot: BoardSnapshot, chessboard_rect: pygame.rect.Rect, selection: Selection):
+    selected_piece_square = selection.selected_piece_square
+    piece = board_snapshot[selected_piece_square.rank * 8 + selected_piece_square.file]
+
+    if piece is None:
+        raise ValueError("empty square")
+
+    draw_piece_at_rect(surface, piece, get_selected_piece_rect(chessboard_rect, selection))
 
 
 def on_selection_start(environment: Environment, chessboard_rect: pygame.rect.Rect, flip: bool) -> Optional[Selection]:
+    square_under_mouse, offset = get_square_on_board_and_offset_for_position(chessboard_rect, pygame.mouse.get_pos(), flip)
+
+    # only the cached moves are read under the lock; they are filtered
+    # after it is released
     with environment.game_state_lock:
         game_state = environment.game_state
 
-        square_under_mouse, offset = get_square_on_board_and_offset_for_position(chessboard_rect, pygame.mouse.get_pos(), flip)
-
         if game_state.color_to_move is not environment.client_color:
             return None
 
-        if not square_contains_color(game_state, square_under_mouse, environment.game_state.color_to_move):
+        if not square_contains_color(game_state, square_under_mouse, game_state.color_to_move):
             return None
 
-        possible_moves_for_selected_piece = generate_moves_for_piece(game_state, square_under_mouse) 
-        return Selection(square_under_mouse, offset, possible_moves_for_selected_piece)
+        moves = get_cached_moves(game_state)
+
+    possible_moves_for_selected_piece = set(move for move in moves if get_move_source_square(move) == square_under_mouse)
+    possible_move_squares = frozenset(get_move_signature_square(move) for move in possible_moves_for_selected_piece)
+
+    return Selection(square_under_mouse, offset, possible_moves_for_selected_piece, possible_move_squares)
     
 
 def get_possible_move_with_signature_square(moves: Set[Move], square: Coordinate) -> Optional[Move]:
@@ -272,16 +299,50 @@ def handle_promotion_menu_click(surface: pygame.surface.Surface, environment: En
     
 
 
+# only the copy is made under the lock; frames are drawn from it without holding it
+def get_board_snapshot(environment: Environment) -> BoardSnapshot:
+    with environment.game_state_lock:
+        return tuple(environment.game_state.board.squares)
+
+
+def get_changed_square_rects(chessboard_rect: pygame.rect.Rect, drawn_board_snapshot: BoardSnapshot, board_snapshot: BoardSnapshot, flip: bool) -> List[pygame.rect.Rect]:
+    return [
+        get_square_rect(chessboard_rect, SQUARE_COORDINATES[square_index], flip)
+        for square_index in range(64)
+        if board_snapshot[square_index] != drawn_board_snapshot[square_index]
+    ]
+
+
+def draw_frame(window: pygame.surface.Surface, chessboard_rect: pygame.rect.Rect, environment: Environment, board_snapshot: BoardSnapshot, selection: Optional[Selection], current_promotion_move: Optional[PromotionMove], flip: bool, clip_rect: pygame.rect.Rect) -> None:
+    # everything outside the clip is left as it is, so only its part of
+    # the frame costs anything
+    window.set_clip(clip_rect)
+    window.fill((0, 0, 0))
+    draw_chessboard(window, chessboard_rect, board_snapshot, selection, flip)
+
+    if current_promotion_move is not None:
+        draw_promotion_menu(window, environment.client_color, current_promotion_move, flip)
+
+    window.set_clip(None)
+
+
 def render_logic(environment: Environment):
     window = pygame.display.set_mode(INITIAL_WINDOW_DIMENSIONS, pygame.RESIZABLE)
+    clock = pygame.time.Clock()
     selection: Optional[Selection] = None
     current_promotion_move: Optional[PromotionMove] = None
     flip = environment.client_color == Color.BLACK
+    drawn_board_snapshot = get_board_snapshot(environment)
+    selected_piece_rect: Optional[pygame.rect.Rect] = None
+    # parts of the window to redraw on the next frame; nothing is drawn
+    # while it stays empty
+    dirty_rects: List[pygame.rect.Rect] = [window.get_rect()]
 
     while True:
+        events = [pygame.event.wait(IDLE_WAIT_MILLISECONDS)] + pygame.event.get()
         chessboard_rect = get_chessboard_rect(window.get_size())
 
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 environment.close_event.set()
                 return
@@ -292,18 +353,43 @@ def render_logic(environment: Environment):
                     else:
                         handle_promotion_menu_click(window, environment, current_promotion_move, flip)
                         current_promotion_move = None
+
+                    dirty_rects.append(window.get_rect())
             elif event.type == pygame.MOUSEBUTTONUP:
                 if event.button == 1:
                     if selection is not None:
                         current_promotion_move = on_selection_end(environment, chessboard_rect, selection, flip)
+                        dirty_rects.append(window.get_rect())
 
                     selection = None
-                
-        window.fill((0, 0, 0))
-        draw_chessboard(window, chessboard_rect, environment, selection, flip)
+            elif event.type == pygame.MOUSEMOTION:
+                if current_promotion_move is not None:
+                    dirty_rects.append(get_promotion_menu_rect(window, current_promotion_move.target_square, flip))
+            elif event.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE):
+                dirty_rects.append(window.get_rect())
+
+        if selection is not None:
+            new_selected_piece_rect = get_selected_piece_rect(chessboard_rect, selection)
+
+            if new_selected_piece_rect != selected_piece_rect:
+                if selected_piece_rect is not None:
+                    dirty_rects.append(selected_piece_rect)
+
+                dirty_rects.append(new_selected_piece_rect)
+                selected_piece_rect = new_selected_piece_rect
+        else:
+            selected_piece_rect = None
+
+        board_snapshot = get_board_snapshot(environment)
 
-        if current_promotion_move is not None:
-            draw_promotion_menu(window, environment.client_color, current_promotion_move, flip)
+        if board_snapshot != drawn_board_snapshot:
+            dirty_rects.extend(get_changed_square_rects(chessboard_rect, drawn_board_snapshot, board_snapshot, flip))
+            drawn_board_snapshot = board_snapshot
 
-        pygame.display.update()
+        if dirty_rects:
+            clip_rect = dirty_rects[0].unionall(dirty_rects[1:])
+            draw_frame(window, chessboard_rect, environment, board_snapshot, selection, current_promotion_move, flip, clip_rect)
+            pygame.display.update(dirty_rects)
+            dirty_rects = []
 
+        clock.tick(FRAME_RATE)
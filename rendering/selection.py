@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Set, Tuple
+from typing import FrozenSet, Set, Tuple
 from move import Move
 from coordinate import Coordinate
 
@@ -8,4 +8,6 @@ class Selection:
     selected_piece_square: Coordinate
     mouse_offset: Tuple[int, int]
     possible_moves_for_selected_piece: Set[Move]
+    # where the selected piece can go, the king's target square for castling
+    possible_move_squares: FrozenSet[Coordinate]
     
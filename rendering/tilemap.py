@@ -1,6 +1,7 @@
 import pygame
+from collections import OrderedDict
 from piece import Piece, PieceType
-from typing import Tuple
+from typing import Dict, Tuple
 from color import Color
 
 
@@ -23,8 +24,7 @@ TILEMAP_ROWS = 2
 
 
 def get_piece_image(piece: Piece) -> pygame.surface.Surface:
-    x_index, y_index = get_piece_tilemap_indices(piece)
-    return get_piece_image_at_index(x_index, y_index)
+    return PIECE_IMAGES[piece]
 
 
 def get_piece_tilemap_indices(piece: Piece) -> Tuple[int, int]:
@@ -50,3 +50,42 @@ def get_piece_image_at_index(x_index: int, y_index: int) -> pygame.surface.Surfa
     result_surface.blit(PIECE_TILEMAP, (-piece_image_x_offset, -piece_image_y_offset))
 
     return result_surface
+
+
+PIECE_IMAGES: Dict[Piece, pygame.surface.Surface] = {
+    Piece(color, piece_type): get_piece_image_at_index(x_index, y_index)
+    for piece_type, x_index in PIECE_TYPE_X_INDICES.items()
+    for color, y_index in COLOR_Y_INDICES.items()
+}
+
+# the board, a dragged piece and the promotion menu may each want a
+# slightly different size; older sizes are dropped as the window is resized
+MAX_CACHED_SIZES = 4
+_scaled_piece_images: "OrderedDict[Tuple[int, int], Dict[Piece, pygame.surface.Surface]]" = OrderedDict()
+
+
+# scaled only the first time a size is asked for
+def get_scaled_piece_image(piece: Piece, size: Tuple[int, int]) -> pygame.surface.Surface:
+    images = _scaled_piece_images.get(size)
+
+    if images is None:
+        images = {}
+        _scaled_piece_images[size] = images
+
+        while len(_scaled_piece_images) > MAX_CACHED_SIZES:
+            _scaled_piece_images.popitem(last=False)
+    else:
+        _scaled_piece_images.move_to_end(size)
+
+    image = images.get(piece)
+
+    if image is None:
+        image = pygame.transform.scale(PIECE_IMAGES[piece], size)
+
+        # matching the display's pixel format makes every later blit cheaper
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+
+        images[piece] = image
+
+    return image
@@ -0,0 +1,50 @@
+import pytest
+from color import Color
+from coordinate import Coordinate
+from game_state.bitboard import get_square_index, iter_square_indices, SQUARE_COORDINATES
+from engine.attack_tables import (
+    KNIGHT_ATTACKS,
+    KNIGHT_TARGETS,
+    KING_ATTACKS,
+    KING_TARGETS,
+    PAWN_ATTACKS,
+)
+
+
+def squares_of(bitboard: int):
+    return set(repr(SQUARE_COORDINATES[index]) for index in iter_square_indices(bitboard))
+
+
+@pytest.mark.parametrize("square,targets", [
+    ("a1", {"b3", "c2"}),
+    ("g1", {"e2", "f3", "h3"}),
+    ("d4", {"b3", "b5", "c2", "c6", "e2", "e6", "f3", "f5"}),
+])
+def test_knight_attacks(square: str, targets):
+    square_index = get_square_index(Coordinate.from_string(square))
+
+    assert squares_of(KNIGHT_ATTACKS[square_index]) == targets
+    assert set(repr(target) for target in KNIGHT_TARGETS[square_index]) == targets
+
+
+@pytest.mark.parametrize("square,targets", [
+    ("a1", {"a2", "b1", "b2"}),
+    ("e8", {"d8", "f8", "d7", "e7", "f7"}),
+])
+def test_king_attacks(square: str, targets):
+    square_index = get_square_index(Coordinate.from_string(square))
+
+    assert squares_of(KING_ATTACKS[square_index]) == targets
+    assert len(KING_TARGETS[square_index]) == len(targets)
+
+
+@pytest.mark.parametrize("color,square,targets", [
+    (Color.WHITE, "e4", {"d5", "f5"}),
+    (Color.WHITE, "a2", {"b3"}),
+    (Color.BLACK, "h7", {"g6"}),
+    (Color.BLACK, "a1", set()),
+])
+def test_pawn_attacks(color: Color, square: str, targets):
+    square_index = get_square_index(Coordinate.from_string(square))
+
+    assert squares_of(PAWN_ATTACKS[color][square_index]) == targets
@@ -0,0 +1,65 @@
+import pytest
+from color import Color
+from coordinate import Coordinate
+from piece import PieceType
+from move import BasicMove, PromotionMove
+from parsing.fen_parser import FenParser
+from engine.engine import square_is_threatened, generate_moves_for_piece, is_in_check
+from engine.attack_tables import KING_TARGETS, PAWN_CAPTURE_TARGETS
+from game_state.bitboard import get_square_index
+
+POSITIONS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+]
+
+
+def get_threatened_squares_by_generating_moves(game_state, color: Color):
+    result = set()
+
+    for piece_square, piece in game_state.board.iter_pieces_of_color(color):
+        square_index = get_square_index(piece_square)
+
+        if piece.piece_type is PieceType.KING:
+            result.update(KING_TARGETS[square_index])
+        elif piece.piece_type is PieceType.PAWN:
+            result.update(PAWN_CAPTURE_TARGETS[color][square_index])
+        else:
+            for move in generate_moves_for_piece(game_state, piece_square, must_evade_check=False):
+                if isinstance(move, BasicMove) or isinstance(move, PromotionMove):
+                    result.add(move.target_square)
+
+    return result
+
+
+@pytest.mark.parametrize("fen_string", POSITIONS)
+@pytest.mark.parametrize("color", [Color.WHITE, Color.BLACK])
+def test_square_is_threatened_matches_move_generation(fen_string: str, color: Color):
+    game_state = FenParser().parse(fen_string)
+    expected = get_threatened_squares_by_generating_moves(game_state, color)
+
+    for file in range(8):
+        for rank in range(8):
+            square = Coordinate(file, rank)
+            piece = game_state.board.at(square)
+
+            # move generation never targets squares held by the mover
+            if piece is not None and piece.color is color:
+                continue
+
+            assert square_is_threatened(game_state, square, color) == (square in expected), square
+
+
+@pytest.mark.parametrize("fen_string,color,in_check", [
+    ("4k3/8/8/8/8/8/8/4K2r w - - 0 1", Color.WHITE, True),
+    ("4k3/8/8/8/8/8/4P3/4K2r w - - 0 1", Color.WHITE, True),
+    ("4k3/8/8/8/8/8/8/4KN1r w - - 0 1", Color.WHITE, False),
+    ("4k3/8/8/8/1b6/8/8/4K3 w - - 0 1", Color.WHITE, True),
+    ("4k3/8/8/8/8/8/3p4/4K3 w - - 0 1", Color.WHITE, True),
+    ("4k3/8/8/8/8/8/4p3/4K3 w - - 0 1", Color.WHITE, False),
+    ("4k3/8/3N4/8/8/8/8/4K3 b - - 0 1", Color.BLACK, True),
+])
+def test_is_in_check(fen_string: str, color: Color, in_check: bool):
+    assert is_in_check(FenParser().parse(fen_string), color) == in_check
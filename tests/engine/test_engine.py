@@ -1,2 +1,66 @@
 import pytest
 from game_state.game_state import GameState
+from parsing.fen_parser import FenParser
+from coordinate import Coordinate
+from move import PawnDoubleMove, BasicMove
+from engine.engine import generate_moves, do_move, undo_move, MoveGenerator
+
+POSITIONS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+    "r2q1rk1/pP1p2pp/Q4n2/bbp1p3/Np6/1B3NBn/pPPP1PPP/R3K2R b KQ - 0 1",
+]
+
+
+@pytest.fixture
+def fen_parser():
+    return FenParser()
+
+
+@pytest.mark.parametrize("fen_string", POSITIONS)
+def test_undo_move_restores_position(fen_string: str, fen_parser: FenParser):
+    game_state = fen_parser.parse(fen_string)
+
+    for move in generate_moves(game_state):
+        undo_info = do_move(game_state, move)
+        undo_move(game_state, move, undo_info)
+
+        assert fen_parser.serialize(game_state) == fen_string
+
+
+def test_pawn_double_move_sets_en_passant_target_square(default_game_state: GameState):
+    do_move(default_game_state, PawnDoubleMove(Coordinate.from_string("e2"), Coordinate.from_string("e4")))
+
+    assert default_game_state.en_passant_target_square == Coordinate.from_string("e3")
+
+    do_move(default_game_state, BasicMove(Coordinate.from_string("g8"), Coordinate.from_string("f6")))
+
+    assert default_game_state.en_passant_target_square is None
+
+
+def get_positions_after_one_move(game_state: GameState):
+    for move in generate_moves(game_state, MoveGenerator.CHECK_FILTERING):
+        undo_info = do_move(game_state, move)
+        yield game_state
+        undo_move(game_state, move, undo_info)
+
+
+@pytest.mark.parametrize("fen_string", POSITIONS + [
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "8/8/8/2k5/3Pp3/8/8/4K2Q b - d3 0 1",
+    "8/8/8/8/k2Pp2Q/8/8/4K3 b - d3 0 1",
+    "4k3/8/8/8/8/8/4r3/R3K2R w KQ - 0 1",
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+])
+def test_legal_generator_matches_check_filtering(fen_string: str, fen_parser: FenParser):
+    game_state = fen_parser.parse(fen_string)
+
+    assert generate_moves(game_state, MoveGenerator.LEGAL) == generate_moves(game_state, MoveGenerator.CHECK_FILTERING)
+
+    # positions are yielded in place, so they must be checked before the generator resumes
+    for position in get_positions_after_one_move(game_state):
+        legal_moves = generate_moves(position, MoveGenerator.LEGAL)
+        check_filtered_moves = generate_moves(position, MoveGenerator.CHECK_FILTERING)
+
+        assert legal_moves == check_filtered_moves, fen_parser.serialize(position)
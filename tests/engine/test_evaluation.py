@@ -0,0 +1,71 @@
+import pytest
+from coordinate import Coordinate
+from move import BasicMove
+from parsing.fen_parser import FenParser
+from game_state.piece_square_tables import compute_evaluation_terms, MAX_PHASE
+import engine.engine
+from engine.engine import do_move, undo_move
+from engine.evaluation import evaluate
+from engine.perft import PERFT_SUITE, perft
+
+
+@pytest.fixture
+def verify_evaluation_terms(monkeypatch):
+    monkeypatch.setattr(engine.engine, "VERIFY_EVALUATION_TERMS", True)
+
+
+def test_initial_position_is_balanced(default_game_state):
+    assert default_game_state.phase == MAX_PHASE
+    assert evaluate(default_game_state) == 0
+
+
+@pytest.mark.parametrize("fen_string,mirrored_fen_string", [
+    (PERFT_SUITE[3].fen, PERFT_SUITE[4].fen),
+    ("4k3/8/8/8/8/8/4P3/4K3 w - - 0 1", "4k3/4p3/8/8/8/8/8/4K3 b - - 0 1"),
+])
+def test_mirrored_positions_score_the_same(fen_string: str, mirrored_fen_string: str):
+    fen_parser = FenParser()
+
+    assert evaluate(fen_parser.parse(fen_string)) == evaluate(fen_parser.parse(mirrored_fen_string))
+
+
+def test_score_is_from_side_to_move():
+    fen_parser = FenParser()
+    white_to_move = evaluate(fen_parser.parse("4k3/8/8/8/8/8/8/Q3K3 w - - 0 1"))
+    black_to_move = evaluate(fen_parser.parse("4k3/8/8/8/8/8/8/Q3K3 b - - 0 1"))
+
+    assert white_to_move > 800
+    assert black_to_move == -white_to_move
+
+
+def test_king_centralization_matters_in_endgame():
+    fen_parser = FenParser()
+    centralized = evaluate(fen_parser.parse("4k3/8/8/8/3K4/8/8/8 w - - 0 1"))
+    cornered = evaluate(fen_parser.parse("4k3/8/8/8/8/8/8/K7 w - - 0 1"))
+
+    assert centralized > cornered
+
+
+@pytest.mark.parametrize("fen_string", [position.fen for position in PERFT_SUITE])
+def test_incremental_terms_match_recomputed_terms(fen_string: str, verify_evaluation_terms):
+    game_state = FenParser().parse(fen_string)
+    initial_terms = (game_state.middlegame_score, game_state.endgame_score, game_state.phase)
+
+    perft(game_state, 2)
+
+    assert (game_state.middlegame_score, game_state.endgame_score, game_state.phase) == initial_terms
+    assert compute_evaluation_terms(game_state.board) == initial_terms
+
+
+def test_capture_is_undone(verify_evaluation_terms):
+    game_state = FenParser().parse("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+    initial_score = evaluate(game_state)
+    move = BasicMove(Coordinate.from_string("d2"), Coordinate.from_string("d5"))
+
+    undo_info = do_move(game_state, move)
+
+    assert evaluate(game_state) < -300
+
+    undo_move(game_state, move, undo_info)
+
+    assert evaluate(game_state) == initial_score
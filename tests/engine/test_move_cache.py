@@ -0,0 +1,63 @@
+from coordinate import Coordinate
+from move import BasicMove, PawnDoubleMove
+from parsing.fen_parser import FenParser
+from engine.engine import generate_moves, do_move, verify_move, generate_moves_for_piece
+from engine.move_cache import MoveCache
+import engine.engine
+
+
+def test_cache_hits_on_repeated_position(default_game_state):
+    cache = MoveCache(generate_moves, max_size=4)
+
+    first_moves = cache.get_moves(default_game_state)
+    second_moves = cache.get_moves(default_game_state)
+
+    assert first_moves == second_moves == generate_moves(default_game_state)
+
+    statistics = cache.get_statistics()
+    assert (statistics.hits, statistics.misses, statistics.size) == (1, 1, 1)
+    assert statistics.hit_rate == 0.5
+
+
+def test_cache_evicts_least_recently_used():
+    fen_parser = FenParser()
+    positions = [fen_parser.parse(fen_string) for fen_string in [
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1",
+        "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq e6 0 2",
+    ]]
+    cache = MoveCache(generate_moves, max_size=2)
+
+    cache.get_moves(positions[0])
+    cache.get_moves(positions[1])
+    cache.get_moves(positions[0])
+    cache.get_moves(positions[2])
+
+    assert len(cache) == 2
+
+    cache.get_moves(positions[0])
+    assert cache.hits == 2
+
+    cache.get_moves(positions[1])
+    assert cache.misses == 4
+
+
+def test_cache_follows_moves_made(default_game_state):
+    engine.engine.legal_move_cache.clear()
+    e2 = Coordinate.from_string("e2")
+
+    assert len(generate_moves_for_piece(default_game_state, e2)) == 2
+    assert verify_move(default_game_state, PawnDoubleMove(e2, Coordinate.from_string("e4")))
+
+    do_move(default_game_state, PawnDoubleMove(e2, Coordinate.from_string("e4")))
+
+    assert not verify_move(default_game_state, BasicMove(Coordinate.from_string("d2"), Coordinate.from_string("d3")))
+    assert verify_move(default_game_state, BasicMove(Coordinate.from_string("d7"), Coordinate.from_string("d6")))
+
+    statistics = engine.engine.legal_move_cache.get_statistics()
+    assert (statistics.hits, statistics.misses) == (2, 2)
+
+
+def test_pieces_of_side_not_to_move_still_get_their_moves(default_game_state):
+    assert len(generate_moves_for_piece(default_game_state, Coordinate.from_string("e7"))) == 2
+    assert len(generate_moves_for_piece(default_game_state, Coordinate.from_string("g8"))) == 2
@@ -0,0 +1,32 @@
+import pytest
+from castling_side import CastlingSide
+from color import Color
+from move import CastlingMove
+from parsing.fen_parser import FenParser
+from engine.engine import generate_moves
+from engine.move_packing import NO_MOVE, pack_move, unpack_move
+from engine.perft import PERFT_SUITE
+
+
+@pytest.mark.parametrize("fen_string", [position.fen for position in PERFT_SUITE])
+def test_packing_round_trips_every_legal_move(fen_string: str):
+    moves = generate_moves(FenParser().parse(fen_string))
+    packed_moves = [pack_move(move) for move in moves]
+
+    assert all(0 < packed_move < 1 << 16 for packed_move in packed_moves)
+    assert len(set(packed_moves)) == len(moves)
+    assert [unpack_move(packed_move) for packed_move in packed_moves] == list(moves)
+
+
+@pytest.mark.parametrize("side", list(CastlingSide))
+@pytest.mark.parametrize("color", list(Color))
+def test_packing_round_trips_castling(side: CastlingSide, color: Color):
+    move = CastlingMove(side, color)
+
+    assert unpack_move(pack_move(move)) == move
+
+
+@pytest.mark.parametrize("packed_move", [NO_MOVE, 1 << 16, 15 << 12])
+def test_unpacking_invalid_move_raises(packed_move: int):
+    with pytest.raises(ValueError):
+        unpack_move(packed_move)
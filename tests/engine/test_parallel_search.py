@@ -0,0 +1,54 @@
+import pytest
+from coordinate import Coordinate
+from move import BasicMove
+from parsing.fen_parser import FenParser
+from engine.search import search, MATE_SCORE
+from engine.parallel_search import ParallelSearcher
+
+
+@pytest.fixture(scope="module")
+def parallel_searcher():
+    with ParallelSearcher(2) as parallel_searcher:
+        yield parallel_searcher
+
+
+def basic_move(source: str, target: str) -> BasicMove:
+    return BasicMove(Coordinate.from_string(source), Coordinate.from_string(target))
+
+
+def test_finds_mate_in_one(parallel_searcher: ParallelSearcher):
+    result = parallel_searcher.search(FenParser().parse("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1"), depth=3)
+
+    assert result.best_move == basic_move("a1", "a8")
+    assert result.score == MATE_SCORE - 1
+
+
+@pytest.mark.parametrize("fen_string", [
+    "4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1",
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+])
+def test_agrees_with_serial_search(fen_string: str, parallel_searcher: ParallelSearcher):
+    game_state = FenParser().parse(fen_string)
+
+    serial_result = search(game_state, depth=3)
+    parallel_result = parallel_searcher.search(game_state, depth=3)
+
+    assert parallel_result.score == serial_result.score
+    assert parallel_result.depth == 3
+    assert parallel_result.principal_variation[0] == parallel_result.best_move
+    assert parallel_result.nodes > 0
+
+
+def test_reports_checkmate(parallel_searcher: ParallelSearcher):
+    result = parallel_searcher.search(FenParser().parse("k7/1Q6/1K6/8/8/8/8/8 b - - 0 1"), depth=2)
+
+    assert (result.best_move, result.score) == (None, -MATE_SCORE)
+
+
+def test_unfinished_first_iteration_falls_back_like_serial_search(parallel_searcher: ParallelSearcher):
+    game_state = FenParser().parse("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+
+    result = parallel_searcher.search(game_state, time_limit=0.0)
+
+    assert result.depth == 0
+    assert result.best_move == search(game_state, time_limit=0.0).best_move
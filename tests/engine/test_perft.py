@@ -0,0 +1,33 @@
+import pytest
+from parsing.fen_parser import FenParser
+from engine.perft import PERFT_SUITE, perft, divide
+
+# keeps the suite fast while still reaching castling, promotions and en passant
+MAX_TESTED_NODES = 20000
+
+
+@pytest.mark.parametrize("fen_string,depth,expected_nodes", [
+    (position.fen, depth, expected_nodes)
+    for position in PERFT_SUITE
+    for depth, expected_nodes in enumerate(position.node_counts, start=1)
+    if expected_nodes <= MAX_TESTED_NODES
+])
+def test_perft(fen_string: str, depth: int, expected_nodes: int):
+    assert perft(FenParser().parse(fen_string), depth) == expected_nodes
+
+
+def test_divide_sums_to_perft(default_game_state):
+    node_counts = divide(default_game_state, 2)
+
+    assert len(node_counts) == 20
+    assert sum(node_counts.values()) == 400
+
+
+def test_perft_leaves_position_unchanged():
+    fen_parser = FenParser()
+    fen_string = PERFT_SUITE[1].fen
+    game_state = fen_parser.parse(fen_string)
+
+    perft(game_state, 2)
+
+    assert fen_parser.serialize(game_state) == fen_string
@@ -0,0 +1,114 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import notation
+from coordinate import Coordinate
+from move import BasicMove
+from parsing.fen_parser import FenParser
+from engine.search import search, is_mate_score, MATE_SCORE
+from engine.transposition_table import TranspositionTable
+
+
+@pytest.fixture
+def fen_parser():
+    return FenParser()
+
+
+def basic_move(source: str, target: str) -> BasicMove:
+    return BasicMove(Coordinate.from_string(source), Coordinate.from_string(target))
+
+
+@pytest.mark.parametrize("fen_string,best_move", [
+    ("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1", basic_move("a1", "a8")),
+    ("r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5Q2/PPPP1PPP/RNB1K1NR w KQkq - 0 1", basic_move("f3", "f7")),
+])
+def test_finds_mate_in_one(fen_string: str, best_move: BasicMove, fen_parser: FenParser):
+    result = search(fen_parser.parse(fen_string), depth=3)
+
+    assert result.best_move == best_move
+    assert result.score == MATE_SCORE - 1
+    assert is_mate_score(result.score)
+
+
+def test_wins_hanging_queen(fen_parser: FenParser):
+    result = search(fen_parser.parse("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1"), depth=2)
+
+    assert result.best_move == basic_move("d2", "d5")
+    assert result.principal_variation[0] == result.best_move
+    assert result.nodes > 0
+
+
+def test_reports_stalemate_and_checkmate(fen_parser: FenParser):
+    stalemate = search(fen_parser.parse("k7/8/1Q6/8/8/8/8/4K3 b - - 0 1"), depth=2)
+    checkmate = search(fen_parser.parse("k7/1Q6/1K6/8/8/8/8/8 b - - 0 1"), depth=2)
+
+    assert (stalemate.best_move, stalemate.score) == (None, 0)
+    assert (checkmate.best_move, checkmate.score) == (None, -MATE_SCORE)
+
+
+def test_search_leaves_game_state_unchanged(fen_parser: FenParser):
+    fen_string = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+    game_state = fen_parser.parse(fen_string)
+
+    search(game_state, depth=2)
+
+    assert fen_parser.serialize(game_state) == fen_string
+
+
+def test_stops_within_time_limit(fen_parser: FenParser):
+    game_state = fen_parser.parse("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+
+    start_time = time.monotonic()
+    result = search(game_state, time_limit=0.3)
+    elapsed_time = time.monotonic() - start_time
+
+    assert result.best_move is not None
+    assert elapsed_time < 0.6
+
+
+def test_unfinished_first_iteration_falls_back_to_best_ordered_move(fen_parser: FenParser):
+    game_state = fen_parser.parse("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+
+    result = search(game_state, time_limit=0.0)
+
+    # the bishop trade comes first among the captures
+    assert result.depth == 0
+    assert notation.move_to_uci(result.best_move) == "e2a6"
+
+
+def test_reused_transposition_table_keeps_result(fen_parser: FenParser):
+    game_state = fen_parser.parse("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+    transposition_table = TranspositionTable(1)
+
+    first_result = search(game_state, depth=3, transposition_table=transposition_table)
+    second_result = search(game_state, depth=3, transposition_table=transposition_table)
+
+    assert first_result.best_move == second_result.best_move == basic_move("d2", "d5")
+    assert first_result.score == second_result.score
+    assert second_result.nodes < first_result.nodes
+    assert transposition_table.get_statistics().hits > 0
+
+
+def test_threads_searching_at_once_do_not_share_a_default_table(fen_parser: FenParser):
+    game_states = [
+        fen_parser.parse("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1"),
+        fen_parser.parse("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"),
+    ]
+    # fills the default table of this thread
+    search(game_states[0], depth=3)
+
+    with ThreadPoolExecutor(len(game_states)) as executor:
+        results = list(executor.map(lambda game_state: search(game_state, depth=3), game_states))
+
+    for game_state, result in zip(game_states, results):
+        fresh_result = search(game_state, depth=3, transposition_table=TranspositionTable())
+
+        assert (result.best_move, result.score, result.nodes) == (fresh_result.best_move, fresh_result.score, fresh_result.nodes)
+
+
+def test_quiescence_sees_recapture(fen_parser: FenParser):
+    # at depth 1 taking the pawn looks free until the recapture is searched
+    result = search(fen_parser.parse("4k3/8/3p4/4p3/8/8/8/4QK2 w - - 0 1"), depth=1)
+
+    assert result.best_move != basic_move("e1", "e5")
+    assert result.score > 0
@@ -0,0 +1,35 @@
+import pytest
+from coordinate import Coordinate
+from move import BasicMove, EnPassantMove, PromotionMove
+from piece import PieceType
+from parsing.fen_parser import FenParser
+from engine.see import static_exchange_evaluation
+
+
+def square(string: str) -> Coordinate:
+    return Coordinate.from_string(string)
+
+
+@pytest.mark.parametrize("fen_string,move,expected_value", [
+    # undefended pawn
+    ("1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1", BasicMove(square("e1"), square("e5")), 100),
+    # pawn takes a knight defended by a pawn
+    ("4k3/8/2p5/3n4/4P3/8/8/4K3 w - - 0 1", BasicMove(square("e4"), square("d5")), 220),
+    # queen takes a defended pawn
+    ("4k3/8/3p4/4p3/8/8/8/4QK2 w - - 0 1", BasicMove(square("e1"), square("e5")), -800),
+    # x-rays behind the rook and the bishop join the exchange
+    ("1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1", BasicMove(square("d3"), square("e5")), -220),
+    ("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1", EnPassantMove(square("e5"), square("d6")), 100),
+    ("1r2k3/P7/8/8/8/8/8/4K3 w - - 0 1", PromotionMove(square("a7"), square("b8"), PieceType.QUEEN), 1300),
+])
+def test_static_exchange_evaluation(fen_string: str, move, expected_value: int):
+    game_state = FenParser().parse(fen_string)
+
+    assert static_exchange_evaluation(game_state.board, move) == expected_value
+
+
+def test_king_does_not_recapture_defended_piece():
+    # the king may not take on d2 while the rook on d8 defends it
+    game_state = FenParser().parse("3r4/8/8/8/8/8/3P4/2K1k3 b - - 0 1")
+
+    assert static_exchange_evaluation(game_state.board, BasicMove(square("d8"), square("d2"))) == 100
@@ -0,0 +1,72 @@
+import pytest
+from coordinate import Coordinate
+from move import BasicMove
+from engine.transposition_table import TranspositionTable, Bound, TranspositionTableEntry
+
+MOVE = BasicMove(Coordinate.from_string("e2"), Coordinate.from_string("e4"))
+
+
+def test_stores_and_probes_entry():
+    table = TranspositionTable(1)
+
+    table.store(0x1234, 5, -250, Bound.LOWER, MOVE)
+
+    assert table.probe(0x1234) == TranspositionTableEntry(5, -250, Bound.LOWER, MOVE)
+    assert table.probe(0x4321) is None
+
+    statistics = table.get_statistics()
+    assert (statistics.probes, statistics.hits, statistics.stores) == (2, 1, 1)
+    assert statistics.hit_rate == 0.5
+
+
+def test_size_is_fixed_by_megabytes():
+    table = TranspositionTable(1)
+    entry_count = len(table)
+
+    for key in range(1, 10000):
+        table.store(key * 0x9E3779B97F4A7C15 & (1 << 64) - 1, 1, 0, Bound.EXACT)
+
+    assert len(table) == entry_count == 1024 * 1024 // 16
+    assert len(TranspositionTable(2)) == 2 * entry_count
+
+
+def test_keeps_deeper_entry_and_replaces_the_other_slot():
+    table = TranspositionTable(1)
+    bucket_count = len(table) // 2
+    deep_key, shallow_key, newer_key = 7, 7 + bucket_count, 7 + 2 * bucket_count
+
+    table.store(deep_key, 8, 100, Bound.EXACT)
+    table.store(shallow_key, 2, 200, Bound.EXACT)
+    table.store(newer_key, 3, 300, Bound.EXACT)
+
+    assert table.probe(deep_key).score == 100
+    assert table.probe(shallow_key) is None
+    assert table.probe(newer_key).score == 300
+
+
+def test_new_search_frees_depth_preferred_slot():
+    table = TranspositionTable(1)
+    bucket_count = len(table) // 2
+
+    table.store(7, 8, 100, Bound.EXACT)
+    table.new_search()
+    table.store(7 + bucket_count, 1, 200, Bound.EXACT)
+
+    # the old deep entry is demoted to the always-replace slot
+    assert table.probe(7 + bucket_count).score == 200
+    assert table.probe(7).score == 100
+
+
+def test_keeps_best_move_when_search_fails_low():
+    table = TranspositionTable(1)
+
+    table.store(0x1234, 3, 50, Bound.EXACT, MOVE)
+    table.store(0x1234, 4, 20, Bound.UPPER)
+
+    assert table.probe(0x1234) == TranspositionTableEntry(4, 20, Bound.UPPER, MOVE)
+
+
+@pytest.mark.parametrize("megabytes", [0, -1, 0.00001])
+def test_invalid_size_raises(megabytes: float):
+    with pytest.raises(ValueError):
+        TranspositionTable(megabytes)
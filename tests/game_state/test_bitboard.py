@@ -0,0 +1,75 @@
+import pytest
+from coordinate import Coordinate
+from color import Color
+from piece import Piece, PieceType
+from game_state.bitboard import BitBoard, get_square_index, iter_square_indices, popcount
+from parsing.fen_parser import FenParser
+
+
+@pytest.fixture
+def board():
+    return BitBoard()
+
+
+def test_set_at_updates_bitboards(board: BitBoard):
+    white_knight = Piece(Color.WHITE, PieceType.KNIGHT)
+    square = Coordinate.from_string("c3")
+
+    board.set_at(square, white_knight)
+
+    square_bit = 1 << get_square_index(square)
+    assert board.at(square) == white_knight
+    assert board.get_piece_bitboard(white_knight) == square_bit
+    assert board.white_occupancy == square_bit
+    assert board.black_occupancy == 0
+    assert board.occupancy == square_bit
+
+
+def test_set_at_replaces_captured_piece(board: BitBoard):
+    white_rook = Piece(Color.WHITE, PieceType.ROOK)
+    black_pawn = Piece(Color.BLACK, PieceType.PAWN)
+    square = Coordinate.from_string("d5")
+
+    board.set_at(square, black_pawn)
+    board.set_at(square, white_rook)
+
+    assert board.at(square) == white_rook
+    assert board.get_piece_bitboard(black_pawn) == 0
+    assert board.black_occupancy == 0
+
+    board.set_at(square, None)
+
+    assert board.square_is_empty(square)
+    assert board.occupancy == 0
+
+
+def test_matrix_round_trip(default_game_state):
+    board = BitBoard(default_game_state.board.matrix)
+
+    assert board.matrix == default_game_state.board.matrix
+    assert popcount(board.occupancy) == 32
+
+
+def test_default_game_occupancy(default_game_state):
+    board = default_game_state.board
+
+    assert board.white_occupancy == 0xFFFF
+    assert board.black_occupancy == 0xFFFF << 48
+    assert board.get_piece_squares(Piece(Color.WHITE, PieceType.KING)) == [Coordinate.from_string("e1")]
+
+
+def test_iter_pieces_of_color_matches_matrix():
+    fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+    board = FenParser().parse(fen).board
+
+    expected = set()
+    for rank, piece_row in enumerate(board.matrix):
+        for file, piece in enumerate(piece_row):
+            if piece is not None and piece.color is Color.BLACK:
+                expected.add((Coordinate(file, rank), piece))
+
+    assert set(board.iter_pieces_of_color(Color.BLACK)) == expected
+
+
+def test_iter_square_indices():
+    assert list(iter_square_indices(0b1010_0001)) == [0, 5, 7]
@@ -0,0 +1,56 @@
+import pytest
+from coordinate import Coordinate
+from move import BasicMove, PawnDoubleMove
+from parsing.fen_parser import FenParser
+from game_state.zobrist import compute_zobrist_key
+import engine.engine
+from engine.engine import do_move
+from engine.perft import PERFT_SUITE, perft
+
+
+def basic_move(source: str, target: str) -> BasicMove:
+    return BasicMove(Coordinate.from_string(source), Coordinate.from_string(target))
+
+
+@pytest.fixture
+def verify_zobrist_keys(monkeypatch):
+    monkeypatch.setattr(engine.engine, "VERIFY_ZOBRIST_KEYS", True)
+
+
+@pytest.mark.parametrize("fen_string", [position.fen for position in PERFT_SUITE])
+def test_incremental_key_matches_recomputed_key(fen_string: str, verify_zobrist_keys):
+    game_state = FenParser().parse(fen_string)
+    initial_key = game_state.zobrist_key
+
+    perft(game_state, 2)
+
+    assert game_state.zobrist_key == initial_key == compute_zobrist_key(game_state)
+
+
+def test_transposition_has_same_key(default_game_state):
+    initial_key = default_game_state.zobrist_key
+
+    for move in [basic_move("g1", "f3"), basic_move("g8", "f6"), basic_move("f3", "g1"), basic_move("f6", "g8")]:
+        do_move(default_game_state, move)
+
+    assert default_game_state.zobrist_key == initial_key
+
+
+def test_key_depends_on_side_to_move_castling_and_en_passant():
+    fen_parser = FenParser()
+    keys = set(fen_parser.parse(fen_string).zobrist_key for fen_string in [
+        "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1",
+        "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1",
+        "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 1",
+        "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b Kkq - 0 1",
+    ])
+
+    assert len(keys) == 4
+
+
+def test_pawn_double_move_key_matches_fen(default_game_state):
+    do_move(default_game_state, PawnDoubleMove(Coordinate.from_string("e2"), Coordinate.from_string("e4")))
+
+    expected = FenParser().parse("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1")
+
+    assert default_game_state.zobrist_key == expected.zobrist_key
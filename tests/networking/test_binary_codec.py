@@ -0,0 +1,103 @@
+import socket
+import pytest
+from color import Color
+from parsing.fen_parser import FenParser
+from engine.engine import generate_moves
+from engine.perft import PERFT_SUITE
+from networking.connection import Connection
+from networking.binary_codec import (
+    POSITION,
+    PROTOCOL_VERSION,
+    frame,
+    encode_move,
+    decode_move,
+    encode_game_state,
+    decode_game_state,
+    encode_color,
+    decode_color
+)
+
+
+@pytest.mark.parametrize("fen_string", [position.fen for position in PERFT_SUITE])
+def test_every_legal_move_round_trips_in_two_bytes(fen_string: str):
+    game_state = FenParser().parse(fen_string)
+
+    for move in generate_moves(game_state):
+        move_bytes = encode_move(move)
+
+        assert len(move_bytes) == 2
+        assert decode_move(move_bytes) == move
+
+
+@pytest.mark.parametrize("fen_string", [position.fen for position in PERFT_SUITE])
+def test_position_round_trips(fen_string: str):
+    game_state = FenParser().parse(fen_string)
+    game_state_bytes = encode_game_state(game_state)
+    decoded_game_state = decode_game_state(game_state_bytes)
+
+    assert len(game_state_bytes) == POSITION.size == 39
+    assert FenParser().serialize(decoded_game_state) == fen_string
+    assert decoded_game_state.zobrist_key == game_state.zobrist_key
+    assert decoded_game_state.middlegame_score == game_state.middlegame_score
+    assert decoded_game_state.endgame_score == game_state.endgame_score
+    assert decoded_game_state.phase == game_state.phase
+
+
+def test_position_of_other_protocol_version_is_rejected(default_game_state):
+    game_state_bytes = bytearray(encode_game_state(default_game_state))
+    game_state_bytes[0] = PROTOCOL_VERSION + 1
+
+    with pytest.raises(ValueError):
+        decode_game_state(bytes(game_state_bytes))
+
+
+def test_invalid_piece_code_is_rejected(default_game_state):
+    game_state_bytes = bytearray(encode_game_state(default_game_state))
+    game_state_bytes[1] = 0xFF
+
+    with pytest.raises(ValueError):
+        decode_game_state(bytes(game_state_bytes))
+
+
+@pytest.mark.parametrize("decode,payload", [
+    (decode_move, b"\x00"),
+    (decode_move, b"\x00\x00\x00"),
+    (decode_game_state, b"\x01" * 38),
+    (decode_color, b"\x02"),
+    (decode_color, b""),
+])
+def test_payload_of_wrong_length_or_value_is_rejected(decode, payload: bytes):
+    with pytest.raises(ValueError):
+        decode(payload)
+
+
+@pytest.mark.parametrize("color", [Color.WHITE, Color.BLACK])
+def test_color_round_trips(color: Color):
+    assert decode_color(encode_color(color)) is color
+
+
+def test_frame_prefixes_payload_length():
+    assert frame(b"abc") == b"\x00\x03abc"
+    assert frame(b"") == b"\x00\x00"
+
+    with pytest.raises(ValueError):
+        frame(bytes(1 << 16))
+
+
+def test_connection_exchanges_binary_messages(default_game_state):
+    first_socket, second_socket = socket.socketpair()
+    sender = Connection(first_socket, ("localhost", 0))
+    receiver = Connection(second_socket, ("localhost", 0))
+    move = next(iter(generate_moves(default_game_state)))
+
+    try:
+        sender.send_color(Color.BLACK)
+        sender.send_game_state(default_game_state)
+        sender.send_move(move)
+
+        assert receiver.receive_color() is Color.BLACK
+        assert receiver.receive_game_state().zobrist_key == default_game_state.zobrist_key
+        assert receiver.receive_move() == move
+    finally:
+        first_socket.close()
+        second_socket.close()
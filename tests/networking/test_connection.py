@@ -0,0 +1,92 @@
+import socket
+import threading
+import pytest
+from color import Color
+from custom_exceptions import ConnectionClosed
+from engine.engine import generate_moves
+from networking.connection import Connection
+from networking.binary_codec import MAX_PAYLOAD_LENGTH, frame, encode_move, encode_color
+
+
+@pytest.fixture
+def socket_pair():
+    first_socket, second_socket = socket.socketpair()
+
+    yield first_socket, second_socket
+
+    first_socket.close()
+    second_socket.close()
+
+
+def test_coalesced_frames_are_split(socket_pair, default_game_state):
+    sending_socket, receiving_socket = socket_pair
+    connection = Connection(receiving_socket, ("localhost", 0))
+    moves = sorted(generate_moves(default_game_state), key=str)
+
+    sending_socket.sendall(frame(encode_color(Color.WHITE)) + b"".join(frame(encode_move(move)) for move in moves))
+
+    assert connection.receive_color() is Color.WHITE
+    assert [connection.receive_move() for _ in moves] == moves
+
+
+def test_frame_split_over_several_reads_is_joined(socket_pair, default_game_state):
+    sending_socket, receiving_socket = socket_pair
+    connection = Connection(receiving_socket, ("localhost", 0))
+    move = next(iter(generate_moves(default_game_state)))
+    frame_bytes = frame(encode_move(move))
+
+    def send_byte_by_byte():
+        for index in range(len(frame_bytes)):
+            sending_socket.sendall(frame_bytes[index:index + 1])
+
+    sender = threading.Thread(target=send_byte_by_byte)
+    sender.start()
+
+    assert connection.receive_move() == move
+
+    sender.join()
+
+
+def test_largest_frames_pass_through(socket_pair):
+    first_socket, second_socket = socket_pair
+    sender = Connection(first_socket, ("localhost", 0))
+    receiver = Connection(second_socket, ("localhost", 0))
+    payloads = [bytes([index]) * MAX_PAYLOAD_LENGTH for index in range(3)] + [b"", b"x"]
+
+    def send_payloads():
+        for payload in payloads:
+            sender._send_bytes(payload)
+
+    sending_thread = threading.Thread(target=send_payloads)
+    sending_thread.start()
+
+    assert [receiver._receive_bytes() for _ in payloads] == payloads
+
+    sending_thread.join()
+
+
+def test_timed_out_receive_can_be_retried(socket_pair):
+    sending_socket, receiving_socket = socket_pair
+    connection = Connection(receiving_socket, ("localhost", 0), timeout=0.05)
+    frame_bytes = frame(encode_color(Color.BLACK))
+
+    sending_socket.sendall(frame_bytes[:1])
+
+    with pytest.raises(socket.timeout):
+        connection.receive_color()
+
+    sending_socket.sendall(frame_bytes[1:])
+
+    assert connection.get_timeout() == 0.05
+    assert connection.receive_color() is Color.BLACK
+
+
+def test_receiving_from_closed_connection_raises(socket_pair):
+    sending_socket, receiving_socket = socket_pair
+    connection = Connection(receiving_socket, ("localhost", 0))
+
+    sending_socket.sendall(b"\x00")
+    sending_socket.shutdown(socket.SHUT_WR)
+
+    with pytest.raises(ConnectionClosed):
+        connection.receive_color()
@@ -0,0 +1,55 @@
+import pytest
+from networking.latency_histogram import LatencyHistogram, BUCKETS_PER_DOUBLING
+
+
+def test_empty_histogram_reports_zero():
+    statistics = LatencyHistogram().get_statistics()
+
+    assert statistics.count == 0
+    assert statistics.mean == statistics.p99 == statistics.max == 0.0
+
+
+def test_percentiles_are_within_one_bucket():
+    histogram = LatencyHistogram()
+    latencies = [index / 10000 for index in range(1, 1001)]
+
+    for latency in latencies:
+        histogram.record(latency)
+
+    bucket_ratio = 2 ** (1 / BUCKETS_PER_DOUBLING)
+
+    for percentile in [1, 50, 90, 99, 100]:
+        exact = latencies[int(len(latencies) * percentile / 100) - 1]
+
+        assert exact <= histogram.get_percentile(percentile) <= exact * bucket_ratio
+
+    assert histogram.get_percentile(100) == histogram.max == 0.1
+    assert histogram.get_statistics().mean == pytest.approx(sum(latencies) / len(latencies))
+
+
+def test_extreme_latencies_are_kept():
+    histogram = LatencyHistogram()
+    histogram.record(0.0)
+    histogram.record(1e9)
+
+    assert histogram.get_percentile(50) <= 1e-6
+    assert histogram.get_percentile(100) == 1e9
+
+
+def test_merge_adds_counts():
+    first = LatencyHistogram()
+    second = LatencyHistogram()
+    first.record(0.001)
+    second.record(0.002)
+    second.record(0.003)
+
+    first.merge(second)
+
+    assert first.count == 3
+    assert first.max == 0.003
+    assert first.total == pytest.approx(0.006)
+
+
+def test_invalid_percentile_is_rejected():
+    with pytest.raises(ValueError):
+        LatencyHistogram().get_percentile(101)
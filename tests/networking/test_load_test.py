@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+from color import Color
+from files import load_default_game
+from engine.engine import do_move
+from networking.async_connection import AsyncConnection
+from networking.load_test import ClientConnectionKind, LoadTestOptions, run_load_test
+from networking.server import GameServer
+import notation
+
+
+def test_clients_play_their_games_without_errors():
+    options = LoadTestOptions(clients=6, games_per_client=2, max_plies=10)
+    report = asyncio.run(run_load_test(options))
+
+    assert report.errors == 0
+    assert report.desyncs == 0
+    assert report.games == 6
+    assert 0 < report.moves <= 60
+    assert report.relay_latency.count > 0
+    assert report.moves_per_second > 0
+    assert "desyncs     0" in report.format()
+
+
+def test_blocking_clients_play_their_games_without_errors():
+    options = LoadTestOptions(clients=4, games_per_client=2, max_plies=10, connection_kind=ClientConnectionKind.BLOCKING)
+    report = asyncio.run(run_load_test(options))
+
+    assert report.errors == 0
+    assert report.desyncs == 0
+    assert report.games == 4
+    assert 0 < report.moves <= 40
+    assert report.relay_latency.count == report.moves
+
+
+def test_running_server_can_be_targeted():
+    async def run():
+        server = GameServer()
+        await server.start("127.0.0.1", 0)
+
+        try:
+            return await run_load_test(LoadTestOptions(clients=2, max_plies=4), server.get_port())
+        finally:
+            await server.close()
+
+    report = asyncio.run(run())
+
+    assert report.games == 1
+    assert report.moves == 4
+
+
+def test_think_time_is_not_counted_as_latency():
+    report = asyncio.run(run_load_test(LoadTestOptions(clients=2, max_plies=4, think_time=0.2)))
+
+    assert report.relay_latency.count == 4
+    assert report.relay_latency.max < 0.1
+
+
+def test_illegal_relayed_move_is_counted_as_desync():
+    game_state = load_default_game()
+    do_move(game_state, notation.move_from_uci(game_state, "e2e4"))
+    black_move = notation.move_from_uci(game_state, "e7e5")
+
+    async def send_black_move_first(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = AsyncConnection(reader, writer)
+
+        await connection.send_color(Color.BLACK)
+        await connection.send_game_state(load_default_game())
+        await connection.send_move(black_move)
+        await connection.terminate()
+
+    async def run():
+        server = await asyncio.start_server(send_black_move_first, "127.0.0.1", 0)
+
+        try:
+            return await run_load_test(LoadTestOptions(clients=2, timeout=5), server.sockets[0].getsockname()[1])
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    report = asyncio.run(run())
+
+    assert report.desyncs == 2
+    assert report.errors == 0
+
+
+def test_odd_client_count_is_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(run_load_test(LoadTestOptions(clients=3)))
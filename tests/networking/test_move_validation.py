@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+import pytest
+from parsing.fen_parser import FenParser
+from engine.engine import generate_moves
+from networking.move_validation import MoveValidator, ValidationPoolKind
+import notation
+
+FOOLS_MATE_FEN = "rnbqkbnr/pppp1ppp/8/4p3/6P1/5P2/PPPPP2P/RNBQKBNR b KQkq g3 0 2"
+
+
+@pytest.mark.parametrize("kind", [ValidationPoolKind.THREAD, ValidationPoolKind.PROCESS])
+def test_moves_are_validated(kind: ValidationPoolKind):
+    game_state = FenParser().parse(FOOLS_MATE_FEN)
+    legal_move = notation.move_from_uci(game_state, "d8h4")
+    # legal only for white, who is not to move
+    illegal_move = notation.move_from_uci(FenParser().parse(FOOLS_MATE_FEN.replace(" b ", " w ")), "e2e4")
+
+    async def validate():
+        validator = MoveValidator(kind, workers=1)
+
+        try:
+            return (
+                await validator.validate_move(game_state, legal_move),
+                await validator.validate_move(game_state, illegal_move),
+                await validator.is_game_over(game_state),
+                validator.latency_histogram.count,
+            )
+        finally:
+            validator.shutdown()
+
+    legal_validation, illegal_validation, game_over, validation_count = asyncio.run(validate())
+
+    assert legal_validation.legal and legal_validation.game_over
+    assert not illegal_validation.legal
+    assert not game_over
+    assert validation_count == 3
+
+
+def test_every_legal_move_is_accepted(default_game_state):
+    async def validate():
+        validator = MoveValidator(ValidationPoolKind.THREAD, workers=2)
+
+        try:
+            return await asyncio.gather(*[validator.validate_move(default_game_state, move) for move in generate_moves(default_game_state)])
+        finally:
+            validator.shutdown()
+
+    validations = asyncio.run(validate())
+
+    assert len(validations) == 20
+    assert all(validation.legal and not validation.game_over for validation in validations)
+
+
+def test_pending_validations_are_bounded():
+    running_count = 0
+    max_running_count = 0
+    lock = threading.Lock()
+
+    def slow_validation():
+        nonlocal running_count, max_running_count
+
+        with lock:
+            running_count += 1
+            max_running_count = max(max_running_count, running_count)
+
+        time.sleep(0.01)
+
+        with lock:
+            running_count -= 1
+
+    async def validate():
+        validator = MoveValidator(ValidationPoolKind.THREAD, workers=4, max_pending=2)
+
+        try:
+            await asyncio.gather(*[validator._run(slow_validation) for _ in range(10)])
+        finally:
+            validator.shutdown()
+
+    asyncio.run(validate())
+
+    assert max_running_count == 2
+
+
+def test_validator_made_before_the_event_loop_can_make_callers_wait():
+    validator = MoveValidator(ValidationPoolKind.THREAD, workers=1, max_pending=1)
+
+    async def validate():
+        await asyncio.gather(*[validator._run(time.sleep, 0.01) for _ in range(3)])
+
+    try:
+        asyncio.run(validate())
+    finally:
+        validator.shutdown()
+
+    assert validator.latency_histogram.count == 3
+
+
+def test_invalid_pool_size_is_rejected():
+    with pytest.raises(ValueError):
+        MoveValidator(workers=0)
+
+
+def test_thread_pool_defaults_to_one_worker():
+    validator = MoveValidator(ValidationPoolKind.THREAD)
+    validator.shutdown()
+
+    assert validator.workers == 1
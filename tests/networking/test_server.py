@@ -0,0 +1,136 @@
+import asyncio
+import pytest
+from color import Color
+from custom_exceptions import ConnectionClosed
+from engine.engine import do_move
+from files import load_default_game
+from networking.async_connection import AsyncConnection
+from networking.server import GameServer
+import notation
+
+FOOLS_MATE = ["f2f3", "e7e5", "g2g4", "d8h4"]
+
+
+def run_with_server(test, move_timeout=None):
+    async def run():
+        server = GameServer(move_timeout=move_timeout)
+        await server.start("127.0.0.1", 0)
+
+        try:
+            await asyncio.wait_for(test(server), 10)
+        finally:
+            await server.close()
+
+    asyncio.run(run())
+
+
+async def connect(server: GameServer) -> AsyncConnection:
+    # the server pairs clients in the order it accepts them, so each is
+    # only returned once the server has accepted it
+    waiting_once_accepted = server._waiting_connection is None
+    connection = await AsyncConnection.open("127.0.0.1", server.get_port())
+
+    while (server._waiting_connection is not None) != waiting_once_accepted:
+        await asyncio.sleep(0)
+
+    return connection
+
+
+async def receive_starting_data(connection: AsyncConnection):
+    return connection, await connection.receive_color(), await connection.receive_game_state()
+
+
+async def join_pair(server: GameServer):
+    # the first to connect plays white
+    first_connection = await connect(server)
+    second_connection = await connect(server)
+
+    return await asyncio.gather(receive_starting_data(first_connection), receive_starting_data(second_connection))
+
+
+def test_clients_are_paired_and_moves_relayed_until_checkmate():
+    async def test(server: GameServer):
+        (white, white_color, white_state), (black, black_color, black_state) = await join_pair(server)
+
+        assert white_color is Color.WHITE
+        assert black_color is Color.BLACK
+        assert white_state.zobrist_key == black_state.zobrist_key == load_default_game().zobrist_key
+        assert len(server.games) == 1
+
+        players = [(white, black), (black, white)]
+
+        for index, uci in enumerate(FOOLS_MATE):
+            sender, receiver = players[index % 2]
+            move = notation.move_from_uci(white_state, uci)
+
+            await sender.send_move(move)
+            assert await receiver.receive_move() == move
+            do_move(white_state, move)
+
+        # the server ends the game once black has mated
+        with pytest.raises(ConnectionClosed):
+            await white.receive_move()
+
+        assert len(server.games) == 0
+        assert server.finished_game_count == 1
+
+    run_with_server(test)
+
+
+def test_illegal_move_ends_game():
+    async def test(server: GameServer):
+        (white, _, _), (black, _, _) = await join_pair(server)
+        other_game_state = load_default_game()
+        do_move(other_game_state, notation.move_from_uci(other_game_state, "e2e4"))
+
+        # legal only for black, who is not to move
+        await white.send_move(notation.move_from_uci(other_game_state, "e7e5"))
+
+        with pytest.raises(ConnectionClosed):
+            await black.receive_move()
+
+    run_with_server(test)
+
+
+def test_disconnect_ends_game():
+    async def test(server: GameServer):
+        (white, _, _), (black, _, _) = await join_pair(server)
+
+        await white.terminate()
+
+        with pytest.raises(ConnectionClosed):
+            await black.receive_move()
+
+        assert server.finished_game_count == 1
+
+    run_with_server(test)
+
+
+def test_slow_player_is_timed_out():
+    async def test(server: GameServer):
+        (white, _, _), (black, _, _) = await join_pair(server)
+
+        with pytest.raises(ConnectionClosed):
+            await black.receive_move()
+
+    run_with_server(test, move_timeout=0.05)
+
+
+def test_many_games_run_concurrently():
+    async def test(server: GameServer):
+        connections = [await connect(server) for _ in range(100)]
+        starting_data = await asyncio.gather(*[receive_starting_data(connection) for connection in connections])
+
+        assert [color for _, color, _ in starting_data] == [Color.WHITE, Color.BLACK] * 50
+        assert len(server.games) == 50
+
+        game_state = starting_data[0][2]
+        move = notation.move_from_uci(game_state, "e2e4")
+
+        await asyncio.gather(*[white.send_move(move) for white in connections[::2]])
+        assert await asyncio.gather(*[black.receive_move() for black in connections[1::2]]) == [move] * 50
+
+        for connection in connections:
+            await connection.terminate()
+
+    run_with_server(test)
@@ -0,0 +1,100 @@
+import io
+import pytest
+from castling_side import CastlingSide
+from color import Color
+from coordinate import Coordinate
+from custom_exceptions import InvalidPgnString
+from move import CastlingMove, PromotionMove
+from piece import PieceType
+from parsing.fen_parser import FenParser
+from parsing.pgn import PgnParser, iter_pgn_games, serialize_game, write_pgn_games
+
+PGN_TEXT = """[Event "Casual game"]
+[White "Anderssen, \\"The Immortal\\""]
+[Black "Kieseritzky"]
+[Result "1-0"]
+
+1. e4 e5 2. f4 exf4 3. Bc4 Qh4+ 4. Kf1 b5 5. Bxb5 Nf6 6. Nf3 Qh6 7. d3 Nh5
+8. Nh4 Qg5 9. Nf5 c6 10. g4 Nf6 11. Rg1 cxb5 12. h4 Qg6 13. h5 Qg5 14. Qf3
+Ng8 15. Bxf4 Qf6 16. Nc3 Bc5 17. Nd5 Qxb2 18. Bd6 Bxg1 {18... Qxa1+ was
+better} 19. e5 Qxa1+ 20. Ke2 Na6 21. Nxg7+ Kd8 22. Qf6+ Nxf6 23. Be7# 1-0
+
+[Event "Promotion"]
+[SetUp "1"]
+[FEN "8/P5k1/8/8/8/8/6K1/8 w - - 0 60"]
+
+60. a8=Q (60. a8=N) 60... Kf6 61. O-O $4 *
+"""
+
+
+def test_reads_tags_moves_and_result():
+    games = list(iter_pgn_games(io.StringIO(PGN_TEXT[:PGN_TEXT.index("[Event \"Promotion")])))
+
+    assert len(games) == 1
+    assert games[0].tags["White"] == 'Anderssen, "The Immortal"'
+    assert len(games[0].moves) == 45
+    assert games[0].result == "1-0"
+
+    final_game_state = games[0].get_final_game_state()
+    assert FenParser().serialize(final_game_state).startswith("r1bk3r/p2pBpNp/n4n2/1p1NP2P/6P1/3P4/P1P1K3/q5b1 b")
+
+
+def test_illegal_move_raises_unless_skipped():
+    with pytest.raises(InvalidPgnString, match=r"game 2: move 61\.: illegal san: O-O"):
+        list(iter_pgn_games(io.StringIO(PGN_TEXT)))
+
+    games = list(iter_pgn_games(io.StringIO(PGN_TEXT), skip_invalid_games=True))
+
+    assert [game.tags["Event"] for game in games] == ["Casual game"]
+
+
+def test_skips_variations_and_reads_promotions():
+    pgn_text = PGN_TEXT.replace(" 61. O-O $4", "")
+    game = list(iter_pgn_games(io.StringIO(pgn_text)))[1]
+
+    assert game.moves[0] == PromotionMove(Coordinate.from_string("a7"), Coordinate.from_string("a8"), PieceType.QUEEN)
+    assert len(game.moves) == 2
+    assert game.result == "*"
+
+
+def test_written_games_read_back_the_same():
+    games = list(iter_pgn_games(io.StringIO(PGN_TEXT), skip_invalid_games=True))
+    output = io.StringIO()
+
+    write_pgn_games(games, output)
+    games_read_back = list(iter_pgn_games(io.StringIO(output.getvalue())))
+
+    assert [game.moves for game in games_read_back] == [game.moves for game in games]
+    assert games_read_back[0].tags["White"] == games[0].tags["White"]
+    assert all(len(line) <= 80 for line in output.getvalue().splitlines())
+    assert "23. Be7# 1-0" in output.getvalue()
+
+
+def test_movetext_starting_with_black_numbers_first_move():
+    game = list(iter_pgn_games(io.StringIO('[FEN "4k3/8/8/8/8/8/8/R3K2R b KQ - 0 7"]\n\n7... Kd7 8. O-O-O+ *\n')))[0]
+
+    assert game.moves[1] == CastlingMove(CastlingSide.QUEENSIDE, Color.WHITE)
+    assert serialize_game(game).endswith("7... Kd7 8. O-O-O+ *\n")
+
+
+def test_tags_and_results_inside_multiline_comments_are_skipped():
+    pgn_text = '[Event "Comments"]\n\n1. e4 {a comment\n[that looks like a tag]\nand ends like a game 1-0\n} e5 *\n[Event "Next"]\n\n1. d4 *\n'
+    games = list(iter_pgn_games(io.StringIO(pgn_text)))
+
+    assert [game.tags["Event"] for game in games] == ["Comments", "Next"]
+    assert len(games[0].moves) == 2
+
+
+def test_illegal_black_move_is_numbered_from_the_position():
+    with pytest.raises(InvalidPgnString, match=r"move 7\.\.\.: "):
+        list(iter_pgn_games(io.StringIO('[FEN "4k3/8/8/8/8/8/8/R3K2R b KQ - 0 7"]\n\n7... Ke9 *\n')))
+
+
+def test_pgn_parser_round_trips_position():
+    pgn_parser = PgnParser()
+    fen_parser = FenParser()
+    fen_string = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+    game_state = pgn_parser.parse(pgn_parser.serialize(fen_parser.parse(fen_string)))
+
+    assert fen_parser.serialize(game_state) == fen_string
@@ -0,0 +1,63 @@
+import io
+import json
+from batch_analysis import (
+    analyze_position,
+    analyze_positions,
+    iter_fen_lines,
+    write_json_lines,
+    PositionStatus,
+    SearchOptions
+)
+
+FEN_LINES = """rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1
+
+# checkmate, then stalemate
+k7/1Q6/1K6/8/8/8/8/8 b - - 0 1
+k7/8/1Q6/8/8/8/8/4K3 b - - 0 1
+4k3/8/8/8/8/8/8/R3K2r w Q - 0 1
+not a fen
+"""
+
+
+def test_skips_blank_and_comment_lines():
+    assert [line_number for line_number, _ in iter_fen_lines(io.StringIO(FEN_LINES))] == [1, 4, 5, 6, 7]
+
+
+def test_reports_status_and_move_count():
+    analyses = list(analyze_positions(iter_fen_lines(io.StringIO(FEN_LINES)), processes=1, chunk_size=2))
+
+    assert [(analysis.legal_move_count, analysis.status) for analysis in analyses[:4]] == [
+        (20, PositionStatus.ONGOING),
+        (0, PositionStatus.CHECKMATE),
+        (0, PositionStatus.STALEMATE),
+        (3, PositionStatus.CHECK),
+    ]
+    assert analyses[4].error is not None
+
+
+def test_search_result_is_included():
+    analysis = analyze_position(1, "6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1", SearchOptions(depth=2))
+
+    assert analysis.best_move == "a1a8"
+    assert json.loads(analysis.to_json())["best_move"] == "a1a8"
+
+
+def test_worker_pool_keeps_input_order():
+    fen_lines = list(iter_fen_lines(io.StringIO(FEN_LINES))) * 5
+    output = io.StringIO()
+
+    count = write_json_lines(analyze_positions(fen_lines, processes=2, chunk_size=3), output)
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+
+    assert count == len(lines) == 25
+    assert [line["line"] for line in lines] == [line_number for line_number, _ in fen_lines]
+    assert lines[1] == {"line": 4, "fen": "k7/1Q6/1K6/8/8/8/8/8 b - - 0 1", "legal_moves": 0, "status": "checkmate"}
+
+
+def test_position_without_king_is_reported_as_error():
+    fen_lines = [(1, "8/8/8/8/8/8/8/8 w - - 0 1"), (2, "4k3/8/8/8/8/8/8/4K3 w - - 0 1")]
+    analyses = list(analyze_positions(fen_lines, SearchOptions(depth=1), processes=1))
+
+    assert analyses[0].error is not None
+    assert "legal_moves" not in json.loads(analyses[0].to_json())
+    assert analyses[1].error is None
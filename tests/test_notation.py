@@ -2,6 +2,12 @@ import pytest
 from piece import Piece, PieceType
 from color import Color
 import notation
+from coordinate import Coordinate
+from parsing.fen_parser import FenParser
+from castling_side import CastlingSide
+from move import CastlingMove, EnPassantMove, PromotionMove
+from engine.engine import generate_moves
+from engine.perft import PERFT_SUITE
 
 @pytest.mark.parametrize("piece,char", [
     (Piece(Color.WHITE, PieceType.KING), "K"),
@@ -24,3 +30,63 @@ class TestPieceCharacterConversion:
     def test_character_to_piece(self, piece: Piece, char: str):
         assert notation.get_character_by_piece(piece) == char
 
+
+
+@pytest.mark.parametrize("fen_string,san,source,target", [
+    ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", "Nf3", "g1", "f3"),
+    ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", "e4", "e2", "e4"),
+    ("4k3/8/8/8/8/8/4K3/R6R w - - 0 1", "Rad1", "a1", "d1"),
+    ("4k3/8/8/8/8/8/4K3/R6R w - - 0 1", "Rhe1", "h1", "e1"),
+    ("4k3/8/8/8/R7/8/8/R3K3 w - - 0 1", "R1a3", "a1", "a3"),
+    ("4k3/8/8/8/R7/8/8/R3K3 w - - 0 1", "R4a2", "a4", "a2"),
+    ("4k3/8/8/3p4/2P1P3/8/8/4K3 w - - 0 1", "cxd5", "c4", "d5"),
+    ("4k3/8/8/3p4/2P1P3/8/8/4K3 w - - 0 1", "exd5", "e4", "d5"),
+])
+def test_san_round_trip(fen_string: str, san: str, source: str, target: str):
+    game_state = FenParser().parse(fen_string)
+    move = notation.move_from_san(game_state, san)
+
+    assert (move.source_square, move.target_square) == (Coordinate.from_string(source), Coordinate.from_string(target))
+    assert notation.move_to_san(game_state, move) == san
+
+
+def test_san_of_checks_and_special_moves():
+    game_state = FenParser().parse("r3k3/1P6/8/3pP3/8/8/8/4K2R w Kq d6 0 1")
+
+    assert notation.move_to_san(game_state, notation.move_from_san(game_state, "0-0")) == "O-O"
+    assert notation.move_to_san(game_state, notation.move_from_san(game_state, "exd6")) == "exd6"
+    assert notation.move_to_san(game_state, notation.move_from_san(game_state, "bxa8Q")) == "bxa8=Q+"
+    assert notation.move_to_san(game_state, notation.move_from_san(game_state, "Rh8+")) == "Rh8+"
+
+
+@pytest.mark.parametrize("san", ["Nf6", "e5", "Ke2", "O-O", "Rb1", "Qx"])
+def test_illegal_or_invalid_san_raises(san: str):
+    with pytest.raises(ValueError):
+        notation.move_from_san(FenParser().parse("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"), san)
+
+
+@pytest.mark.parametrize("fen_string", [position.fen for position in PERFT_SUITE])
+def test_every_legal_move_round_trips_through_uci_and_san(fen_string: str):
+    game_state = FenParser().parse(fen_string)
+
+    for move in generate_moves(game_state):
+        assert notation.move_from_uci(game_state, notation.move_to_uci(move)) == move
+        assert notation.move_from_san(game_state, notation.move_to_san(game_state, move)) == move
+
+
+@pytest.mark.parametrize("uci,expected_move", [
+    ("e1g1", CastlingMove(CastlingSide.KINGSIDE, Color.WHITE)),
+    ("e5d6", EnPassantMove(Coordinate.from_string("e5"), Coordinate.from_string("d6"))),
+    ("b7a8n", PromotionMove(Coordinate.from_string("b7"), Coordinate.from_string("a8"), PieceType.KNIGHT)),
+])
+def test_move_from_uci(uci: str, expected_move):
+    game_state = FenParser().parse("r3k3/1P6/8/3pP3/8/8/8/4K2R w Kq d6 0 1")
+
+    assert notation.move_from_uci(game_state, uci) == expected_move
+    assert notation.move_to_uci(expected_move) == uci
+
+
+@pytest.mark.parametrize("uci", ["e2e5", "e7e5", "e2e4q", "e2", "i2i4", "e2e4e"])
+def test_illegal_or_invalid_uci_raises(uci: str):
+    with pytest.raises(ValueError):
+        notation.move_from_uci(FenParser().parse("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"), uci)